@@ -31,7 +31,8 @@ setup(name='sliced_art',
       packages=['sliced_art'],
       install_requires=['PySide6'],
       extras_require={'dev': ['pytest',
-                              'coverage']},
+                              'coverage'],
+                      'line_art': ['numpy']},
       entry_points={
           'gui_scripts': ['sliced_art=sliced_art.sliced_art:main']},
       project_urls={
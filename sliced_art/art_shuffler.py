@@ -1,8 +1,16 @@
 import typing
+from math import floor
 from random import shuffle
 
-from PySide6.QtCore import QRect, Qt, QPoint
-from PySide6.QtGui import QPainter, QPaintDevice, QPixmap, QColor, QPen
+from PySide6.QtCore import QRect, Qt, QPoint, QRectF, QSize, QPointF
+from PySide6.QtGui import QPainter, QPaintDevice, QPixmap, QColor, QPen, \
+    QImage
+
+from sliced_art.art_source import Art, VectorArt
+from sliced_art.cell_labels import make_label
+from sliced_art.profiling import timed
+from sliced_art.shuffle_optimizer import ShuffleOptimizer
+from sliced_art.static_text_cache import StaticTextCache, shared_text_cache
 
 
 class ArtShuffler:
@@ -28,41 +36,254 @@ class ArtShuffler:
         self.cols = cols
         self.target = target
         self.rect = rect or QRect(0, 0, target.width(), target.height())
-        self.cells = [(i, j, chr(65+k))
+        self.cells = [(i, j, make_label(k))
                       for k, (i, j) in enumerate((i, j)
                                                  for i in range(rows)
                                                  for j in range(cols))]
         self.is_shuffled = False
+
+        # True to search for a shuffle that keeps pieces away from home and
+        # from their original neighbours, instead of using any random order.
+        self.is_optimized = False
         self.clues = clues or {}
         self.row_clues = [] if row_clues is None else list(row_clues)
         self.column_clues = [] if column_clues is None else list(column_clues)
-        self.row_clue_rects: typing.List[QRect] = []
-        self.column_clue_rects: typing.List[QRect] = []
+        self.grid_layout: typing.Optional[GridLayout] = None  # last drawn
         self.background = QColor('white')
         self.selected_row = self.selected_column = None
 
-    def draw_grid(self, art: QPixmap, painter: typing.Optional[QPainter] = None):
-        rows = self.rows
-        columns = self.cols
-        if self.row_clues:
-            x_filled_portion = 0.97 * rows / (rows+1)
-            y_filled_portion = 0.97 * columns / (columns+1)
-            scaled_art = art.scaled(self.rect.width()*x_filled_portion,
-                                    self.rect.height()*y_filled_portion,
+        # Draw each piece from its own unscaled tile instead of a scaled copy
+        # of the art. Vector devices like QPdfWriter then store each tile once.
+        self.share_tiles = False
+
+        # {scaled_size: tiles} cut from the art at each size, or at its own
+        # size for None, as long as the art and grid in tiles_key don't change.
+        self.tiles: typing.Dict[typing.Optional[typing.Tuple[int, int]],
+                                typing.List[typing.List[Art]]] = {}
+        self.tiles_key = None
+
+        # Snap the scaled art to whole pixels per cell, and place every piece
+        # on whole pixels, so pieces are copied without any filtering. Shared
+        # tiles are then cut from art that's already scaled to the cells.
+        self.is_pixel_aligned = False
+
+        # {clue: pixel_size} for clues that needed a smaller font to fit,
+        # as long as the layout in font_sizes_key doesn't change.
+        self.font_sizes: typing.Dict[str, float] = {}
+        self.font_sizes_key = None
+
+        # Clue and label text is laid out once, then reused for every paint.
+        self.text_cache: StaticTextCache = shared_text_cache
+
+        # {(width, height): symbol_clues} scaled to each cell size, as long
+        # as the clue pixmaps in symbol_clues_key don't change.
+        self.symbol_clues: typing.Dict[typing.Tuple[int, int],
+                                       SymbolClues] = {}
+        self.symbol_clues_key = None
+
+    def scale_art(self,
+                  art: typing.Union[Art, QImage],
+                  width: float,
+                  height: float):
+        """ Scale art to fit inside a size, unless tiles are shared.
+
+        :return: (scaled_art, scaled_size), where scaled_art is None when
+            tiles are shared, because the painter scales each tile instead.
+        """
+        if self.is_pixel_aligned:
+            scaled_size = self.align_size(art.size().scaled(
+                int(width),
+                int(height),
+                Qt.AspectRatioMode.KeepAspectRatio))
+            if self.share_tiles:
+                return None, scaled_size
+            # The aspect ratio changes by less than a pixel in each cell.
+            scaled_art = art.scaled(scaled_size,
+                                    Qt.AspectRatioMode.IgnoreAspectRatio)
+            return scaled_art, scaled_size
+        if not self.share_tiles:
+            scaled_art = art.scaled(width,
+                                    height,
                                     Qt.AspectRatioMode.KeepAspectRatio)
+            return scaled_art, scaled_art.size()
+        scaled_size = art.size().scaled(int(width),
+                                        int(height),
+                                        Qt.AspectRatioMode.KeepAspectRatio)
+        return None, scaled_size
+
+    def align_size(self, size: QSize) -> QSize:
+        """ Shrink a size to a whole number of pixels for every cell. """
+        return QSize(max(size.width() // self.cols, 1) * self.cols,
+                     max(size.height() // self.rows, 1) * self.rows)
+
+    def get_grid_portions(self) -> typing.Tuple[float, float]:
+        """ Portions of the width and height that the grid's art can fill. """
+        if self.row_clues:
+            return (0.97 * self.rows / (self.rows+1),
+                    0.97 * self.cols / (self.cols+1))
+        return 0.84, 0.84
+
+    def get_pieces_portion(self) -> float:
+        """ Portion of the width and height that the pieces can fill. """
+        return 0.6 if self.is_shuffled and not self.row_clues else 0.9
+
+    def get_print_size(self, art_size: QSize) -> QSize:
+        """ Find the biggest size that draw() or draw_grid() will paint art.
+
+        Art with more pixels than this is wasted on the target.
+        """
+        x_portion, y_portion = self.get_grid_portions()
+        pieces_portion = self.get_pieces_portion()
+        x_portion = max(x_portion, pieces_portion)
+        y_portion = max(y_portion, pieces_portion)
+        return art_size.scaled(round(self.rect.width() * x_portion),
+                               round(self.rect.height() * y_portion),
+                               Qt.AspectRatioMode.KeepAspectRatio)
+
+    def get_tiles(self,
+                  art: Art,
+                  size: typing.Optional[QSize] = None
+                  ) -> typing.List[typing.List[Art]]:
+        """ Cut art into one pixmap per cell, reusing earlier results.
+
+        :param art: the art to cut up
+        :param size: the size to scale the art to before cutting it, so each
+            tile can be copied without scaling, or None to cut the art as it is
+        """
+        key = (art.cacheKey(), self.rows, self.cols)
+        if key != self.tiles_key:
+            self.tiles.clear()
+            self.tiles_key = key
+        size_key = None if size is None else (size.width(), size.height())
+        tiles = self.tiles.get(size_key)
+        if tiles is None:
+            if size is not None:
+                art = art.scaled(size,
+                                 Qt.AspectRatioMode.IgnoreAspectRatio,
+                                 Qt.TransformationMode.SmoothTransformation)
+            width = art.width()
+            height = art.height()
+            tiles = []
+            for i in range(self.rows):
+                top = round(i * height / self.rows)
+                bottom = round((i+1) * height / self.rows)
+                row_tiles = []
+                for j in range(self.cols):
+                    left = round(j * width / self.cols)
+                    right = round((j+1) * width / self.cols)
+                    row_tiles.append(art.copy(left,
+                                              top,
+                                              right - left,
+                                              bottom - top))
+                tiles.append(row_tiles)
+            self.tiles[size_key] = tiles
+        return tiles
+
+    def get_shared_tiles(
+            self,
+            art: Art,
+            scaled_size: QSize) -> typing.List[typing.List[Art]]:
+        """ Get the tiles to draw pieces from when tiles are shared.
+
+        Pixel-aligned tiles are cut from the art scaled down to scaled_size,
+        so each one is copied to its cell pixel for pixel. Otherwise the tiles
+        keep the art's size, and the painter scales them.
+        """
+        if self.is_prescaled(art, scaled_size):
+            return self.get_tiles(art, scaled_size)
+        return self.get_tiles(art)
+
+    def is_prescaled(self, art: Art, scaled_size: QSize) -> bool:
+        """ Check if shared pieces should be scaled before painting them.
+
+        Only raster art gets scaled, and only down, so the cached pixels
+        never outgrow the art, no matter how big the target is. Enlarged
+        and vector pieces are left for the painter to scale.
+        """
+        if not self.is_pixel_aligned or isinstance(art, VectorArt):
+            return False
+        return (scaled_size.width() <= art.width() and
+                scaled_size.height() <= art.height())
+
+    @staticmethod
+    def draw_tile(painter: QPainter,
+                  x: float,
+                  y: float,
+                  width: float,
+                  height: float,
+                  tile: Art):
+        if isinstance(tile, VectorArt):
+            tile.draw(painter, QRectF(x, y, width, height))
+            return
+        # Always draw the whole pixmap, so QPdfWriter can find it in its cache.
+        painter.drawPixmap(QRectF(x, y, width, height), tile, QRectF(tile.rect()))
+
+    def get_symbol_clues(self, width: int, height: int) -> 'SymbolClues':
+        """ Get the symbol clues scaled to a cell size, reusing earlier ones.
+        """
+        key = (tuple(clue.cacheKey() for clue in self.row_clues),
+               tuple(clue.cacheKey() for clue in self.column_clues))
+        if key != self.symbol_clues_key:
+            self.symbol_clues.clear()
+            self.symbol_clues_key = key
+        size_key = (width, height)
+        symbol_clues = self.symbol_clues.get(size_key)
+        if symbol_clues is None:
+            # Shared tiles get scaled while painting, so vector devices can
+            # store each clue once for every cell size. Pixel-aligned ones
+            # are scaled down to the cell first, to be copied without
+            # filtering.
+            clues = list(self.row_clues) + list(self.column_clues)
+            is_scaled = not self.share_tiles or all(
+                self.is_prescaled(clue, QSize(width, height))
+                for clue in clues)
+            symbol_clues = SymbolClues(self.row_clues,
+                                       self.column_clues,
+                                       width,
+                                       height,
+                                       is_scaled=is_scaled)
+            self.symbol_clues[size_key] = symbol_clues
+        return symbol_clues
+
+    def draw_symbols(self,
+                     painter: QPainter,
+                     x: float,
+                     y: float,
+                     symbol_clues: 'SymbolClues',
+                     i: int,
+                     j: int):
+        """ Draw the symbol clues for row i and column j in one cell. """
+        if self.share_tiles:
+            # Keep the clues separate, so vector devices store each one once.
+            # draw_tile() scales them to the cell.
+            self.draw_tile(painter,
+                           x, y,
+                           symbol_clues.width, symbol_clues.height,
+                           symbol_clues.row_clues[i])
+            self.draw_tile(painter,
+                           x, y,
+                           symbol_clues.width, symbol_clues.height,
+                           symbol_clues.column_clues[j])
         else:
-            filled_portion = 0.84
-            scaled_art = art.scaled(self.rect.width()*filled_portion,
-                                    self.rect.height()*filled_portion,
-                                    Qt.AspectRatioMode.KeepAspectRatio)
-        cell_height = scaled_art.height() / rows
-        cell_width = scaled_art.width() / columns
+            painter.drawPixmap(QPointF(x, y), symbol_clues.get_overlay(i, j))
+
+    @timed('ArtShuffler.draw_grid')
+    def draw_grid(self, art: Art, painter: typing.Optional[QPainter] = None):
+        rows = self.rows
+        columns = self.cols
+        x_filled_portion, y_filled_portion = self.get_grid_portions()
+        scaled_art, scaled_size = self.scale_art(
+            art,
+            self.rect.width()*x_filled_portion,
+            self.rect.height()*y_filled_portion)
+        cell_height = scaled_size.height() / rows
+        cell_width = scaled_size.width() / columns
         if self.row_clues:
             left_clue_border = round((self.rect.width() -
-                                      scaled_art.width() -
+                                      scaled_size.width() -
                                       cell_width) / 3)
             top_clue_border = round((self.rect.height() -
-                                     scaled_art.height() -
+                                     scaled_size.height() -
                                      cell_height) / 3)
             min_border = min(left_clue_border, top_clue_border)
             left_clue_border = round((3*left_clue_border - min_border) / 2)
@@ -70,8 +291,8 @@ class ArtShuffler:
             left_border = left_clue_border + cell_width + min_border
             top_border = top_clue_border + cell_height + min_border
         else:
-            left_border = int((self.rect.width()-scaled_art.width()) / 2)
-            top_border = int((self.rect.height()-scaled_art.height()) / 2)
+            left_border = int((self.rect.width()-scaled_size.width()) / 2)
+            top_border = int((self.rect.height()-scaled_size.height()) / 2)
             left_clue_border = top_clue_border = None
         if painter is None:
             painter = QPainter(self.target)
@@ -86,34 +307,52 @@ class ArtShuffler:
                               painter)
         is_grid_filled = (self.selected_row is not None or
                           self.selected_column is not None)
-        self.row_clue_rects.clear()
-        for i, clue in enumerate(self.row_clues):
-            clue_rect = QRect(left_clue_border,
-                              round(top_border + i * cell_height),
-                              round(cell_width),
-                              round(cell_height))
-            self.row_clue_rects.append(clue_rect)
-            painter.drawPixmap(clue_rect, clue)
-            if is_grid_filled:
-                for j in range(self.cols):
-                    painter.drawPixmap(round(left_border + j * cell_width), round(top_border + i * cell_height),
-                                       round(cell_width), round(cell_height),
-                                       clue)
-        self.column_clue_rects.clear()
-        for j, clue in enumerate(self.column_clues):
-            clue_rect = QRect(round(left_border + j * cell_width),
-                              top_clue_border,
-                              round(cell_width),
-                              round(cell_height))
-            self.column_clue_rects.append(clue_rect)
-            painter.drawPixmap(clue_rect, clue)
+        self.grid_layout = GridLayout(rows,
+                                      columns,
+                                      left_border,
+                                      top_border,
+                                      cell_width,
+                                      cell_height,
+                                      left_clue_border,
+                                      top_clue_border)
+        if self.row_clues:
+            symbol_clues = self.get_symbol_clues(round(cell_width),
+                                                 round(cell_height))
+            for i, clue in enumerate(symbol_clues.row_clues):
+                self.draw_tile(painter,
+                               left_clue_border,
+                               round(top_border + i * cell_height),
+                               symbol_clues.width,
+                               symbol_clues.height,
+                               clue)
+            for j, clue in enumerate(symbol_clues.column_clues):
+                self.draw_tile(painter,
+                               round(left_border + j * cell_width),
+                               top_clue_border,
+                               symbol_clues.width,
+                               symbol_clues.height,
+                               clue)
             if is_grid_filled:
                 for i in range(self.rows):
                     y = round(top_border + i*cell_height)
-                    painter.drawPixmap(round(left_border + j * cell_width), y,
-                                       round(cell_width), round(cell_height),
-                                       clue)
-        if is_grid_filled:
+                    for j in range(self.cols):
+                        self.draw_symbols(painter,
+                                          round(left_border + j*cell_width),
+                                          y,
+                                          symbol_clues,
+                                          i,
+                                          j)
+        if is_grid_filled and scaled_art is None:
+            tiles = self.get_shared_tiles(art, scaled_size)
+            for i in range(self.rows):
+                for j in range(self.cols):
+                    self.draw_tile(painter,
+                                   left_border + j*cell_width,
+                                   top_border + i*cell_height,
+                                   cell_width,
+                                   cell_height,
+                                   tiles[i][j])
+        elif is_grid_filled:
             painter.drawPixmap(left_border,
                                top_border,
                                round(self.cols*cell_width),
@@ -165,10 +404,9 @@ class ArtShuffler:
         font_size = round(top_border * 0.99)
         font.setPixelSize(font_size)
         painter.setFont(font)
-        ascii_code = ord('A')
         for i in range(self.rows):
             for j in range(self.cols):
-                letter = chr(ascii_code)
+                letter = make_label(i*self.cols + j)
                 x = round(left_border + j * cell_width)
                 y = round(top_border + i * cell_height)
                 w = round(cell_width)
@@ -188,93 +426,168 @@ class ArtShuffler:
                 else:
                     x = y = w = h = 0
                 if w != 0:
-                    painter.drawText(x, y,
-                                     w, h,
-                                     Qt.AlignmentFlag.AlignCenter,
-                                     letter)
-                ascii_code += 1
-
-    def draw(self, art: QPixmap, painter: typing.Optional[QPainter] = None):
-        filled_portion = 0.6 if self.is_shuffled and not self.row_clues else 0.9
-        scaled_art = art.scaled(self.rect.width()*filled_portion,
-                                self.rect.height()*filled_portion,
-                                Qt.AspectRatioMode.KeepAspectRatio)
+                    self.text_cache.draw(painter, x, y, w, letter, h)
+
+    @timed('ArtShuffler.draw')
+    def draw(self,
+             art: typing.Union[Art, QImage],
+             painter: typing.Optional[QPainter] = None,
+             is_draft: bool = False):
+        """ Draw the pieces of art in their current order.
+
+        :param art: the art to break into pieces, as a QImage when drawing
+            outside the GUI thread, where pixmaps aren't safe to use
+        :param painter: the painter to use, or None to paint on the target
+        :param is_draft: True if only the pieces and their outlines are drawn,
+            without clues, to keep up with dragging
+        """
+        filled_portion = self.get_pieces_portion()
+        scaled_art, scaled_size = self.scale_art(
+            art,
+            self.rect.width()*filled_portion,
+            self.rect.height()*filled_portion)
+        if scaled_art is None:
+            tiles = self.get_shared_tiles(art, scaled_size)
+        else:
+            tiles = None
         if painter is None:
             painter = QPainter(self.target)
         painter.fillRect(self.rect, QColor('white'))
-        cell_height = round(scaled_art.height() / self.rows)
+        cell_height = round(scaled_size.height() / self.rows)
         vertical_padding = self.rect.height() - self.rows * cell_height
         row_padding = vertical_padding / self.rows
-        cell_width = round(scaled_art.width() / self.cols)
+        cell_width = round(scaled_size.width() / self.cols)
         horizontal_padding = self.rect.width() - self.cols * cell_width
         col_padding = horizontal_padding / self.cols
         padding = min(row_padding, col_padding)
         left_border = self.cols * (col_padding - padding) / 2
         top_border = self.rows * (row_padding - padding) / 2
+        if self.is_pixel_aligned:
+            padding = floor(padding)
+            left_border = floor(left_border)
+            top_border = floor(top_border)
+            piece_offset = padding // 2
+        else:
+            piece_offset = padding / 2
         font = painter.font()
-        font.setPixelSize(padding/2.6)
+        # Large grids in small views can leave less than a pixel for text.
+        font.setPixelSize(max(int(padding/2.6), 1))
         painter.setFont(font)
         old_pen = painter.pen()
         grey_pen = QPen(QColor('lightgrey'))
         width = max(cell_width/35, 2)
         grey_pen.setWidth(round(width))
+        if self.row_clues and self.is_shuffled and not is_draft:
+            symbol_clues = self.get_symbol_clues(cell_width, cell_height)
+        else:
+            symbol_clues = None
+        # (x, y) for each cell, in reading order
+        positions = []
         y = top_border
-        cell_index = 0
         for i in range(self.rows):
             x = left_border
             for j in range(self.cols):
-                si, sj, label = self.cells[cell_index]
-                clue = self.clues.get(label.lower(), label)
-                sx = sj * cell_width
-                sy = si * cell_height
-                painter.setPen(grey_pen)
-                painter.drawRect(x+padding/2, y,
-                                 cell_width, cell_height)
-                painter.setPen(old_pen)
-                if self.is_shuffled:
-                    original_size = new_size = font.pixelSize()
-                    while True:
-                        # noinspection PyTypeChecker
-                        rect = painter.boundingRect(0, 0,
-                                                    cell_width, padding,
-                                                    Qt.AlignmentFlag.AlignLeft,
-                                                    clue)
-                        if (rect.width() <= cell_width + padding and
-                                rect.height() <= padding):
-                            break
-                        new_size *= 0.9
-                        font.setPixelSize(new_size)
-                        painter.setFont(font)
-                    if not self.row_clues:
-                        painter.drawText(x, y+cell_height,
-                                         cell_width + padding, padding,
-                                         Qt.AlignmentFlag.AlignHCenter, clue)
-                    else:
-                        painter.drawPixmap(x + padding / 2, y,
-                                           cell_width, cell_height,
-                                           self.row_clues[si],
-                                           0, 0,
-                                           0, 0)
-                        painter.drawPixmap(x + padding / 2, y,
-                                           cell_width, cell_height,
-                                           self.column_clues[sj],
-                                           0, 0,
-                                           0, 0)
-                    font.setPixelSize(original_size)
-                    painter.setFont(font)
-                painter.drawPixmap(x+padding/2, y,
+                positions.append((x, y))
+                x += cell_width + padding
+            y += cell_height + padding
+
+        # Outline all the cells in one call, instead of switching pens for
+        # each one.
+        painter.setPen(grey_pen)
+        painter.drawRects([QRect(int(x+piece_offset), int(y),
+                                 int(cell_width), int(cell_height))
+                           for x, y in positions])
+        painter.setPen(old_pen)
+        for (x, y), (si, sj, label) in zip(positions, self.cells):
+            clue = self.clues.get(label.lower(), label)
+            sx = sj * cell_width
+            sy = si * cell_height
+            if self.is_shuffled and not is_draft:
+                original_size = font.pixelSize()
+                new_size = self.fit_font(painter,
+                                         clue,
+                                         cell_width,
+                                         padding)
+                font.setPixelSize(new_size)
+                painter.setFont(font)
+                if not self.row_clues:
+                    # Whole pixels, like drawText() with separate numbers.
+                    self.text_cache.draw(painter,
+                                         int(x),
+                                         int(y + cell_height),
+                                         int(cell_width + padding),
+                                         clue)
+                else:
+                    self.draw_symbols(painter,
+                                      x + piece_offset,
+                                      y,
+                                      symbol_clues,
+                                      si,
+                                      sj)
+                font.setPixelSize(original_size)
+                painter.setFont(font)
+            if tiles is not None:
+                self.draw_tile(painter,
+                               x+piece_offset, y,
+                               cell_width, cell_height,
+                               tiles[si][sj])
+            elif isinstance(scaled_art, QImage):
+                painter.drawImage(QRectF(x+piece_offset, y,
+                                         cell_width, cell_height),
+                                  scaled_art,
+                                  QRectF(sx, sy, cell_width, cell_height))
+            else:
+                painter.drawPixmap(x+piece_offset, y,
                                    cell_width, cell_height,
                                    scaled_art,
                                    sx, sy,
                                    cell_width, cell_height)
 
-                x += cell_width + padding
-                cell_index += 1
+    @timed('ArtShuffler.fit_font')
+    def fit_font(self,
+                 painter: QPainter,
+                 clue: str,
+                 cell_width: int,
+                 padding: float) -> float:
+        """ Find a font size that fits the clue under its cell.
 
-            y += cell_height + padding
+        Sizes are cached until the layout or the painter's font changes.
+        """
+        font = painter.font()
+        original_size = new_size = font.pixelSize()
+        key = (font.family(), original_size, cell_width, padding)
+        if key != self.font_sizes_key:
+            self.font_sizes.clear()
+            self.font_sizes_key = key
+        cached_size = self.font_sizes.get(clue)
+        if cached_size is not None:
+            return cached_size
+        while True:
+            # noinspection PyTypeChecker
+            rect = painter.boundingRect(0, 0,
+                                        cell_width, padding,
+                                        Qt.AlignmentFlag.AlignLeft,
+                                        clue)
+            if (rect.width() <= cell_width + padding and
+                    rect.height() <= padding):
+                break
+            if new_size * 0.9 < 1:
+                break  # Too small to read anyway.
+            new_size *= 0.9
+            font.setPixelSize(new_size)
+            painter.setFont(font)
+        self.font_sizes[clue] = new_size
+        font.setPixelSize(original_size)
+        painter.setFont(font)
+        return new_size
 
     def shuffle(self):
-        shuffle(self.cells)
+        if self.is_optimized:
+            home_cells = sorted(self.cells)
+            optimizer = ShuffleOptimizer(self.rows, self.cols)
+            self.cells = [home_cells[k] for k in optimizer.optimize()]
+        else:
+            shuffle(self.cells)
         self.is_shuffled = True
 
     def sort(self):
@@ -282,14 +595,159 @@ class ArtShuffler:
         self.is_shuffled = False
 
     def select_clue(self, point: QPoint):
-        for i, clue_rect in enumerate(self.row_clue_rects):
-            if clue_rect.contains(point):
-                self.selected_row = i
-                self.selected_column = None
-                return
-
-        for j, clue_rect in enumerate(self.column_clue_rects):
-            if clue_rect.contains(point):
-                self.selected_row = None
-                self.selected_column = j
-                return
+        """ Select the row or column clue at a point from the last draw. """
+        if self.grid_layout is None:
+            return
+        i = self.grid_layout.row_clue_at(point)
+        if i is not None and i < len(self.row_clues):
+            self.selected_row = i
+            self.selected_column = None
+            return
+
+        j = self.grid_layout.column_clue_at(point)
+        if j is not None and j < len(self.column_clues):
+            self.selected_row = None
+            self.selected_column = j
+
+
+class SymbolClues:
+    """ Row and column symbol clues, scaled to fit one cell.
+
+    Each clue is scaled once, and the overlay of each row clue with each
+    column clue is composed the first time it's needed. Painting a cell's
+    clues is then a single unscaled draw.
+    """
+    def __init__(self,
+                 row_clues: typing.Iterable[QPixmap],
+                 column_clues: typing.Iterable[QPixmap],
+                 width: int,
+                 height: int,
+                 is_scaled: bool = True):
+        """ Initialize the object.
+
+        :param row_clues: one image to use as a clue for each row
+        :param column_clues: one image to use as a clue for each column
+        :param width: the width of a cell
+        :param height: the height of a cell
+        :param is_scaled: False if the clues should be kept at their original
+            size, so each one stays the same pixmap at any cell size.
+        """
+        self.width = width
+        self.height = height
+        self.is_scaled = is_scaled
+        self.row_clues = [self.scale_clue(clue) for clue in row_clues]
+        self.column_clues = [self.scale_clue(clue) for clue in column_clues]
+        self.overlays: typing.Dict[typing.Tuple[int, int], QPixmap] = {}
+
+    def scale_clue(self, clue: QPixmap) -> QPixmap:
+        if clue.width() == self.width and clue.height() == self.height:
+            return clue
+        if not self.is_scaled:
+            return clue
+        # Same transformation as a painter's default, so pixels don't change.
+        return clue.scaled(max(self.width, 1),
+                           max(self.height, 1),
+                           Qt.AspectRatioMode.IgnoreAspectRatio,
+                           Qt.TransformationMode.FastTransformation)
+
+    def get_overlay(self, i: int, j: int) -> QPixmap:
+        """ Get the row i clue with the column j clue drawn over it. """
+        overlay = self.overlays.get((i, j))
+        if overlay is None:
+            row_clue = self.row_clues[i]
+            overlay = QPixmap(row_clue.size())
+            overlay.fill(Qt.GlobalColor.transparent)
+            painter = QPainter(overlay)
+            try:
+                painter.drawPixmap(0, 0, row_clue)
+                painter.drawPixmap(0, 0, self.column_clues[j])
+            finally:
+                painter.end()
+            self.overlays[(i, j)] = overlay
+        return overlay
+
+
+class GridLayout:
+    """ Where the grid and clue strips were drawn, for finding cells.
+
+    Cells are all the same size, so hit-testing is arithmetic, and costs the
+    same no matter how many rows and columns there are.
+    """
+    def __init__(self,
+                 rows: int,
+                 cols: int,
+                 left_border: float,
+                 top_border: float,
+                 cell_width: float,
+                 cell_height: float,
+                 left_clue_border: typing.Optional[float] = None,
+                 top_clue_border: typing.Optional[float] = None):
+        """ Initialize the object.
+
+        :param rows: the number of rows in the grid
+        :param cols: the number of columns in the grid
+        :param left_border: the left edge of the grid
+        :param top_border: the top edge of the grid
+        :param cell_width: the width of each cell
+        :param cell_height: the height of each cell
+        :param left_clue_border: the left edge of the row clues, or None if
+            there aren't any
+        :param top_clue_border: the top edge of the column clues, or None if
+            there aren't any
+        """
+        self.rows = rows
+        self.cols = cols
+        self.left_border = left_border
+        self.top_border = top_border
+        self.cell_width = cell_width
+        self.cell_height = cell_height
+        self.left_clue_border = left_clue_border
+        self.top_clue_border = top_clue_border
+
+    def cell_at(self, point: QPoint) -> typing.Optional[typing.Tuple[int, int]]:
+        """ Find the grid cell at a point.
+
+        :return: (i, j) for the row and column, or None if the point is
+            outside the grid
+        """
+        i = self.row_at(point.y())
+        j = self.column_at(point.x())
+        if i is None or j is None:
+            return None
+        return i, j
+
+    def row_clue_at(self, point: QPoint) -> typing.Optional[int]:
+        """ Find which row clue is at a point, or None. """
+        if self.left_clue_border is None:
+            return None
+        if not is_inside(point.x(), self.left_clue_border, self.cell_width, 1):
+            return None
+        return self.row_at(point.y())
+
+    def column_clue_at(self, point: QPoint) -> typing.Optional[int]:
+        """ Find which column clue is at a point, or None. """
+        if self.top_clue_border is None:
+            return None
+        if not is_inside(point.y(), self.top_clue_border, self.cell_height, 1):
+            return None
+        return self.column_at(point.x())
+
+    def row_at(self, y: float) -> typing.Optional[int]:
+        return find_index(y, self.top_border, self.cell_height, self.rows)
+
+    def column_at(self, x: float) -> typing.Optional[int]:
+        return find_index(x, self.left_border, self.cell_width, self.cols)
+
+
+def find_index(position: float,
+               start: float,
+               size: float,
+               count: int) -> typing.Optional[int]:
+    """ Find which of count equal spans contains a position, or None. """
+    if size <= 0 or not is_inside(position, start, size, count):
+        return None
+    return min(floor((position - start) / size), count - 1)
+
+
+def is_inside(position: float, start: float, size: float, count: int) -> bool:
+    return start <= position < start + size*count
@@ -0,0 +1,246 @@
+import typing
+from abc import ABC, abstractmethod
+from itertools import count
+from pathlib import Path
+
+from PySide6.QtCore import QRectF, QSize, Qt
+from PySide6.QtGui import QFont, QPainter, QPixmap
+from PySide6.QtSvg import QSvgRenderer
+
+from sliced_art.image_pyramid import ImagePyramid
+from sliced_art.vector_recording import VectorRecording
+
+VECTOR_SUFFIXES = ('.svg', '.svgz')
+
+
+class VectorArt:
+    """ A section of a vector drawing, rendered only when it's painted.
+
+    It has the QPixmap methods that the shufflers and puzzle painter use, so
+    it can stand in for the selected art. Painting it on a vector device like
+    QPdfWriter keeps the vectors, and scaling it renders exactly the pixels
+    that are needed, instead of resampling some arbitrary raster size.
+    Painting only replays the shapes in the section, so the pieces of a
+    drawing add up to about one copy of it in a PDF.
+    """
+    def __init__(self,
+                 recording: VectorRecording,
+                 source: QRectF,
+                 size: QSize):
+        """ Initialize the object.
+
+        :param recording: the whole drawing, shared by all its sections
+        :param source: the section to show, in the drawing's coordinates
+        :param size: the nominal pixel size of the section, used for
+            cropping and layout arithmetic
+        """
+        self.recording = recording
+        self.renderer = recording.renderer
+        self.source = QRectF(source)
+        self._size = QSize(max(size.width(), 1), max(size.height(), 1))
+
+    def size(self) -> QSize:
+        return QSize(self._size)
+
+    def width(self) -> int:
+        return self._size.width()
+
+    def height(self) -> int:
+        return self._size.height()
+
+    def isNull(self) -> bool:
+        return not self.renderer.isValid()
+
+    def cacheKey(self) -> tuple:
+        # Anything cached with this key holds the recording, so its id can't
+        # be reused while the key is in use.
+        return (id(self.recording),
+                self.source.getRect(),
+                self._size.width(),
+                self._size.height())
+
+    def copy(self,
+             x: float,
+             y: float,
+             width: float,
+             height: float) -> 'VectorArt':
+        """ Select part of this section, in nominal pixels. """
+        scale_x = self.source.width() / self._size.width()
+        scale_y = self.source.height() / self._size.height()
+        source = QRectF(self.source.x() + x*scale_x,
+                        self.source.y() + y*scale_y,
+                        width*scale_x,
+                        height*scale_y)
+        return VectorArt(self.recording, source, QSize(round(width),
+                                                       round(height)))
+
+    def scaled(self,
+               width: typing.Union[float, QSize],
+               height: typing.Union[float, Qt.AspectRatioMode, None] = None,
+               aspect_mode: typing.Any = Qt.AspectRatioMode.KeepAspectRatio,
+               *_) -> QPixmap:
+        """ Render at a new size, with the same arguments as QPixmap.scaled.
+
+        The transformation mode is ignored, because rendering is always
+        smooth.
+        """
+        if isinstance(width, QSize):
+            if height is not None:
+                aspect_mode = height
+            width, height = width.width(), width.height()
+        size = self._size.scaled(int(width), int(height), aspect_mode)
+        pixmap = QPixmap(max(size.width(), 1), max(size.height(), 1))
+        pixmap.fill(Qt.GlobalColor.transparent)
+        painter = QPainter(pixmap)
+        try:
+            # Nothing to share on a pixmap, so render in one call.
+            self.render(painter, QRectF(pixmap.rect()))
+        finally:
+            painter.end()
+        return pixmap
+
+    def draw(self, painter: QPainter, target: QRectF):
+        """ Draw this section of the drawing to fill the target.
+
+        Only the shapes that touch the section are painted.
+        """
+        painter.save()
+        try:
+            painter.setClipRect(target, Qt.ClipOperation.IntersectClip)
+            self.recording.draw(painter, self.source, target)
+        finally:
+            painter.restore()
+
+    def render(self, painter: QPainter, target: QRectF):
+        """ Render the whole drawing, clipped to this section. """
+        view_box = self.renderer.viewBoxF()
+        scale_x = target.width() / self.source.width()
+        scale_y = target.height() / self.source.height()
+        # Place the whole drawing so this section lands on the target, then
+        # clip off everything else.
+        bounds = QRectF(target.x() - (self.source.x()-view_box.x())*scale_x,
+                        target.y() - (self.source.y()-view_box.y())*scale_y,
+                        view_box.width() * scale_x,
+                        view_box.height() * scale_y)
+        painter.save()
+        try:
+            painter.setClipRect(target, Qt.ClipOperation.IntersectClip)
+            # SVG text sizes break with a painter font set in pixels.
+            painter.setFont(QFont())
+            self.renderer.render(painter, bounds)
+        finally:
+            painter.restore()
+
+
+Art = typing.Union[QPixmap, VectorArt]
+
+
+class ArtSource(ABC):
+    """ The art that puzzles are cut from, whatever format it was read from.
+
+    The main window only asks for the whole art at screen sizes, and for the
+    selected section at full quality, so each format can supply them in its
+    own way.
+    """
+    # Changes whenever different art is loaded.
+    cache_key: typing.Hashable = None
+
+    @abstractmethod
+    def size(self) -> QSize:
+        """ The art's natural size in pixels. """
+
+    @abstractmethod
+    def scaled(self, size: QSize) -> QPixmap:
+        """ The whole art, scaled to fit inside size. """
+
+    @abstractmethod
+    def level_for(self, size: QSize) -> QPixmap:
+        """ The whole art, at least as big as size, and cheap to get. """
+
+    @abstractmethod
+    def crop(self, x: float, y: float, width: float, height: float) -> Art:
+        """ Select a section of the art at full quality.
+
+        All the arguments are fractions of the art's size.
+        """
+
+
+class RasterArtSource(ArtSource):
+    def __init__(self, pixmap: QPixmap):
+        self.pyramid = ImagePyramid(pixmap)
+        self.cache_key = pixmap.cacheKey()
+
+    def size(self) -> QSize:
+        return self.pyramid.original.size()
+
+    def scaled(self, size: QSize) -> QPixmap:
+        return self.pyramid.scaled(size)
+
+    def level_for(self, size: QSize) -> QPixmap:
+        return self.pyramid.level_for(size)
+
+    def crop(self, x: float, y: float, width: float, height: float) -> Art:
+        original = self.pyramid.original
+        if (x, y, width, height) == (0, 0, 1, 1):
+            return original
+        original_size = original.size()
+        return original.copy(x * original_size.width(),
+                             y * original_size.height(),
+                             width * original_size.width(),
+                             height * original_size.height())
+
+
+class SvgArtSource(ArtSource):
+    """ A vector drawing, rendered at whatever size it's shown.
+
+    Nothing is rasterized up front, so large drawings don't use much
+    memory, and the selected section stays vector until it's painted.
+    """
+    # Larger side of the nominal pixel size, used for cropping and layout.
+    NOMINAL_SIZE = 2048
+
+    keys = count(1)
+
+    def __init__(self, renderer: QSvgRenderer):
+        self.renderer = renderer
+        self.recording = VectorRecording(renderer)
+        self.cache_key = ('svg', next(self.keys))
+        view_box = renderer.viewBoxF()
+        self.nominal_size = view_box.size().scaled(
+            self.NOMINAL_SIZE,
+            self.NOMINAL_SIZE,
+            Qt.AspectRatioMode.KeepAspectRatio).toSize()
+
+    @classmethod
+    def load(cls, image_path: str) -> typing.Optional['SvgArtSource']:
+        """ Read an SVG file, or return None if it can't be read. """
+        renderer = QSvgRenderer(image_path)
+        if not renderer.isValid() or renderer.viewBoxF().isEmpty():
+            return None
+        return cls(renderer)
+
+    def size(self) -> QSize:
+        return QSize(self.nominal_size)
+
+    def scaled(self, size: QSize) -> QPixmap:
+        return self.crop(0, 0, 1, 1).scaled(size)
+
+    def level_for(self, size: QSize) -> QPixmap:
+        return self.crop(0, 0, 1, 1).scaled(
+            size,
+            Qt.AspectRatioMode.KeepAspectRatioByExpanding)
+
+    def crop(self, x: float, y: float, width: float, height: float) -> Art:
+        view_box = self.renderer.viewBoxF()
+        source = QRectF(view_box.x() + x*view_box.width(),
+                        view_box.y() + y*view_box.height(),
+                        width * view_box.width(),
+                        height * view_box.height())
+        return VectorArt(self.recording,
+                         source,
+                         QSize(round(width * self.nominal_size.width()),
+                               round(height * self.nominal_size.height())))
+
+
+def is_vector_path(image_path: str) -> bool:
+    return Path(image_path).suffix.lower() in VECTOR_SUFFIXES
@@ -0,0 +1,108 @@
+import typing
+
+from PySide6.QtGui import QImage
+
+from sliced_art.line_art import to_gray_image
+
+Bounds = typing.Tuple[int, int, int, int]
+Fraction = typing.Tuple[float, float, float, float]
+
+
+def find_content_bounds(image: QImage,
+                        tolerance: int = 24) -> typing.Optional[Bounds]:
+    """ Find the box around everything that isn't background.
+
+    The background is the grey level of the corners. Each pixel is marked
+    as content or background by translating the grey bytes through a lookup
+    table, then each row is searched for its first and last content pixel,
+    so the work happens in C instead of a Python loop over pixels. Pass a
+    small pyramid level, because the answer only needs to be approximate.
+
+    :param image: the art, in any format
+    :param tolerance: the difference in grey level from the background
+        that counts as content
+    :return: (left, top, right, bottom) in pixels, with right and bottom
+        just past the content, or None if the image is blank
+    """
+    gray = to_gray_image(image)
+    width = gray.width()
+    height = gray.height()
+    if width == 0 or height == 0:
+        return None
+    line_size = gray.bytesPerLine()
+    levels = bytes(gray.constBits())
+    corners = sorted(levels[y*line_size + x]
+                     for x in (0, width-1)
+                     for y in (0, height-1))
+    background = corners[len(corners) // 2]
+    marks = bytes(int(abs(level - background) > tolerance)
+                  for level in range(256))
+    content = levels.translate(marks)
+
+    left = width
+    right = top = bottom = -1
+    for y in range(height):
+        start = y * line_size
+        row_left = content.find(1, start, start+width)
+        if row_left < 0:
+            continue
+        if top < 0:
+            top = y
+        bottom = y
+        left = min(left, row_left - start)
+        right = max(right, content.rfind(1, start, start+width) - start)
+    if top < 0:
+        return None
+    return left, top, right + 1, bottom + 1
+
+
+def suggest_frame(image: QImage,
+                  rows: int,
+                  cols: int,
+                  margin: float = 0.02,
+                  tolerance: int = 24) -> Fraction:
+    """ Suggest a selection that holds all the content with square cells.
+
+    The content box gets a margin, then grows in width or height until it
+    has the same shape as the grid. If that won't fit in the image, it's
+    clamped to the image edges, so no content gets cut off.
+
+    :param image: the art, small is fine
+    :param rows: the number of rows in the grid
+    :param cols: the number of columns in the grid
+    :param margin: the space to leave around the content, as a fraction of
+        the image's larger side
+    :param tolerance: the difference in grey level from the background
+        that counts as content
+    :return: the selection as fractions of the image size: (x, y, width,
+        height)
+    """
+    width = image.width()
+    height = image.height()
+    if width == 0 or height == 0:
+        return 0.0, 0.0, 1.0, 1.0
+    bounds = find_content_bounds(image, tolerance)
+    if bounds is None:
+        bounds = (0, 0, width, height)
+    left, top, right, bottom = bounds
+    space = margin * max(width, height)
+    frame_width = right - left + 2*space
+    frame_height = bottom - top + 2*space
+    aspect = cols / rows
+    if frame_width < frame_height * aspect:
+        frame_width = frame_height * aspect
+    else:
+        frame_height = frame_width / aspect
+    frame_width = min(frame_width, width)
+    frame_height = min(frame_height, height)
+
+    x = clamp((left + right - frame_width) / 2, 0, width - frame_width)
+    y = clamp((top + bottom - frame_height) / 2, 0, height - frame_height)
+    return (x / width,
+            y / height,
+            frame_width / width,
+            frame_height / height)
+
+
+def clamp(value: float, low: float, high: float) -> float:
+    return max(low, min(value, high))
@@ -0,0 +1,93 @@
+import typing
+from itertools import count
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+
+
+class LoadSignals(QObject):
+    # (name, load number, result, error message) sent back to the GUI thread
+    finished = Signal(str, int, object, str)
+
+
+class LoadTask(QRunnable):
+    def __init__(self,
+                 signals: LoadSignals,
+                 name: str,
+                 number: int,
+                 load: typing.Callable[[], typing.Any]):
+        super().__init__()
+        self.signals = signals
+        self.name = name
+        self.number = number
+        self.load = load
+
+    def run(self):
+        try:
+            result = self.load()
+        except Exception as ex:  # Report anything, or nobody hears back.
+            self.signals.finished.emit(self.name,
+                                       self.number,
+                                       None,
+                                       str(ex) or type(ex).__name__)
+            return
+        self.signals.finished.emit(self.name, self.number, result, '')
+
+
+class BackgroundLoader(QObject):
+    """ Load slow resources on worker threads, and report back on the GUI
+    thread.
+
+    Each load has a name, and starting a load replaces any earlier load with
+    the same name: it can't be stopped, but its result is ignored. The load
+    function must not use QPixmap or widgets, because it runs outside the
+    GUI thread.
+    """
+    loaded = Signal(str, object)  # (name, result)
+    failed = Signal(str, str)  # (name, error message)
+
+    def __init__(self, parent: typing.Optional[QObject] = None):
+        super().__init__(parent)
+        self.thread_pool = QThreadPool(self)
+        # {name: number of the latest load with that name}
+        self.pending: typing.Dict[str, int] = {}
+        self.load_numbers = count(1)
+        self.signals = LoadSignals()
+        # noinspection PyUnresolvedReferences
+        self.signals.finished.connect(self.on_finished)
+
+    def start(self, name: str, load: typing.Callable[[], typing.Any]):
+        """ Start loading something.
+
+        :param name: the name to report the result under
+        :param load: a function that loads and returns the result
+        """
+        number = next(self.load_numbers)
+        self.pending[name] = number
+        self.thread_pool.start(LoadTask(self.signals, name, number, load))
+
+    def cancel(self, name: str):
+        """ Ignore the result of a load that's still running. """
+        self.pending.pop(name, None)
+
+    def is_loading(self, name: str) -> bool:
+        return name in self.pending
+
+    def wait(self):
+        """ Block until the running loads finish.
+
+        Their results are still reported through the event loop.
+        """
+        self.thread_pool.waitForDone()
+
+    def on_finished(self,
+                    name: str,
+                    number: int,
+                    result: typing.Any,
+                    error: str):
+        if self.pending.get(name) != number:
+            return  # Replaced or cancelled.
+        del self.pending[name]
+        if error:
+            self.failed.emit(name, error)
+        else:
+            self.loaded.emit(name, result)
@@ -0,0 +1,69 @@
+import typing
+
+from PySide6.QtCore import QSettings, QTimer
+
+from sliced_art.profiling import timed
+
+
+class BatchedSettings:
+    """ Keep settings changes in memory, and write them to QSettings later.
+
+    Same interface as QSettings for reading and writing values. Changes are
+    coalesced and flushed together once they stop arriving for a while, or
+    when flush() is called, so interactive editing doesn't write the registry
+    or INI file on every change.
+    """
+    def __init__(self,
+                 settings: typing.Optional[QSettings] = None,
+                 delay: int = 2000):
+        """ Initialize the object.
+
+        :param settings: where to write the settings, or None for the default
+            application settings
+        :param delay: milliseconds to wait for more changes before flushing
+        """
+        self.settings = QSettings() if settings is None else settings
+        self.pending = {}  # {key: value} not written yet
+        self.written = {}  # {key: value} written during this session
+        self.timer = QTimer()
+        self.timer.setInterval(delay)
+        self.timer.setSingleShot(True)
+        # noinspection PyUnresolvedReferences
+        self.timer.timeout.connect(self.flush)
+
+    def value(self, key: str, default=None, value_type: type = None):
+        try:
+            value = self.pending[key]
+        except KeyError:
+            if value_type is None:
+                return self.settings.value(key, default)
+            return self.settings.value(key, default, value_type)
+        if value_type is not None and value is not None:
+            value = value_type(value)
+        return value
+
+    def values(self, keys: typing.Iterable[str], default=None) -> dict:
+        """ Read a batch of values.
+
+        :return: {key: value}
+        """
+        return {key: self.value(key, default) for key in keys}
+
+    def setValue(self, key: str, value):
+        self.pending[key] = value
+        self.timer.start()
+
+    @timed('BatchedSettings.flush')
+    def flush(self):
+        """ Write all the pending changes that differ from earlier writes. """
+        self.timer.stop()
+        is_changed = False
+        for key, value in self.pending.items():
+            if key in self.written and self.written[key] == value:
+                continue
+            self.settings.setValue(key, value)
+            self.written[key] = value
+            is_changed = True
+        self.pending.clear()
+        if is_changed:
+            self.settings.sync()
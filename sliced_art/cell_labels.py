@@ -0,0 +1,18 @@
+import typing
+
+
+def make_label(index: int) -> str:
+    """ Label a cell like a spreadsheet column: A to Z, then AA, AB, and so on.
+
+    :param index: the cell's position in reading order, starting at 0
+    """
+    label = ''
+    index += 1
+    while index > 0:
+        index, remainder = divmod(index - 1, 26)
+        label = chr(65 + remainder) + label
+    return label
+
+
+def make_labels(count: int) -> typing.List[str]:
+    return [make_label(index) for index in range(count)]
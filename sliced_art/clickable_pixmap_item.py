@@ -1,10 +1,11 @@
-from PySide6.QtWidgets import QGraphicsPixmapItem, QGraphicsSceneMouseEvent
+from PySide6.QtWidgets import QGraphicsItem, QGraphicsPixmapItem, \
+    QGraphicsSceneMouseEvent
 
 
 class ClickablePixmapItem(QGraphicsPixmapItem):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.setFlag(self.ItemIsSelectable, True)
+        self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsSelectable, True)
         self.on_click = lambda event: None
 
     def mousePressEvent(self, event: QGraphicsSceneMouseEvent):
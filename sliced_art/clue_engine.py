@@ -0,0 +1,56 @@
+import typing
+from abc import ABC, abstractmethod
+
+
+class ClueEngine(ABC):
+    """ Turns the word typed for each letter into a clue.
+
+    Subclasses are constructed with (all_words, min_words), where all_words
+    can be a shared WordIndex, and get listed in the registry with
+    register_clue_engine().
+    """
+    name = ''  # Saved in the settings.
+    title = ''  # Shown to the user.
+
+    # True if a word is needed for the blank letter, ''.
+    needs_blank = False
+
+    @abstractmethod
+    def __setitem__(self, letter: str, word: str):
+        """ Set the word for a letter. """
+
+    @abstractmethod
+    def __getitem__(self, letter: str) -> str:
+        """ Get the word for a letter. """
+
+    @abstractmethod
+    def make_display(self, letter: str) -> str:
+        """ Describe how well the word for a letter works. """
+
+    @abstractmethod
+    def make_clues(self, is_fresh: bool = False) -> typing.Dict[str, str]:
+        """ Make a clue for each letter.
+
+        :param is_fresh: True if clues should be made again, instead of
+            reusing any that were made before.
+        """
+
+    def clear_clues(self):
+        """ Forget any clues that were made before. """
+
+    def restore_clues(self, clues: typing.Dict[str, str]):
+        """ Reuse clues that were made before, like ones saved in a file.
+
+        :param clues: {letter: clue} from make_clues()
+        """
+
+
+# {name: engine_class} in the order they were registered
+clue_engines: typing.Dict[str, typing.Type[ClueEngine]] = {}
+
+
+def register_clue_engine(
+        engine_class: typing.Type[ClueEngine]) -> typing.Type[ClueEngine]:
+    """ Add a clue engine to the registry. Can be used as a decorator. """
+    clue_engines[engine_class.name] = engine_class
+    return engine_class
@@ -0,0 +1,54 @@
+import typing
+
+from PySide6.QtCore import QSize, Qt
+from PySide6.QtGui import QPixmap
+
+
+class ImagePyramid:
+    """ A pixmap with copies at half, quarter, eighth size, and so on.
+
+    Levels are built the first time they're needed. Scaling from the smallest
+    level that is still big enough is much cheaper than scaling from a large
+    original, and smoothly halving each level keeps the quality up.
+    """
+    def __init__(self, pixmap: QPixmap):
+        self.levels: typing.List[QPixmap] = [pixmap]
+
+    @property
+    def original(self) -> QPixmap:
+        return self.levels[0]
+
+    def level_for(self, size: QSize) -> QPixmap:
+        """ Find the smallest level that is at least as big as size. """
+        index = 0
+        level = self.levels[0]
+        while True:
+            half_width = level.width() // 2
+            half_height = level.height() // 2
+            if (half_width < max(size.width(), 1) or
+                    half_height < max(size.height(), 1)):
+                return level
+            index += 1
+            if index == len(self.levels):
+                self.levels.append(level.scaled(
+                    half_width,
+                    half_height,
+                    Qt.AspectRatioMode.IgnoreAspectRatio,
+                    Qt.TransformationMode.SmoothTransformation))
+            level = self.levels[index]
+
+    def scaled(self, size: QSize) -> QPixmap:
+        """ Scale the original to fit inside size, keeping its aspect ratio.
+
+        The result is the same size as scaling the original, but it's scaled
+        from a smaller level when possible.
+        """
+        target_size = self.original.size().scaled(
+            size,
+            Qt.AspectRatioMode.KeepAspectRatio)
+        level = self.level_for(target_size)
+        if level.size() == target_size:
+            return level
+        return level.scaled(target_size,
+                            Qt.AspectRatioMode.IgnoreAspectRatio,
+                            Qt.TransformationMode.SmoothTransformation)
@@ -37,6 +37,16 @@ class Ui_MainWindow(object):
         self.action_open_words.setObjectName(u"action_open_words")
         self.action_save_png = QAction(MainWindow)
         self.action_save_png.setObjectName(u"action_save_png")
+        self.action_save_booklet = QAction(MainWindow)
+        self.action_save_booklet.setObjectName(u"action_save_booklet")
+        self.action_open_project = QAction(MainWindow)
+        self.action_open_project.setObjectName(u"action_open_project")
+        self.action_save_project = QAction(MainWindow)
+        self.action_save_project.setObjectName(u"action_save_project")
+        self.action_shuffle_gallery = QAction(MainWindow)
+        self.action_shuffle_gallery.setObjectName(u"action_shuffle_gallery")
+        self.action_auto_frame = QAction(MainWindow)
+        self.action_auto_frame.setObjectName(u"action_auto_frame")
         self.centralwidget = QWidget(MainWindow)
         self.centralwidget.setObjectName(u"centralwidget")
         self.gridLayout = QGridLayout(self.centralwidget)
@@ -57,15 +67,13 @@ class Ui_MainWindow(object):
         self.words.setObjectName(u"words")
         self.gridLayout_2 = QGridLayout(self.words)
         self.gridLayout_2.setObjectName(u"gridLayout_2")
-        self.word_scroll = QScrollArea(self.words)
-        self.word_scroll.setObjectName(u"word_scroll")
-        self.word_scroll.setWidgetResizable(True)
-        self.word_content = QWidget()
-        self.word_content.setObjectName(u"word_content")
-        self.word_content.setGeometry(QRect(0, 0, 758, 487))
-        self.word_scroll.setWidget(self.word_content)
+        self.word_view = QTableView(self.words)
+        self.word_view.setObjectName(u"word_view")
+        self.word_view.setEditTriggers(QAbstractItemView.AllEditTriggers)
+        self.word_view.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.word_view.horizontalHeader().setStretchLastSection(True)
 
-        self.gridLayout_2.addWidget(self.word_scroll, 0, 0, 1, 1)
+        self.gridLayout_2.addWidget(self.word_view, 0, 0, 1, 1)
 
         self.tabWidget.addTab(self.words, "")
         self.symbols = QWidget()
@@ -90,7 +98,7 @@ class Ui_MainWindow(object):
         self.columns = QSpinBox(self.options)
         self.columns.setObjectName(u"columns")
         self.columns.setMinimum(1)
-        self.columns.setMaximum(10)
+        self.columns.setMaximum(20)
         self.columns.setValue(4)
 
         self.gridLayout_4.addWidget(self.columns, 1, 1, 1, 1)
@@ -103,7 +111,7 @@ class Ui_MainWindow(object):
         sizePolicy.setHeightForWidth(self.rows.sizePolicy().hasHeightForWidth())
         self.rows.setSizePolicy(sizePolicy)
         self.rows.setMinimum(1)
-        self.rows.setMaximum(10)
+        self.rows.setMaximum(20)
         self.rows.setValue(6)
 
         self.gridLayout_4.addWidget(self.rows, 0, 1, 1, 1)
@@ -131,9 +139,76 @@ class Ui_MainWindow(object):
 
         self.gridLayout_4.addWidget(self.groupBox, 2, 1, 1, 1)
 
+        self.export_dpi_label = QLabel(self.options)
+        self.export_dpi_label.setObjectName(u"export_dpi_label")
+
+        self.gridLayout_4.addWidget(self.export_dpi_label, 3, 0, 1, 1, Qt.AlignRight)
+
+        self.export_dpi = QSpinBox(self.options)
+        self.export_dpi.setObjectName(u"export_dpi")
+        self.export_dpi.setMinimum(72)
+        self.export_dpi.setMaximum(2400)
+        self.export_dpi.setSingleStep(50)
+        self.export_dpi.setValue(300)
+
+        self.gridLayout_4.addWidget(self.export_dpi, 3, 1, 1, 1)
+
+        self.lossless_images = QCheckBox(self.options)
+        self.lossless_images.setObjectName(u"lossless_images")
+
+        self.gridLayout_4.addWidget(self.lossless_images, 4, 1, 1, 1)
+
+        self.png_width_label = QLabel(self.options)
+        self.png_width_label.setObjectName(u"png_width_label")
+
+        self.gridLayout_4.addWidget(self.png_width_label, 5, 0, 1, 1, Qt.AlignRight)
+
+        self.png_width = QSpinBox(self.options)
+        self.png_width.setObjectName(u"png_width")
+        self.png_width.setMinimum(100)
+        self.png_width.setMaximum(100000)
+        self.png_width.setSingleStep(100)
+        self.png_width.setValue(1000)
+
+        self.gridLayout_4.addWidget(self.png_width, 5, 1, 1, 1)
+
+        self.png_height_label = QLabel(self.options)
+        self.png_height_label.setObjectName(u"png_height_label")
+
+        self.gridLayout_4.addWidget(self.png_height_label, 6, 0, 1, 1, Qt.AlignRight)
+
+        self.png_height = QSpinBox(self.options)
+        self.png_height.setObjectName(u"png_height")
+        self.png_height.setMinimum(100)
+        self.png_height.setMaximum(100000)
+        self.png_height.setSingleStep(100)
+        self.png_height.setValue(2000)
+
+        self.gridLayout_4.addWidget(self.png_height, 6, 1, 1, 1)
+
+        self.clue_engine_label = QLabel(self.options)
+        self.clue_engine_label.setObjectName(u"clue_engine_label")
+
+        self.gridLayout_4.addWidget(self.clue_engine_label, 7, 0, 1, 1, Qt.AlignRight)
+
+        self.clue_engine = QComboBox(self.options)
+        self.clue_engine.setObjectName(u"clue_engine")
+
+        self.gridLayout_4.addWidget(self.clue_engine, 7, 1, 1, 1)
+
+        self.line_art = QCheckBox(self.options)
+        self.line_art.setObjectName(u"line_art")
+
+        self.gridLayout_4.addWidget(self.line_art, 8, 1, 1, 1)
+
+        self.scatter_pieces = QCheckBox(self.options)
+        self.scatter_pieces.setObjectName(u"scatter_pieces")
+
+        self.gridLayout_4.addWidget(self.scatter_pieces, 9, 1, 1, 1)
+
         self.verticalSpacer = QSpacerItem(20, 40, QSizePolicy.Minimum, QSizePolicy.Expanding)
 
-        self.gridLayout_4.addItem(self.verticalSpacer, 3, 0, 1, 1)
+        self.gridLayout_4.addItem(self.verticalSpacer, 10, 0, 1, 1)
 
         self.tabWidget.addTab(self.options, "")
 
@@ -156,12 +231,19 @@ class Ui_MainWindow(object):
         self.menubar.addAction(self.menuView.menuAction())
         self.menuFile.addAction(self.action_open_art)
         self.menuFile.addAction(self.action_open_words)
+        self.menuFile.addAction(self.action_open_project)
+        self.menuFile.addAction(self.action_save_project)
+        self.menuFile.addSeparator()
         self.menuFile.addAction(self.action_save)
         self.menuFile.addAction(self.action_save_png)
+        self.menuFile.addAction(self.action_save_booklet)
         self.menuFile.addSeparator()
         self.menuFile.addAction(self.action_exit)
         self.menuView.addAction(self.action_sort)
         self.menuView.addAction(self.action_shuffle)
+        self.menuView.addAction(self.action_shuffle_gallery)
+        self.menuView.addSeparator()
+        self.menuView.addAction(self.action_auto_frame)
 
         self.retranslateUi(MainWindow)
 
@@ -201,6 +283,29 @@ class Ui_MainWindow(object):
         self.action_save_png.setText(QCoreApplication.translate("MainWindow", u"Save as &Image...", None))
 #if QT_CONFIG(shortcut)
         self.action_save_png.setShortcut(QCoreApplication.translate("MainWindow", u"Ctrl+I", None))
+#endif // QT_CONFIG(shortcut)
+        self.action_save_booklet.setText(QCoreApplication.translate("MainWindow", u"Save &Booklet as PDF...", None))
+#if QT_CONFIG(statustip)
+        self.action_save_booklet.setStatusTip(QCoreApplication.translate("MainWindow", u"Every puzzle in the booklet uses the current words, with fresh clues", None))
+#endif // QT_CONFIG(statustip)
+#if QT_CONFIG(shortcut)
+        self.action_save_booklet.setShortcut(QCoreApplication.translate("MainWindow", u"Ctrl+B", None))
+#endif // QT_CONFIG(shortcut)
+        self.action_open_project.setText(QCoreApplication.translate("MainWindow", u"Open &Puzzle...", None))
+#if QT_CONFIG(shortcut)
+        self.action_open_project.setShortcut(QCoreApplication.translate("MainWindow", u"Ctrl+Shift+O", None))
+#endif // QT_CONFIG(shortcut)
+        self.action_save_project.setText(QCoreApplication.translate("MainWindow", u"Save P&uzzle...", None))
+#if QT_CONFIG(shortcut)
+        self.action_save_project.setShortcut(QCoreApplication.translate("MainWindow", u"Ctrl+Shift+S", None))
+#endif // QT_CONFIG(shortcut)
+        self.action_shuffle_gallery.setText(QCoreApplication.translate("MainWindow", u"Shuffle &Gallery...", None))
+#if QT_CONFIG(shortcut)
+        self.action_shuffle_gallery.setShortcut(QCoreApplication.translate("MainWindow", u"Ctrl+G", None))
+#endif // QT_CONFIG(shortcut)
+        self.action_auto_frame.setText(QCoreApplication.translate("MainWindow", u"Auto Fra&me", None))
+#if QT_CONFIG(shortcut)
+        self.action_auto_frame.setShortcut(QCoreApplication.translate("MainWindow", u"Ctrl+M", None))
 #endif // QT_CONFIG(shortcut)
         self.tabWidget.setTabText(self.tabWidget.indexOf(self.art), QCoreApplication.translate("MainWindow", u"Art", None))
         self.tabWidget.setTabText(self.tabWidget.indexOf(self.words), QCoreApplication.translate("MainWindow", u"Words", None))
@@ -210,6 +315,22 @@ class Ui_MainWindow(object):
         self.groupBox.setTitle(QCoreApplication.translate("MainWindow", u"Clue Type:", None))
         self.word_clues_radio.setText(QCoreApplication.translate("MainWindow", u"Words", None))
         self.symbol_clues_radio.setText(QCoreApplication.translate("MainWindow", u"Symbols", None))
+        self.export_dpi_label.setText(QCoreApplication.translate("MainWindow", u"PDF Resolution:", None))
+        self.export_dpi.setSuffix(QCoreApplication.translate("MainWindow", u" DPI", None))
+        self.lossless_images.setText(QCoreApplication.translate("MainWindow", u"Lossless PDF images", None))
+        self.png_width_label.setText(QCoreApplication.translate("MainWindow", u"Image Width:", None))
+        self.png_width.setSuffix(QCoreApplication.translate("MainWindow", u" px", None))
+        self.png_height_label.setText(QCoreApplication.translate("MainWindow", u"Image Height:", None))
+        self.png_height.setSuffix(QCoreApplication.translate("MainWindow", u" px", None))
+        self.clue_engine_label.setText(QCoreApplication.translate("MainWindow", u"Word Clues:", None))
+#if QT_CONFIG(tooltip)
+        self.line_art.setToolTip(QCoreApplication.translate("MainWindow", u"Convert the art to black and white", None))
+#endif // QT_CONFIG(tooltip)
+        self.line_art.setText(QCoreApplication.translate("MainWindow", u"Clean up line art", None))
+#if QT_CONFIG(tooltip)
+        self.scatter_pieces.setToolTip(QCoreApplication.translate("MainWindow", u"Keep shuffled pieces away from their home and their neighbours", None))
+#endif // QT_CONFIG(tooltip)
+        self.scatter_pieces.setText(QCoreApplication.translate("MainWindow", u"Scatter shuffled pieces", None))
         self.tabWidget.setTabText(self.tabWidget.indexOf(self.options), QCoreApplication.translate("MainWindow", u"Options", None))
         self.menuFile.setTitle(QCoreApplication.translate("MainWindow", u"&File", None))
         self.menuView.setTitle(QCoreApplication.translate("MainWindow", u"&View", None))
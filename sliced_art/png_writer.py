@@ -0,0 +1,81 @@
+import struct
+import typing
+import zlib
+
+from PySide6.QtGui import QImage
+
+
+class PngWriter:
+    """ Write a PNG file one band of rows at a time.
+
+    Only the current band and the compressor's buffer are held in memory, so
+    the image can be much bigger than any surface that Qt could paint on.
+    """
+    SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+    def __init__(self,
+                 file: typing.BinaryIO,
+                 width: int,
+                 height: int,
+                 compression_level: int = 6):
+        """ Initialize the object, and write the PNG header.
+
+        :param file: binary file to write to
+        :param width: the width of the whole image
+        :param height: the height of the whole image
+        :param compression_level: zlib compression level from 0 to 9
+        """
+        self.file = file
+        self.width = width
+        self.height = height
+        self.rows_written = 0
+        self.compressor = zlib.compressobj(compression_level)
+        file.write(self.SIGNATURE)
+        bit_depth = 8
+        colour_type = 2  # RGB
+        self.write_chunk(b'IHDR', struct.pack('>IIBBBBB',
+                                              width,
+                                              height,
+                                              bit_depth,
+                                              colour_type,
+                                              0,  # deflate compression
+                                              0,  # adaptive filtering
+                                              0))  # no interlace
+
+    def write_chunk(self, chunk_type: bytes, data: bytes):
+        self.file.write(struct.pack('>I', len(data)))
+        self.file.write(chunk_type)
+        self.file.write(data)
+        crc = zlib.crc32(data, zlib.crc32(chunk_type))
+        self.file.write(struct.pack('>I', crc))
+
+    def write_band(self, band: QImage, row_count: typing.Optional[int] = None):
+        """ Write the next rows of the image.
+
+        :param band: an image as wide as the PNG file
+        :param row_count: the number of rows to write from the top of the
+            band, or None to write all of them
+        """
+        if row_count is None:
+            row_count = band.height()
+        assert band.width() == self.width, band.width()
+        assert self.rows_written + row_count <= self.height
+        band = band.convertToFormat(QImage.Format.Format_RGB888)
+        bytes_per_line = band.bytesPerLine()
+        row_size = self.width * 3
+        bits = band.constBits()
+        rows = []
+        for y in range(row_count):
+            start = y * bytes_per_line
+            rows.append(b'\x00')  # No filter
+            rows.append(bytes(bits[start:start + row_size]))
+        data = self.compressor.compress(b''.join(rows))
+        if data:
+            self.write_chunk(b'IDAT', data)
+        self.rows_written += row_count
+
+    def close(self):
+        """ Finish compressing, and write the end of the file. """
+        assert self.rows_written == self.height, self.rows_written
+        self.write_chunk(b'IDAT', self.compressor.flush())
+        self.write_chunk(b'IEND', b'')
@@ -0,0 +1,121 @@
+import os
+import typing
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+from threading import Lock
+from time import perf_counter
+
+PROFILE_VARIABLE = 'SLICED_ART_PROFILE'
+
+
+class Profiler:
+    """ Recent durations of named spans, like drawing or loading.
+
+    Spans are only recorded when the SLICED_ART_PROFILE environment variable
+    is set. Otherwise, timed() returns functions unchanged, so there's no
+    cost at all. Spans can be recorded from worker threads, like drawing
+    gallery thumbnails, while the GUI thread reports them.
+    """
+    def __init__(self, max_samples: int = 500):
+        """ Initialize the object.
+
+        :param max_samples: the number of recent durations to keep for each
+            span
+        """
+        self.max_samples = max_samples
+        self.durations: typing.Dict[str, typing.Deque[float]] = {}
+        self.counts: typing.Dict[str, int] = {}
+        self.lock = Lock()
+
+    def add(self, name: str, duration: float):
+        """ Record how long a span took, in seconds. """
+        with self.lock:
+            span_durations = self.durations.get(name)
+            if span_durations is None:
+                span_durations = deque(maxlen=self.max_samples)
+                self.durations[name] = span_durations
+                self.counts[name] = 0
+            span_durations.append(duration)
+            self.counts[name] += 1
+
+    @contextmanager
+    def span(self, name: str):
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, perf_counter() - start)
+
+    def get_percentile(self, name: str, percent: float) -> float:
+        """ Find a percentile of the recent durations for a span.
+
+        :return: the duration in seconds, using the nearest sample
+        """
+        with self.lock:
+            ordered = sorted(self.durations[name])
+        return find_percentile(ordered, percent)
+
+    def report(self) -> str:
+        """ Describe each span, slowest first, in milliseconds. """
+        # Copy under the lock, then sort without holding up worker threads.
+        with self.lock:
+            spans = [(name, list(span_durations), self.counts[name])
+                     for name, span_durations in self.durations.items()]
+        summaries = []
+        for name, span_durations, count in spans:
+            ordered = sorted(span_durations)
+            summaries.append((find_percentile(ordered, 95),
+                              find_percentile(ordered, 50),
+                              name,
+                              count))
+        summaries.sort(key=lambda summary: summary[0], reverse=True)
+        lines = []
+        for p95, p50, name, count in summaries:
+            lines.append(f'{name}: p50 {p50*1000:.1f} ms, '
+                         f'p95 {p95*1000:.1f} ms, {count} calls')
+        return '\n'.join(lines)
+
+
+def find_percentile(ordered: typing.Sequence[float], percent: float) -> float:
+    """ Pick the nearest sample to a percentile of sorted durations. """
+    index = round(percent / 100 * (len(ordered) - 1))
+    return ordered[index]
+
+
+def create_profiler() -> typing.Optional[Profiler]:
+    """ Create a profiler if the environment variable is set. """
+    if os.environ.get(PROFILE_VARIABLE, '') in ('', '0'):
+        return None
+    return Profiler()
+
+
+# Shared by all the spans, or None when profiling is off.
+profiler = create_profiler()
+
+
+def timed(name: str):
+    """ Decorate a function to record its duration as a span.
+
+    When profiling is off, the function is returned unchanged.
+    """
+    def decorate(function):
+        if profiler is None:
+            return function
+
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                profiler.add(name, perf_counter() - start)
+        return wrapper
+    return decorate
+
+
+def span(name: str) -> typing.ContextManager:
+    """ Time a block of code with a with statement, if profiling is on. """
+    if profiler is None:
+        return nullcontext()
+    return profiler.span(name)
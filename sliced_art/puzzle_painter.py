@@ -0,0 +1,241 @@
+import typing
+from math import ceil
+
+from PySide6.QtCore import QRect, QSize, Qt
+from PySide6.QtGui import QPainter, QPaintDevice, QPagedPaintDevice, \
+    QImage, QColor
+
+from sliced_art.art_shuffler import ArtShuffler
+from sliced_art.art_source import Art, VectorArt
+from sliced_art.png_writer import PngWriter
+
+
+class Puzzle:
+    def __init__(self,
+                 art: Art,
+                 rows: int,
+                 cols: int,
+                 cells: typing.Optional[
+                     typing.Sequence[typing.Tuple[int, int, str]]] = None,
+                 is_shuffled: bool = False,
+                 clues: typing.Dict[str, str] = None,
+                 row_clues: typing.Iterable[Art] = None,
+                 column_clues: typing.Iterable[Art] = None):
+        """ Initialize the object.
+
+        :param art: the selected section of the art to break up, as a pixmap
+            or vector art
+        :param rows: the number of rows to break the art into
+        :param cols: the number of columns to break the art into
+        :param cells: the order to draw the pieces in, as a list of
+            (i, j, label), or None to sort them, or shuffle them if
+            is_shuffled is True
+        :param is_shuffled: True if the pieces are drawn out of order
+        :param clues: word clues to display, defaults to just the letters
+        :param row_clues: one image to use as a clue for each row
+        :param column_clues: one image to use as a clue for each column
+        """
+        self.art = art
+        self.rows = rows
+        self.cols = cols
+        self.cells = cells
+        self.is_shuffled = is_shuffled
+        self.clues = clues
+        self.row_clues = [] if row_clues is None else list(row_clues)
+        self.column_clues = [] if column_clues is None else list(column_clues)
+
+
+class PuzzlePainter:
+    def __init__(self,
+                 writer: QPaintDevice,
+                 share_tiles: bool = False,
+                 is_lossless: bool = False,
+                 page_size: QSize = None,
+                 is_pixel_aligned: bool = False,
+                 is_optimized: bool = False):
+        """ Initialize the object.
+
+        :param writer: the device to paint on
+        :param share_tiles: True if each piece of art should be painted from a
+            shared tile, so vector formats like PDF only embed it once.
+        :param is_lossless: True if PDF images should use lossless compression
+            instead of JPEG.
+        :param page_size: the size to lay out each puzzle in, or None to fill
+            the writer
+        :param is_pixel_aligned: True if every piece should be placed on
+            whole pixels, for raster writers.
+        :param is_optimized: True if shuffles should keep pieces away from
+            their home and their original neighbours.
+        """
+        self.writer = writer
+        self.share_tiles = share_tiles
+        self.is_lossless = is_lossless
+        self.is_pixel_aligned = is_pixel_aligned
+        self.is_optimized = is_optimized
+        if page_size is None:
+            page_size = QSize(writer.width(), writer.height())
+        self.page_size = page_size
+
+        # {(rows, cols): shuffler} reused from page to page, along with the
+        # font sizes each one has fitted to its clues.
+        self.shufflers: typing.Dict[typing.Tuple[int, int], ArtShuffler] = {}
+
+    def write(self, puzzle: Puzzle):
+        """ Paint a single puzzle to fill the writer. """
+        self.write_booklet([puzzle])
+
+    def write_booklet(self, puzzles: typing.Iterable[Puzzle]) -> int:
+        """ Paint each puzzle on its own page.
+
+        Puzzles are painted as soon as they are generated, so a generator
+        that loads each puzzle's art keeps memory flat for any page count.
+
+        :return: the number of pages painted
+        """
+        painter = QPainter(self.writer)
+        painter.setRenderHint(QPainter.RenderHint.LosslessImageRendering,
+                              self.is_lossless)
+        page_count = 0
+        try:
+            for puzzle in puzzles:
+                if page_count:
+                    assert isinstance(self.writer, QPagedPaintDevice)
+                    self.writer.newPage()
+                self.paint(puzzle, painter)
+                page_count += 1
+        finally:
+            painter.end()
+        return page_count
+
+    def get_shuffler(self, puzzle: Puzzle) -> ArtShuffler:
+        key = (puzzle.rows, puzzle.cols)
+        shuffler = self.shufflers.get(key)
+        if shuffler is None:
+            shuffler = ArtShuffler(puzzle.rows, puzzle.cols, self.writer)
+            shuffler.share_tiles = self.share_tiles
+            shuffler.is_pixel_aligned = self.is_pixel_aligned
+            shuffler.is_optimized = self.is_optimized
+            self.shufflers[key] = shuffler
+        if puzzle.cells is not None:
+            shuffler.cells = list(puzzle.cells)
+            shuffler.is_shuffled = puzzle.is_shuffled
+        elif puzzle.is_shuffled:
+            shuffler.shuffle()
+        else:
+            shuffler.sort()
+        shuffler.clues = dict(puzzle.clues or {})
+        shuffler.row_clues = puzzle.row_clues
+        shuffler.column_clues = puzzle.column_clues
+        return shuffler
+
+    def paint(self, puzzle: Puzzle, painter: QPainter):
+        """ Paint the shuffled pieces above the grid. """
+        shuffler, art = self.prepare(puzzle)
+        self.paint_prepared(shuffler, art, painter)
+
+    def prepare(self, puzzle: Puzzle) -> typing.Tuple[ArtShuffler, Art]:
+        """ Set up a shuffler and art that are ready to paint a puzzle.
+
+        The art and symbol clues are resampled once to the size they get
+        printed at, so no more pixels are stored than the writer can show.
+        Vector art is left alone, and drawn at whatever size it's painted.
+        Pixel-aligned shared tiles are scaled straight from the full art down
+        to each cell size, so the art is left alone for them, too. They're
+        never enlarged, so memory stays tied to the art, not the target.
+
+        :return: (shuffler, art)
+        """
+        shuffler = self.get_shuffler(puzzle)
+        self.reset_rect(shuffler)
+        print_size = shuffler.get_print_size(puzzle.art.size())
+        if self.is_pixel_aligned and self.share_tiles:
+            art = puzzle.art
+        else:
+            art = downsample(puzzle.art, print_size)
+        clue_size = QSize(ceil(print_size.width() / shuffler.cols),
+                          ceil(print_size.height() / shuffler.rows))
+        shuffler.row_clues = [downsample(clue, clue_size)
+                              for clue in puzzle.row_clues]
+        shuffler.column_clues = [downsample(clue, clue_size)
+                                 for clue in puzzle.column_clues]
+        return shuffler, art
+
+    def reset_rect(self, shuffler: ArtShuffler):
+        shuffler.rect = QRect(0,
+                              0,
+                              self.page_size.width(),
+                              round(self.page_size.height()/2))
+
+    def paint_prepared(self,
+                       shuffler: ArtShuffler,
+                       art: Art,
+                       painter: QPainter):
+        self.reset_rect(shuffler)
+        shuffler.draw(art, painter)
+
+        shuffler.rect.moveTop(self.page_size.height()/2)
+        shuffler.draw_grid(art, painter)
+
+
+def write_png(file_name: str,
+              puzzle: Puzzle,
+              size: QSize,
+              band_height: int = 256):
+    """ Paint a puzzle into a PNG file, one horizontal band at a time.
+
+    Peak memory depends on the band size instead of the whole image size, so
+    this can write posters that are too big to paint in a single image.
+
+    :param file_name: the PNG file to write
+    :param puzzle: the puzzle to paint
+    :param size: the size of the PNG image
+    :param band_height: the number of rows to paint in each band
+    """
+    band_height = min(band_height, size.height())
+    band = QImage(size.width(), band_height, QImage.Format.Format_RGB32)
+    puzzle_painter = PuzzlePainter(band,
+                                   share_tiles=True,
+                                   page_size=size,
+                                   is_pixel_aligned=True)
+    shuffler, art = puzzle_painter.prepare(puzzle)
+    white = QColor('white')
+    with open(file_name, 'wb') as f:
+        png_writer = PngWriter(f, size.width(), size.height())
+        for top in range(0, size.height(), band_height):
+            band.fill(white)
+            painter = QPainter(band)
+            try:
+                painter.translate(0, -top)
+                puzzle_painter.paint_prepared(shuffler, art, painter)
+            finally:
+                painter.end()
+            png_writer.write_band(band, min(band_height, size.height() - top))
+        png_writer.close()
+
+
+def make_symbol_clues(
+        art: Art,
+        rows: int,
+        cols: int) -> typing.Tuple[typing.List[Art], typing.List[Art]]:
+    """ Use the left column and top row of the art as symbol clues.
+
+    :return: (row_clues, column_clues)
+    """
+    cell_width = art.width() / cols
+    cell_height = art.height() / rows
+    row_clues = [art.copy(0, i*cell_height, cell_width, cell_height)
+                 for i in range(rows)]
+    column_clues = [art.copy(j*cell_width, 0, cell_width, cell_height)
+                    for j in range(cols)]
+    return row_clues, column_clues
+
+
+def downsample(pixmap: Art, size: QSize) -> Art:
+    """ Shrink a pixmap to fit inside size, but never enlarge it. """
+    if isinstance(pixmap, VectorArt):
+        return pixmap
+    if pixmap.width() <= size.width() and pixmap.height() <= size.height():
+        return pixmap
+    return pixmap.scaled(size,
+                         Qt.AspectRatioMode.KeepAspectRatio,
+                         Qt.TransformationMode.SmoothTransformation)
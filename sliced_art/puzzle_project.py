@@ -0,0 +1,148 @@
+import json
+import typing
+from zipfile import ZipFile, ZIP_DEFLATED, ZIP_STORED
+
+from PySide6.QtCore import QBuffer, QByteArray, QIODevice, Qt
+from PySide6.QtGui import QImage
+
+
+class PuzzleProject:
+    """ Everything needed to reopen a puzzle, saved in a zip file.
+
+    The zip file holds the settings as JSON, and a small preview image that
+    can be shown before the art and word list are loaded.
+    """
+    FORMAT_VERSION = 1
+    SETTINGS_NAME = 'puzzle.json'
+    PREVIEW_NAME = 'preview.png'
+    PREVIEW_SIZE = 512
+    FILE_FILTER = 'Sliced Art puzzles (*.sliced)'
+
+    # Settings that load() passes on, so unknown keys from newer versions or
+    # hand edits are ignored, and missing ones get their defaults.
+    SETTINGS_FIELDS = ('image_path',
+                       'words_path',
+                       'selection',
+                       'rows',
+                       'cols',
+                       'clue_type',
+                       'clue_engine',
+                       'is_line_art',
+                       'words',
+                       'cells',
+                       'is_shuffled',
+                       'clues')
+
+    def __init__(self,
+                 image_path: typing.Optional[str] = None,
+                 words_path: typing.Optional[str] = None,
+                 selection: typing.Sequence[float] = (0.0, 0.0, 1.0, 1.0),
+                 rows: int = 6,
+                 cols: int = 4,
+                 clue_type: str = 'words',
+                 clue_engine: typing.Optional[str] = None,
+                 is_line_art: bool = False,
+                 words: typing.Dict[str, str] = None,
+                 cells: typing.Sequence[typing.Tuple[int, int, str]] = None,
+                 is_shuffled: bool = False,
+                 clues: typing.Optional[typing.Dict[str, str]] = None,
+                 preview: typing.Optional[QImage] = None):
+        """ Initialize the object.
+
+        :param image_path: the art to break up
+        :param words_path: the word list to check words against
+        :param selection: the selected section of the art, as fractions of
+            its size: (x, y, width, height)
+        :param rows: the number of rows to break the art into
+        :param cols: the number of columns to break the art into
+        :param clue_type: the name of the ClueType
+        :param clue_engine: the name of the clue engine, or None for the
+            default
+        :param is_line_art: True if the art is cleaned up as line art
+        :param words: {letter: word as typed}
+        :param cells: the order to draw the pieces in, as a list of
+            (i, j, label), or None to sort them
+        :param is_shuffled: True if the pieces are drawn out of order
+        :param clues: {letter: clue} that were shuffled for the words, so
+            the same clues come back
+        :param preview: a small picture of the puzzle
+        """
+        self.image_path = image_path
+        self.words_path = words_path
+        self.selection = tuple(selection)
+        self.rows = rows
+        self.cols = cols
+        self.clue_type = clue_type
+        self.clue_engine = clue_engine
+        self.is_line_art = is_line_art
+        self.words = {} if words is None else dict(words)
+        self.cells = None if cells is None else [tuple(cell)
+                                                 for cell in cells]
+        self.is_shuffled = is_shuffled
+        self.clues = None if clues is None else dict(clues)
+        self.preview = preview
+
+    def save(self, file_name: str):
+        settings = dict(version=self.FORMAT_VERSION,
+                        image_path=self.image_path,
+                        words_path=self.words_path,
+                        selection=list(self.selection),
+                        rows=self.rows,
+                        cols=self.cols,
+                        clue_type=self.clue_type,
+                        clue_engine=self.clue_engine,
+                        is_line_art=self.is_line_art,
+                        words=self.words,
+                        cells=self.cells,
+                        is_shuffled=self.is_shuffled,
+                        clues=self.clues)
+        with ZipFile(file_name, 'w', ZIP_DEFLATED) as project_zip:
+            project_zip.writestr(self.SETTINGS_NAME,
+                                 json.dumps(settings, indent=2))
+            if self.preview is not None:
+                # PNG is already compressed.
+                project_zip.writestr(self.PREVIEW_NAME,
+                                     encode_png(self.preview),
+                                     compress_type=ZIP_STORED)
+
+    @classmethod
+    def load(cls, file_name: str) -> 'PuzzleProject':
+        """ Read the settings and preview, without loading art or words. """
+        with ZipFile(file_name) as project_zip:
+            settings = json.loads(project_zip.read(cls.SETTINGS_NAME))
+            if not isinstance(settings, dict):
+                raise ValueError('Puzzle settings are not a JSON object.')
+            version = settings.get('version')
+            if version != cls.FORMAT_VERSION:
+                raise ValueError(f'Unknown puzzle file version: {version}.')
+            if cls.PREVIEW_NAME in project_zip.namelist():
+                preview = QImage.fromData(
+                    project_zip.read(cls.PREVIEW_NAME), 'PNG')
+                if preview.isNull():
+                    preview = None
+            else:
+                preview = None
+        fields = {name: settings[name]
+                  for name in cls.SETTINGS_FIELDS
+                  if name in settings}
+        return cls(preview=preview, **fields)
+
+    @classmethod
+    def make_preview(cls, image: QImage) -> QImage:
+        """ Shrink an image to preview size. """
+        if (image.width() <= cls.PREVIEW_SIZE and
+                image.height() <= cls.PREVIEW_SIZE):
+            return image
+        return image.scaled(cls.PREVIEW_SIZE,
+                            cls.PREVIEW_SIZE,
+                            Qt.AspectRatioMode.KeepAspectRatio,
+                            Qt.TransformationMode.SmoothTransformation)
+
+
+def encode_png(image: QImage) -> bytes:
+    data = QByteArray()
+    buffer = QBuffer(data)
+    buffer.open(QIODevice.OpenModeFlag.WriteOnly)
+    image.save(buffer, 'PNG')
+    buffer.close()
+    return data.data()
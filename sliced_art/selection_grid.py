@@ -1,6 +1,9 @@
-from PySide6.QtCore import Qt, QRectF
-from PySide6.QtGui import QBrush, QPainterPath, QPainter, QColor, QPen
-from PySide6.QtWidgets import QGraphicsRectItem
+import typing
+
+from PySide6.QtCore import Qt, QRectF, QTimer, QLineF
+from PySide6.QtGui import QBrush, QPainterPath, QPainter, QColor, QPen, \
+    QGuiApplication
+from PySide6.QtWidgets import QGraphicsItem, QGraphicsRectItem
 
 
 class SelectionGrid(QGraphicsRectItem):
@@ -14,6 +17,11 @@ class SelectionGrid(QGraphicsRectItem):
     HANDLE_BOTTOM = 7
     HANDLE_BOTTOM_RIGHT = 8
 
+    # Handles in rows from top to bottom, with nothing in the middle.
+    HANDLE_GRID = ((HANDLE_TOP_LEFT, HANDLE_TOP, HANDLE_TOP_RIGHT),
+                   (HANDLE_LEFT, None, HANDLE_RIGHT),
+                   (HANDLE_BOTTOM_LEFT, HANDLE_BOTTOM, HANDLE_BOTTOM_RIGHT))
+
     HANDLE_SIZE = +8.0
     HANDLE_SPACE = -4.0
 
@@ -38,24 +46,64 @@ class SelectionGrid(QGraphicsRectItem):
         self.mouse_press_pos = None
         self.mouse_press_rect = None
         self.setAcceptHoverEvents(True)
-        self.setFlag(self.ItemIsMovable, True)
-        self.setFlag(self.ItemIsSelectable, True)
+        self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsMovable, True)
+        self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsSelectable, True)
         self.row_count, self.column_count = row_count, column_count
 
-        # Callback method for when this is moved.
+        # Grid lines to paint, as long as the key of (rect, row_count,
+        # column_count) doesn't change.
+        self.grid_lines: typing.List[QLineF] = []
+        self.grid_lines_key = None
+
+        # Callback method for when this is moved. It gets called at most once
+        # per display frame while dragging, then once more after release.
         self.on_moved = lambda: None
 
+        self.is_moved = False  # since the mouse was pressed
+        self.redraw_timer = QTimer()
+        self.redraw_timer.setSingleShot(True)
+        self.redraw_timer.setInterval(get_frame_interval())
+        # noinspection PyUnresolvedReferences
+        self.redraw_timer.timeout.connect(self.on_redraw_timer)
+
         self.update_handle_positions()
 
+    @property
+    def is_dragging(self):
+        return self.mouse_press_pos is not None
+
+    def on_redraw_timer(self):
+        if self.is_dragging:
+            self.on_moved()
+
     def handle_at(self, point):
         """
         Returns the resize handle below the given point.
+
+        The handles sit at the corners and edge middles of the bounding rect,
+        so the handle row and column are calculated instead of searched.
+        When handles overlap on a small rect, the earlier one in HANDLE_GRID
+        wins.
         """
-        for k, v, in self.handles.items():
-            if v.contains(point):
-                # print(point, k)
-                return k
-        # print(point, None)
+        b = self.boundingRect()
+        s = self.HANDLE_SIZE
+        handle_rows = find_handle_spans(point.y(),
+                                        b.top(),
+                                        b.center().y(),
+                                        b.bottom(),
+                                        s)
+        if not handle_rows:
+            return None
+        handle_columns = find_handle_spans(point.x(),
+                                           b.left(),
+                                           b.center().x(),
+                                           b.right(),
+                                           s)
+        for handle_row in handle_rows:
+            for handle_column in handle_columns:
+                handle = self.HANDLE_GRID[handle_row][handle_column]
+                if handle is not None:
+                    return handle
         return None
 
     def hoverMoveEvent(self, event):
@@ -96,7 +144,9 @@ class SelectionGrid(QGraphicsRectItem):
         self.setRect(rect)
 
         self.update_handle_positions()
-        self.on_moved()
+        self.is_moved = True
+        if not self.redraw_timer.isActive():
+            self.redraw_timer.start()
 
     def check_bounds(self, rect):
         # Figure out the limits of movement. I did it by updating the scene's
@@ -182,10 +232,14 @@ class SelectionGrid(QGraphicsRectItem):
         Executed when the mouse is released from the item.
         """
         super().mouseReleaseEvent(event)
+        self.redraw_timer.stop()
         self.selected_handle = None
         self.mouse_press_pos = None
         self.mouse_press_rect = None
         self.update()
+        if self.is_moved:
+            self.is_moved = False
+            self.on_moved()
 
     def boundingRect(self):
         """
@@ -235,8 +289,7 @@ class SelectionGrid(QGraphicsRectItem):
         Paint the node in the graphic view.
         """
         painter.setPen(QPen(QColor(128, 128, 128), 1.0, Qt.SolidLine))
-        for cell_rect in self.cell_rects():
-            painter.drawRect(cell_rect)
+        painter.drawLines(self.get_grid_lines())
 
         if self.isSelected():
             painter.setRenderHint(QPainter.Antialiasing)
@@ -248,13 +301,58 @@ class SelectionGrid(QGraphicsRectItem):
                 if self.selected_handle is None or handle == self.selected_handle:
                     painter.drawEllipse(rect)
 
-    def cell_rects(self):
+    def get_grid_lines(self) -> typing.List[QLineF]:
+        """ Get the lines around and between the cells.
+
+        The lines are only rebuilt when the rect or the counts change, not
+        on every paint.
+        """
         rect = self.rect()
-        cell_width = rect.width() / self.column_count
-        cell_height = rect.height() / self.row_count
-
-        for row in range(self.row_count):
-            y = rect.top() + rect.height() * row / self.row_count
-            for column in range(self.column_count):
-                x = rect.left() + rect.width() * column / self.column_count
-                yield QRectF(x, y, cell_width, cell_height)
+        key = (rect, self.row_count, self.column_count)
+        if key == self.grid_lines_key:
+            return self.grid_lines
+        left, right = rect.left(), rect.right()
+        top, bottom = rect.top(), rect.bottom()
+        lines = []
+        for row in range(self.row_count + 1):
+            y = top + rect.height() * row / self.row_count
+            lines.append(QLineF(left, y, right, y))
+        for column in range(self.column_count + 1):
+            x = left + rect.width() * column / self.column_count
+            lines.append(QLineF(x, top, x, bottom))
+        self.grid_lines = lines
+        self.grid_lines_key = key
+        return lines
+
+
+def find_handle_spans(position: float,
+                      start: float,
+                      middle: float,
+                      end: float,
+                      size: float) -> typing.List[int]:
+    """ Find which handle spans contain a position along one axis.
+
+    :param position: the position to look for
+    :param start: where the first handle span starts
+    :param middle: where the second handle span is centred
+    :param end: where the third handle span ends
+    :param size: the size of each handle
+    :return: the indexes of the spans that contain position, from 0 to 2
+    """
+    spans = []
+    if start <= position <= start + size:
+        spans.append(0)
+    if middle - size/2 <= position <= middle + size/2:
+        spans.append(1)
+    if end - size <= position <= end:
+        spans.append(2)
+    return spans
+
+
+def get_frame_interval() -> int:
+    """ Milliseconds between display frames on the primary screen. """
+    screen = QGuiApplication.primaryScreen()
+    refresh_rate = screen.refreshRate() if screen is not None else 0
+    if refresh_rate <= 0:
+        refresh_rate = 60
+    return max(1, round(1000 / refresh_rate))
@@ -0,0 +1,184 @@
+import typing
+from random import shuffle
+
+from PySide6.QtCore import QObject, QRunnable, QSize, QThreadPool, Signal
+from PySide6.QtGui import QIcon, QImage, QPixmap
+from PySide6.QtWidgets import QDialog, QDialogButtonBox, QListView, \
+    QListWidget, QListWidgetItem, QVBoxLayout, QWidget
+
+from sliced_art.art_shuffler import ArtShuffler
+from sliced_art.shuffle_optimizer import ShuffleOptimizer
+
+Cell = typing.Tuple[int, int, str]
+
+
+def make_candidates(home_cells: typing.Iterable[Cell],
+                    rows: int,
+                    cols: int,
+                    count: int,
+                    is_optimized: bool = True
+                    ) -> typing.List[typing.List[Cell]]:
+    """ Shuffle the cells several different ways.
+
+    :param home_cells: the cells in any order, as a list of (i, j, label)
+    :param rows: the number of rows in the grid
+    :param cols: the number of columns in the grid
+    :param count: the number of shuffles to make
+    :param is_optimized: True if each shuffle should keep pieces away from
+        their home and their original neighbours, False for plain random
+        shuffles
+    :return: a list of shuffled cell lists
+    """
+    home_cells = sorted(home_cells)
+    candidates = []
+    for _ in range(count):
+        if is_optimized:
+            optimizer = ShuffleOptimizer(rows, cols)
+            cells = [home_cells[k] for k in optimizer.optimize()]
+        else:
+            cells = home_cells[:]
+            shuffle(cells)
+        candidates.append(cells)
+    return candidates
+
+
+def render_thumbnail(art: QImage,
+                     rows: int,
+                     cols: int,
+                     cells: typing.List[Cell],
+                     size: QSize) -> QImage:
+    """ Draw the pieces in a shuffled order, without clues.
+
+    Only uses QImage, so it's safe to call from a worker thread.
+    """
+    thumbnail = QImage(size, QImage.Format.Format_ARGB32_Premultiplied)
+    shuffler = ArtShuffler(rows, cols, thumbnail)
+    shuffler.cells = list(cells)
+    shuffler.is_shuffled = True
+    shuffler.draw(art, is_draft=True)
+    return thumbnail
+
+
+class ThumbnailSignals(QObject):
+    # (index, thumbnail) sent back to the GUI thread
+    finished = Signal(int, QImage)
+
+
+class ThumbnailTask(QRunnable):
+    def __init__(self,
+                 signals: ThumbnailSignals,
+                 index: int,
+                 art: QImage,
+                 rows: int,
+                 cols: int,
+                 cells: typing.List[Cell],
+                 size: QSize):
+        super().__init__()
+        self.signals = signals
+        self.index = index
+        self.art = art
+        self.rows = rows
+        self.cols = cols
+        self.cells = cells
+        self.size = size
+
+    def run(self):
+        thumbnail = render_thumbnail(self.art,
+                                     self.rows,
+                                     self.cols,
+                                     self.cells,
+                                     self.size)
+        self.signals.finished.emit(self.index, thumbnail)
+
+
+class ShuffleGallery(QDialog):
+    """ Show thumbnails of several shuffles, and let the user pick one.
+
+    The thumbnails are drawn in a thread pool, and each one appears as soon
+    as it's ready. Only the chosen shuffle gets drawn at full size, by the
+    main window.
+    """
+    THUMBNAIL_SIZE = 240  # Largest width or height in pixels
+
+    def __init__(self,
+                 art: QImage,
+                 home_cells: typing.Iterable[Cell],
+                 rows: int,
+                 cols: int,
+                 thumbnail_size: QSize,
+                 count: int = 9,
+                 parent: typing.Optional[QWidget] = None,
+                 is_optimized: bool = True):
+        """ Initialize the object.
+
+        :param art: the selected art, small is fine
+        :param home_cells: the cells to shuffle, as a list of (i, j, label)
+        :param rows: the number of rows in the grid
+        :param cols: the number of columns in the grid
+        :param thumbnail_size: the size to draw each shuffle
+        :param count: the number of shuffles to choose from
+        :param parent: the window to show the dialog over
+        :param is_optimized: True if each shuffle should keep pieces away from
+            their home and their original neighbours
+        """
+        super().__init__(parent)
+        self.setWindowTitle('Shuffle Gallery')
+        self.candidates = make_candidates(home_cells,
+                                          rows,
+                                          cols,
+                                          count,
+                                          is_optimized)
+        self.selected_cells: typing.Optional[typing.List[Cell]] = None
+
+        self.thumbnail_list = QListWidget(self)
+        self.thumbnail_list.setViewMode(QListView.ViewMode.IconMode)
+        self.thumbnail_list.setResizeMode(QListView.ResizeMode.Adjust)
+        self.thumbnail_list.setMovement(QListView.Movement.Static)
+        self.thumbnail_list.setIconSize(thumbnail_size)
+        for index in range(count):
+            QListWidgetItem(str(index + 1), self.thumbnail_list)
+        self.thumbnail_list.setCurrentRow(0)
+        # noinspection PyUnresolvedReferences
+        self.thumbnail_list.itemActivated.connect(self.accept)
+        buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok |
+                                   QDialogButtonBox.StandardButton.Cancel,
+                                   self)
+        # noinspection PyUnresolvedReferences
+        buttons.accepted.connect(self.accept)
+        # noinspection PyUnresolvedReferences
+        buttons.rejected.connect(self.reject)
+        layout = QVBoxLayout(self)
+        layout.addWidget(self.thumbnail_list)
+        layout.addWidget(buttons)
+        columns = min(count, 3)
+        self.resize((thumbnail_size.width() + 30) * columns + 30,
+                    (thumbnail_size.height() + 40) * -(-count // columns) + 60)
+
+        self.signals = ThumbnailSignals()
+        # noinspection PyUnresolvedReferences
+        self.signals.finished.connect(self.on_thumbnail_finished)
+        self.thread_pool = QThreadPool(self)
+        for index, cells in enumerate(self.candidates):
+            self.thread_pool.start(ThumbnailTask(self.signals,
+                                                 index,
+                                                 art,
+                                                 rows,
+                                                 cols,
+                                                 cells,
+                                                 thumbnail_size))
+
+    def on_thumbnail_finished(self, index: int, thumbnail: QImage):
+        item = self.thumbnail_list.item(index)
+        item.setIcon(QIcon(QPixmap.fromImage(thumbnail)))
+
+    def accept(self):
+        row = self.thumbnail_list.currentRow()
+        if row >= 0:
+            self.selected_cells = self.candidates[row]
+        super().accept()
+
+    def done(self, result: int):
+        # Don't draw thumbnails that nobody will see.
+        self.thread_pool.clear()
+        self.thread_pool.waitForDone()
+        super().done(result)
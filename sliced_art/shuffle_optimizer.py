@@ -0,0 +1,131 @@
+import typing
+from random import Random
+
+
+class ShuffleOptimizer:
+    """ Search for a shuffle that scatters the pieces well.
+
+    A plain shuffle often leaves pieces at home, or next to the pieces they
+    were next to in the art, which gives away part of the puzzle. Pieces that
+    were two steps apart, like letters A and C, shouldn't end up side by side
+    either, so nearby letters get spread across the grid. This starts
+    from a random order, then tries swapping random pairs of pieces and keeps
+    each swap that doesn't make the penalty worse. A swap only changes the
+    penalty around the two positions, so each one is scored without
+    looking at the rest of the grid.
+
+    Positions and pieces are both numbered in reading order, so the order
+    list holds the piece drawn at each position, and a piece is at home when
+    order[k] == k.
+    """
+    HOME_PENALTY = 10  # A piece in its original position
+    NEIGHBOUR_PENALTY = 4  # Two pieces still next to each other
+    CLOSE_PENALTY = 1  # Two pieces side by side that were two steps apart
+    NEAR_PENALTY = 1  # A piece right beside its original position
+
+    def __init__(self,
+                 rows: int,
+                 cols: int,
+                 random_source: typing.Optional[Random] = None):
+        """ Initialize the object.
+
+        :param rows: the number of rows in the grid
+        :param cols: the number of columns in the grid
+        :param random_source: where to get random numbers, or None for a new
+            generator
+        """
+        self.rows = rows
+        self.cols = cols
+        self.random = Random() if random_source is None else random_source
+        count = rows * cols
+        self.order = list(range(count))
+
+        # [[neighbour]] positions above, below, left, and right of each one
+        self.neighbours: typing.List[typing.List[int]] = []
+        for k in range(count):
+            i, j = divmod(k, cols)
+            self.neighbours.append(
+                [ni*cols + nj
+                 for ni, nj in ((i-1, j), (i+1, j), (i, j-1), (i, j+1))
+                 if 0 <= ni < rows and 0 <= nj < cols])
+
+    def get_distance(self, piece1: int, piece2: int) -> int:
+        """ Count the steps between two pieces or positions in the grid. """
+        i1, j1 = divmod(piece1, self.cols)
+        i2, j2 = divmod(piece2, self.cols)
+        return abs(i1 - i2) + abs(j1 - j2)
+
+    def is_near(self, piece1: int, piece2: int) -> bool:
+        """ Check if two pieces or positions are side by side in the grid. """
+        return self.get_distance(piece1, piece2) == 1
+
+    def get_piece_penalty(self, position: int) -> int:
+        """ Score the piece at a position against its home. """
+        piece = self.order[position]
+        if piece == position:
+            return self.HOME_PENALTY
+        if self.is_near(piece, position):
+            return self.NEAR_PENALTY
+        return 0
+
+    def get_edge_penalty(self, position1: int, position2: int) -> int:
+        """ Score the pieces at two neighbouring positions. """
+        distance = self.get_distance(self.order[position1],
+                                     self.order[position2])
+        if distance == 1:
+            return self.NEIGHBOUR_PENALTY
+        if distance == 2:
+            return self.CLOSE_PENALTY
+        return 0
+
+    def get_local_penalty(self, position1: int, position2: int) -> int:
+        """ Score everything that changes when two positions swap pieces. """
+        penalty = (self.get_piece_penalty(position1) +
+                   self.get_piece_penalty(position2))
+        for neighbour in self.neighbours[position1]:
+            penalty += self.get_edge_penalty(position1, neighbour)
+        for neighbour in self.neighbours[position2]:
+            if neighbour != position1:
+                penalty += self.get_edge_penalty(position2, neighbour)
+        return penalty
+
+    def get_penalty(self) -> int:
+        """ Score the whole grid, lower is better. """
+        penalty = 0
+        for position in range(len(self.order)):
+            penalty += self.get_piece_penalty(position)
+            for neighbour in self.neighbours[position]:
+                if neighbour > position:
+                    penalty += self.get_edge_penalty(position, neighbour)
+        return penalty
+
+    def optimize(self, passes: int = 20) -> typing.List[int]:
+        """ Shuffle the pieces, then improve the order with random swaps.
+
+        :param passes: the number of swaps to try, as a multiple of the
+            number of pieces
+        :return: the piece to draw at each position
+        """
+        order = self.order
+        count = len(order)
+        self.random.shuffle(order)
+        if count < 2:
+            return list(order)
+        penalty = self.get_penalty()
+        for _ in range(passes * count):
+            if penalty == 0:
+                break
+            position1 = self.random.randrange(count)
+            position2 = self.random.randrange(count - 1)
+            if position2 >= position1:
+                position2 += 1
+            old_penalty = self.get_local_penalty(position1, position2)
+            order[position1], order[position2] = (order[position2],
+                                                  order[position1])
+            new_penalty = self.get_local_penalty(position1, position2)
+            if new_penalty <= old_penalty:
+                penalty += new_penalty - old_penalty
+            else:
+                order[position1], order[position2] = (order[position2],
+                                                      order[position1])
+        return list(order)
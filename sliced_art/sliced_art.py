@@ -4,19 +4,37 @@ import typing
 from enum import Enum
 from functools import partial
 from pathlib import Path
+from zipfile import BadZipFile
 
-from PySide6.QtCore import Qt, QSize, QSettings, QCoreApplication, QRect, QTimer
+from PySide6.QtCore import QSize, QCoreApplication, QRect, QTimer, Qt
 from PySide6.QtGui import QImageReader, QPixmap, QResizeEvent, QPdfWriter, \
-    QPainter, QImage, QPaintDevice, QPageSize
+    QImage, QPaintDevice, QPageSize, QCloseEvent
 from PySide6.QtWidgets import QApplication, QMainWindow, QGraphicsScene, \
-    QFileDialog, QGraphicsPixmapItem, QLabel, QGridLayout, QLineEdit, QGraphicsSceneMouseEvent
+    QFileDialog, QGraphicsPixmapItem, QGraphicsSceneMouseEvent, QDockWidget, \
+    QPlainTextEdit, QDialog
 
 from sliced_art.art_shuffler import ArtShuffler
+from sliced_art.art_source import Art, ArtSource, RasterArtSource, \
+    SvgArtSource, VectorArt, is_vector_path
+from sliced_art.auto_frame import suggest_frame
+from sliced_art.background_loader import BackgroundLoader
+from sliced_art.batched_settings import BatchedSettings
+from sliced_art.cell_labels import make_labels
 from sliced_art.clickable_pixmap_item import ClickablePixmapItem
+from sliced_art.clue_engine import ClueEngine, clue_engines
+from sliced_art.line_art import LineArtCache, is_line_art_available
 from sliced_art.main_window import Ui_MainWindow
+from sliced_art.profiling import profiler, timed, span
+from sliced_art.puzzle_painter import Puzzle, PuzzlePainter, \
+    make_symbol_clues, write_png
+from sliced_art.puzzle_project import PuzzleProject, encode_png
 from sliced_art.selection_grid import SelectionGrid
+from sliced_art.shuffle_gallery import ShuffleGallery
+from sliced_art.word_index import WordIndex
+from sliced_art.word_model import WordModel, WordDelegate
 from sliced_art.word_shuffler import WordShuffler
-from sliced_art.word_stripper import WordStripper
+# Importing the other clue engines registers them.
+import sliced_art.word_stripper  # noqa: F401
 
 QCoreApplication.setOrganizationDomain("donkirkby.github.io")
 QCoreApplication.setOrganizationName("Don Kirkby")
@@ -24,8 +42,14 @@ QCoreApplication.setApplicationName("Sliced Art")
 
 ClueType = Enum('ClueType', 'words symbols')
 
+# Display sizes are rounded down to a multiple of this many pixels.
+SIZE_CLASS_STEP = 16
+
 
 class MainWindow(QMainWindow):
+    # Smallest copy of the art to scan for content, in pixels
+    AUTO_FRAME_SIZE = 256
+
     def __init__(self):
         super(MainWindow, self).__init__()
         self.ui = Ui_MainWindow()
@@ -40,21 +64,43 @@ class MainWindow(QMainWindow):
         self.ui.action_open_words.triggered.connect(self.open_words)
         self.ui.action_save.triggered.connect(self.save_pdf)
         self.ui.action_save_png.triggered.connect(self.save_png)
+        self.ui.action_save_booklet.triggered.connect(self.save_booklet)
+        self.ui.action_open_project.triggered.connect(self.open_project)
+        self.ui.action_save_project.triggered.connect(self.save_project)
         self.ui.action_shuffle.triggered.connect(self.shuffle)
         self.ui.action_sort.triggered.connect(self.sort)
+        self.ui.action_shuffle_gallery.triggered.connect(
+            self.show_shuffle_gallery)
+        self.ui.action_auto_frame.triggered.connect(self.auto_frame)
         self.ui.rows.valueChanged.connect(self.on_options_changed)
         self.ui.columns.valueChanged.connect(self.on_options_changed)
         self.ui.word_clues_radio.toggled.connect(self.on_options_changed)
         self.ui.symbol_clues_radio.toggled.connect(self.on_options_changed)
+        for engine_class in clue_engines.values():
+            self.ui.clue_engine.addItem(engine_class.title, engine_class.name)
+        self.ui.clue_engine.currentIndexChanged.connect(
+            self.on_options_changed)
+        self.ui.line_art.toggled.connect(self.on_options_changed)
+        self.ui.scatter_pieces.toggled.connect(self.on_scatter_pieces_toggled)
 
-        self.word_layout = QGridLayout(self.ui.word_content)
-        self.ui.word_scroll.setWidgetResizable(True)
-        self.word_labels: typing.Dict[str, QLabel] = {}
-        self.word_shuffler = WordShuffler([])
+        self.word_model = WordModel(self)
+        self.word_model.on_word_edited = self.on_word_edited
+        self.ui.word_view.setModel(self.word_model)
+        word_delegate = WordDelegate(self.ui.word_view)
+        word_delegate.get_suggestions = self.get_suggestions
+        self.ui.word_view.setItemDelegateForColumn(WordModel.WORD_COLUMN,
+                                                   word_delegate)
+        self.word_index = WordIndex()
+        self.clue_engine_name: typing.Optional[str] = None
+        self.word_shuffler: ClueEngine = self.create_clue_engine()
 
         self.clues = None
 
-        self.pixmap = self.scaled_pixmap = self.mini_pixmap = None
+        self.scaled_pixmap = self.mini_pixmap = None
+        self.art_source: typing.Optional[ArtSource] = None
+        # (image_path, is_line_art) that art_source was read with
+        self.art_key: typing.Optional[typing.Tuple[str, bool]] = None
+        self.art_pixmap_item: typing.Optional[QGraphicsPixmapItem] = None
         self.sliced_pixmap_item: typing.Optional[QGraphicsPixmapItem] = None
         self.sliced_image: typing.Optional[QImage] = None
         self.selection_grid: typing.Optional[SelectionGrid] = None
@@ -66,7 +112,7 @@ class MainWindow(QMainWindow):
         self.symbols_shuffler: typing.Optional[ArtShuffler] = None
         self.selected_row: typing.Optional[int] = None
         self.selected_column: typing.Optional[int] = None
-        self.settings = QSettings()
+        self.settings = BatchedSettings()
         self.image_path: typing.Optional[str] = self.settings.value('image_path')
         self.words_path: typing.Optional[str] = self.settings.value('words_path')
 
@@ -77,8 +123,25 @@ class MainWindow(QMainWindow):
         # noinspection PyUnresolvedReferences
         self.timer.timeout.connect(self.on_dirty)
 
+        # Wait for resizing to pause before scaling the image.
+        self.resize_timer = QTimer()
+        self.resize_timer.setInterval(100)
+        self.resize_timer.setSingleShot(True)
+        # noinspection PyUnresolvedReferences
+        self.resize_timer.timeout.connect(self.scale_image)
+        self.display_size: typing.Optional[QSize] = None
+        self.layout_key = None
+
         self.row_count = self.column_count = 0
         self.clue_type = ClueType.words
+        self.is_line_art = False
+        self.line_art_cache = LineArtCache()
+        if is_line_art_available():
+            self.ui.line_art.setChecked(
+                self.settings.value('line_art', False, bool))
+        else:
+            self.ui.line_art.setEnabled(False)
+            self.ui.line_art.setToolTip('Install NumPy to clean up line art.')
         self.ui.rows.setValue(self.settings.value('row_count', 6, int))
         self.ui.columns.setValue(self.settings.value('column_count', 4, int))
         clue_type_name = self.settings.value('clue_type', ClueType.words.name)
@@ -90,89 +153,318 @@ class MainWindow(QMainWindow):
             self.ui.word_clues_radio.setChecked(True)
         else:
             self.ui.symbol_clues_radio.setChecked(True)
+        engine_index = self.ui.clue_engine.findData(
+            self.settings.value('clue_engine', WordShuffler.name))
+        if engine_index >= 0:
+            self.ui.clue_engine.setCurrentIndex(engine_index)
         self.row_clues: typing.List[QPixmap] = []
         self.column_clues: typing.List[QPixmap] = []
+
+        # (art_cache_key, selected_fraction, pixmap_size, rows, columns) that
+        # row_clues and column_clues were cut from, so the shufflers can
+        # reuse their scaled clues while the selection stays put.
+        self.symbol_clues_key: typing.Optional[tuple] = None
+        self.ui.export_dpi.setValue(self.settings.value('export_dpi', 300, int))
+        self.ui.lossless_images.setChecked(
+            self.settings.value('lossless_images', False, bool))
+        self.ui.scatter_pieces.setChecked(
+            self.settings.value('scatter_pieces', True, bool))
+        self.ui.png_width.setValue(self.settings.value('png_width', 1000, int))
+        self.ui.png_height.setValue(self.settings.value('png_height', 2000, int))
         self.on_options_changed()
 
+        self.loader = BackgroundLoader(self)
+        # noinspection PyUnresolvedReferences
+        self.loader.loaded.connect(self.on_loaded)
+        # noinspection PyUnresolvedReferences
+        self.loader.failed.connect(self.on_load_failed)
+        self.loading_art_key: typing.Optional[typing.Tuple[str, bool]] = None
+        self.loading_words_path: typing.Optional[str] = None
+        # A project whose words get restored when its word list is loaded.
+        self.pending_project: typing.Optional[PuzzleProject] = None
+        self.start_loading()
+
+        self.timing_text: typing.Optional[QPlainTextEdit] = None
+        self.timing_timer: typing.Optional[QTimer] = None
+        if profiler is not None:
+            self.create_timing_dock()
+
+    def start_loading(self):
+        """ Load the last art and words in the background.
+
+        The window shows the last puzzle's preview straight away, and the
+        words tab and art actions are enabled as each one is ready.
+        """
+        if self.image_path is not None:
+            preview = QImage.fromData(self.settings.value('preview', b''))
+            self.art_scene.clear()
+            if preview.isNull():
+                self.art_scene.addText('Loading...')
+            else:
+                self.art_scene.addPixmap(QPixmap.fromImage(preview))
+            if not is_vector_path(self.image_path):
+                # Decode raster art on a worker thread, it's the slow part.
+                self.loading_art_key = (self.image_path,
+                                        self.ui.line_art.isChecked())
+                self.loader.start('art',
+                                  partial(self.read_art_image,
+                                          *self.loading_art_key))
+                self.set_art_actions_enabled(False)
+        if self.words_path is not None:
+            self.start_loading_words()
+
+    def start_loading_words(self):
+        """ Load the current word list in the background.
+
+        Any word list that's still loading gets ignored.
+        """
+        self.loading_words_path = self.words_path
+        self.loader.start('words', partial(read_word_index, self.words_path))
+        self.set_words_enabled(False)
+
+    def on_loaded(self, name: str, result: typing.Any):
+        if name == 'art':
+            self.set_art_actions_enabled(True)
+            self.on_art_loaded(result)
+        elif name == 'words':
+            self.set_words_enabled(True)
+            if self.loading_words_path == self.words_path:
+                self.set_word_index(result)
+            self.restore_pending_project()
+
+    def on_load_failed(self, name: str, message: str):
+        if name == 'art':
+            self.set_art_actions_enabled(True)
+            path = self.loading_art_key[0]
+            if path == self.image_path and self.art_source is None:
+                self.art_scene.clear()
+                self.art_scene.addText('Open an image file.')
+        else:
+            self.set_words_enabled(True)
+            path = self.loading_words_path
+            self.restore_pending_project()
+        self.statusBar().showMessage(f'Could not open {path}: {message}')
+
+    def on_art_loaded(self, image: typing.Optional[QImage]):
+        image_path, is_line_art = self.loading_art_key
+        if image_path != self.image_path or self.art_source is not None:
+            return  # Something else was opened while this was loading.
+        if image is None:
+            self.art_scene.clear()
+            self.art_scene.addText('Open an image file.')
+            return
+        with span('QPixmap.fromImage'):
+            self.art_source = RasterArtSource(QPixmap.fromImage(image))
+        self.art_key = self.loading_art_key
+        if self.row_count:
+            # Options were already applied, while the art was loading.
+            self.apply_art()
+
+    def is_loading_art(self) -> bool:
+        """ Check if the current image is still loading in the background.
+        """
+        return (self.loader.is_loading('art') and
+                self.loading_art_key[0] == self.image_path)
+
+    def set_art_actions_enabled(self, is_enabled: bool):
+        for action in (self.ui.action_save,
+                       self.ui.action_save_png,
+                       self.ui.action_save_project,
+                       self.ui.action_shuffle,
+                       self.ui.action_sort,
+                       self.ui.action_shuffle_gallery,
+                       self.ui.action_auto_frame):
+            action.setEnabled(is_enabled)
+
+    def set_words_enabled(self, is_enabled: bool):
+        words_index = self.ui.tabWidget.indexOf(self.ui.words)
+        self.ui.tabWidget.setTabEnabled(words_index, is_enabled)
+        self.ui.tabWidget.setTabToolTip(
+            words_index,
+            '' if is_enabled else 'Loading the word list...')
+
+    def create_timing_dock(self):
+        """ Show the profiler's report in a dock that refreshes itself. """
+        self.timing_text = QPlainTextEdit()
+        self.timing_text.setReadOnly(True)
+        dock = QDockWidget('Timing', self)
+        dock.setObjectName('timing_dock')
+        dock.setWidget(self.timing_text)
+        self.addDockWidget(Qt.DockWidgetArea.BottomDockWidgetArea, dock)
+        self.timing_timer = QTimer(self)
+        self.timing_timer.setInterval(1000)
+        # noinspection PyUnresolvedReferences
+        self.timing_timer.timeout.connect(self.on_timing_timer)
+        self.timing_timer.start()
+
+    def on_timing_timer(self):
+        report = profiler.report()
+        if report != self.timing_text.toPlainText():
+            self.timing_text.setPlainText(report)
+
+    @timed('MainWindow.on_dirty')
     def on_dirty(self):
+        # Letters can be dropped while they're dirty, like the blank when the
+        # clue engine changes.
+        self.dirty_letters.intersection_update(self.word_model.letters)
         for letter in self.dirty_letters:
-            self.word_labels[letter].setText(
-                self.word_shuffler.make_display(letter))
-            self.settings.setValue(f'word_{letter}', self.word_shuffler[letter])
+            self.word_model.set_display(letter,
+                                        self.word_shuffler.make_display(letter))
+            self.settings.setValue(f'word_{letter}',
+                                   self.word_model.words[letter])
         if self.dirty_letters:
             self.clues = self.word_shuffler.make_clues()
-            self.art_shuffler.clues = dict(self.clues)
+            if self.art_shuffler is not None:
+                self.art_shuffler.clues = dict(self.clues)
             self.dirty_letters.clear()
             self.on_selection_moved()
 
-        if self.pixmap is not None:
+        if self.selection_grid is not None:
             x, y, width, height = self.get_selected_fraction()
             self.settings.setValue('x', x)
             self.settings.setValue('y', y)
             self.settings.setValue('width', width)
             self.settings.setValue('height', height)
 
+        self.apply_options()
+
+    def apply_options(self, is_forced: bool = False):
+        """ Rebuild the puzzle if the grid size or clue options changed.
+
+        :param is_forced: True if the puzzle should be rebuilt even when the
+            options are the same, like after opening a puzzle file.
+        """
         new_rows = self.ui.rows.value()
         new_columns = self.ui.columns.value()
         if self.ui.word_clues_radio.isChecked():
             new_clue_type = ClueType.words
         else:
             new_clue_type = ClueType.symbols
-        if (new_rows,
+        new_engine_name = self.ui.clue_engine.currentData()
+        new_is_line_art = self.ui.line_art.isChecked()
+        if not is_forced and (new_rows,
             new_columns,
-            new_clue_type) == (self.row_count,
-                               self.column_count,
-                               self.clue_type):
+            new_clue_type,
+            new_engine_name,
+            new_is_line_art) == (self.row_count,
+                                 self.column_count,
+                                 self.clue_type,
+                                 self.clue_engine_name,
+                                 self.is_line_art):
             return
         self.settings.setValue('row_count', new_rows)
         self.settings.setValue('column_count', new_columns)
         self.settings.setValue('clue_type', new_clue_type.name)
+        self.settings.setValue('clue_engine', new_engine_name)
         self.row_count, self.column_count = new_rows, new_columns
         self.clue_type = new_clue_type
-
-        word_count = (self.row_count * self.column_count)
-        while self.word_layout.count():
-            layout_item = self.word_layout.takeAt(0)
-            layout_item.widget().deleteLater()
-        self.word_labels.clear()
+        if self.ui.line_art.isEnabled():
+            self.settings.setValue('line_art', new_is_line_art)
+        self.is_line_art = new_is_line_art
 
         self.row_clues.clear()
         self.column_clues.clear()
-        if self.image_path is not None:
-            self.load_image(self.image_path)
+        if not self.is_loading_art():
+            self.apply_art()
 
-        if self.words_path is not None:
-            self.load_words(self.words_path)
+        if new_engine_name != self.clue_engine_name:
+            self.clue_engine_name = new_engine_name
+            self.word_shuffler = self.create_clue_engine()
+        self.update_letters()
+
+    def apply_art(self):
+        """ Scale the art for the current options, reading it if needed. """
+        if self.image_path is None:
+            return
+        if (self.art_source is not None and
+                self.art_key == (self.image_path, self.is_line_art)):
+            self.scale_image()
+        else:
+            self.load_image(self.image_path)
 
-        letters = [chr(65+i) for i in range(word_count)]
+    def update_letters(self):
+        """ Match the word list to the grid, and pass words to the engine. """
+        word_count = (self.row_count * self.column_count)
+        letters = make_labels(word_count)
         if self.word_shuffler.needs_blank:
             letters.insert(0, '')
-        word_fields = {}
-        for i, letter in enumerate(letters):
-            word_field = QLineEdit()
-            self.word_layout.addWidget(word_field, i, 0)
-            # noinspection PyUnresolvedReferences
-            word_field.textEdited.connect(partial(self.on_word_edited, letter))
-
-            word_label = QLabel()
-            self.word_layout.addWidget(word_label, i, 1)
-            self.word_labels[letter] = word_label
-            word_fields[letter] = word_field
-        for i, letter in enumerate(letters):
-            word = self.settings.value(f'word_{letter}', '')
-            self.word_shuffler[letter] = word
+        added_letters = self.word_model.set_letters(letters)
+        saved_words = self.settings.values(
+            [f'word_{letter}' for letter in added_letters],
+            '')
+        for letter in added_letters:
+            self.word_model.set_word(letter, saved_words[f'word_{letter}'])
+        for letter in letters:
+            self.word_shuffler[letter] = self.word_model.words[letter]
             self.dirty_letters.add(letter)
-            word_fields[letter].setText(word)
+        # on_dirty() may already have run, so schedule another one.
+        self.timer.start()
 
     def on_options_changed(self, *_):
         self.timer.start()
 
+    def on_scatter_pieces_toggled(self, is_checked: bool):
+        self.settings.setValue('scatter_pieces', is_checked)
+        if self.art_shuffler is not None:
+            self.art_shuffler.is_optimized = is_checked
+
     def shuffle(self):
+        self.word_shuffler.clear_clues()
         self.clues = self.word_shuffler.make_clues()
         if self.art_shuffler is not None:
             self.art_shuffler.shuffle()
             self.on_selection_moved()
 
+    def show_shuffle_gallery(self):
+        """ Let the user pick from thumbnails of several shuffles. """
+        if self.art_shuffler is None:
+            return
+        art = self.get_selected_pixmap(is_draft=True).toImage()
+        thumbnail_size = self.sliced_image.size().scaled(
+            ShuffleGallery.THUMBNAIL_SIZE,
+            ShuffleGallery.THUMBNAIL_SIZE,
+            Qt.AspectRatioMode.KeepAspectRatio)
+        gallery = ShuffleGallery(
+            art,
+            self.art_shuffler.cells,
+            self.art_shuffler.rows,
+            self.art_shuffler.cols,
+            thumbnail_size,
+            parent=self,
+            is_optimized=self.ui.scatter_pieces.isChecked())
+        try:
+            is_accepted = gallery.exec() == QDialog.DialogCode.Accepted
+            selected_cells = gallery.selected_cells
+        finally:
+            # Free the thread pool, art, and thumbnails with the dialog.
+            gallery.deleteLater()
+        if not is_accepted or selected_cells is None:
+            return
+        self.word_shuffler.clear_clues()
+        self.clues = self.word_shuffler.make_clues()
+        self.art_shuffler.cells = list(selected_cells)
+        self.art_shuffler.is_shuffled = True
+        self.on_selection_moved()
+
+    @timed('MainWindow.auto_frame')
+    def auto_frame(self):
+        """ Move the selection to frame the art's content. """
+        if self.selection_grid is None:
+            return
+        level = self.art_source.level_for(QSize(self.AUTO_FRAME_SIZE,
+                                                self.AUTO_FRAME_SIZE))
+        x, y, width, height = suggest_frame(level.toImage(),
+                                            self.selection_grid.row_count,
+                                            self.selection_grid.column_count)
+        scaled_size = self.scaled_pixmap.size()
+        self.selection_grid.setPos(0, 0)
+        self.selection_grid.setRect(scaled_size.width()*x,
+                                    scaled_size.height()*y,
+                                    scaled_size.width()*width,
+                                    scaled_size.height()*height)
+        self.selection_grid.update_handle_positions()
+        self.on_selection_moved()
+
     def sort(self):
         if self.art_shuffler is not None:
             self.art_shuffler.sort()
@@ -192,20 +484,26 @@ class MainWindow(QMainWindow):
         if not file_name:
             return
         self.settings.setValue('words_path', file_name)
-        self.load_words(file_name)
+        self.words_path = file_name
+        # Build the suggestions and other tables off the GUI thread too.
+        self.start_loading_words()
 
-    def load_words(self, words_path):
-        with open(words_path) as f:
-            choice = 0
-            if choice == 0:
-                self.word_shuffler = WordShuffler(f)
-            else:
-                self.word_shuffler = WordStripper(f)
+    def set_word_index(self, word_index: WordIndex):
+        self.word_index = word_index
+        self.word_shuffler = self.create_clue_engine()
+        self.update_letters()
+        self.timer.start()
+
+    @timed('MainWindow.get_suggestions')
+    def get_suggestions(self, letter: str, prefix: str) -> typing.List[str]:
+        return self.word_index.suggest(letter, prefix)
+
+    def create_clue_engine(self) -> ClueEngine:
+        """ Create the chosen clue engine, sharing the loaded words. """
+        engine_class = clue_engines.get(self.clue_engine_name, WordShuffler)
+        return engine_class(self.word_index)
 
     def open_image(self):
-        formats = QImageReader.supportedImageFormats()
-        patterns = (f'*.{fmt.data().decode()}' for fmt in formats)
-        image_filter = f'Images ({" ".join(patterns)})'
         if self.image_path is None:
             image_folder = None
         else:
@@ -214,23 +512,89 @@ class MainWindow(QMainWindow):
             self,
             "Open an image file.",
             dir=image_folder,
-            filter=image_filter)
+            filter=get_image_filter())
         if not file_name:
             return
         self.settings.setValue('image_path', file_name)
         self.load_image(file_name)
 
+    @timed('MainWindow.load_image')
     def load_image(self, image_path):
-        self.pixmap = QPixmap(image_path)
-        if self.pixmap.isNull():
-            self.pixmap = None
+        self.art_source = self.read_art(image_path)
+        self.art_key = (image_path, self.is_line_art)
+        self.set_art_actions_enabled(True)
         self.image_path = image_path
         self.scale_image()
 
+    def read_art(self, image_path: str) -> typing.Optional[ArtSource]:
+        """ Read an image file, and clean it up if it's line art.
+
+        SVG files are kept as vectors, so they don't need cleaning up.
+
+        :return: the art, or None if the file can't be read
+        """
+        if is_vector_path(image_path):
+            return SvgArtSource.load(image_path)
+        image = self.read_art_image(image_path, self.is_line_art)
+        if image is None:
+            return None
+        with span('QPixmap.fromImage'):
+            return RasterArtSource(QPixmap.fromImage(image))
+
+    @timed('MainWindow.read_art_image')
+    def read_art_image(self,
+                       image_path: str,
+                       is_line_art: bool) -> typing.Optional[QImage]:
+        """ Read a raster image file, and clean it up if it's line art.
+
+        Only uses QImage, so it's safe to call from a worker thread. So is
+        the profiler, which is why this is timed.
+
+        :return: the art, or None if the file can't be read
+        """
+        if is_line_art:
+            return self.line_art_cache.get(image_path)
+        image = QImage(image_path)
+        if image.isNull():
+            return None
+        return image
+
+    @timed('MainWindow.scale_image')
     def scale_image(self):
-        if self.pixmap is None:
+        """ Fit the art and previews to the view.
+
+        Scene items and image buffers are only rebuilt when the image or grid
+        size changes. Otherwise, they're resized if the view has moved to a
+        different size class, and left alone if it hasn't.
+        """
+        if self.art_source is None or self.row_count == 0:
+            return  # No art, or the options haven't been applied yet.
+
+        view_size = self.ui.art_view.maximumViewportSize()
+        if view_size.width() == 0:
             return
+        display_size = QSize(view_size.width() * 0.99 / 2,
+                             view_size.height() * 0.99)
+        # Snap to a size class, so small resizes don't need new buffers.
+        display_size = QSize(
+            max(SIZE_CLASS_STEP,
+                display_size.width() // SIZE_CLASS_STEP * SIZE_CLASS_STEP),
+            max(SIZE_CLASS_STEP,
+                display_size.height() // SIZE_CLASS_STEP * SIZE_CLASS_STEP))
+        layout_key = (self.art_source.cache_key,
+                      self.row_count,
+                      self.column_count)
+        if layout_key != self.layout_key or self.selection_grid is None:
+            self.build_scenes(view_size, display_size)
+            self.layout_key = layout_key
+        elif display_size != self.display_size:
+            self.resize_scenes(view_size, display_size)
+        else:
+            return
+        self.display_size = display_size
+        self.on_selection_moved()
 
+    def build_scenes(self, view_size: QSize, display_size: QSize):
         if self.selection_grid is None:
             x = self.settings.value('x', 0.0, float)
             y = self.settings.value('y', 0.0, float)
@@ -240,16 +604,9 @@ class MainWindow(QMainWindow):
             x, y, width, height = self.get_selected_fraction()
         self.art_scene.clear()
         self.cells.clear()
-        view_size = self.ui.art_view.maximumViewportSize()
-        if view_size.width() == 0:
-            return
         self.art_scene.setSceneRect(0, 0, view_size.width(), view_size.height())
-        display_size = QSize(view_size.width() * 0.99 / 2,
-                             view_size.height() * 0.99)
-        self.scaled_pixmap = self.pixmap.scaled(
-            display_size,
-            aspectMode=Qt.AspectRatioMode.KeepAspectRatio)
-        self.art_scene.addPixmap(self.scaled_pixmap)
+        self.scaled_pixmap = self.art_source.scaled(display_size)
+        self.art_pixmap_item = self.art_scene.addPixmap(self.scaled_pixmap)
         scaled_size = self.scaled_pixmap.size()
         self.selection_grid = SelectionGrid(scaled_size.width()*x,
                                             scaled_size.height()*y,
@@ -272,6 +629,8 @@ class MainWindow(QMainWindow):
                                         clues=self.clues,
                                         row_clues=self.row_clues,
                                         column_clues=self.column_clues)
+        self.art_shuffler.is_pixel_aligned = True
+        self.art_shuffler.is_optimized = self.ui.scatter_pieces.isChecked()
         self.sliced_pixmap_item = self.art_scene.addPixmap(
             QPixmap.fromImage(self.sliced_image))
         self.sliced_pixmap_item.setPos(display_size.width(), 0)
@@ -296,6 +655,7 @@ class MainWindow(QMainWindow):
                                                   display_size.height()),
                                             row_clues=self.row_clues,
                                             column_clues=self.column_clues)
+        self.symbols_shuffler.is_pixel_aligned = True
         self.symbols_shuffler.selected_row = selected_row
         self.symbols_shuffler.selected_column = selected_column
         self.symbols_pixmap_item = ClickablePixmapItem(
@@ -305,7 +665,33 @@ class MainWindow(QMainWindow):
 
         self.symbols_pixmap_item.setPos(display_size.width(), 0)
 
-        self.on_selection_moved()
+    def resize_scenes(self, view_size: QSize, display_size: QSize):
+        """ Resize the existing scene items for a new display size. """
+        x, y, width, height = self.get_selected_fraction()
+        self.art_scene.setSceneRect(0, 0, view_size.width(), view_size.height())
+        self.scaled_pixmap = self.art_source.scaled(display_size)
+        self.art_pixmap_item.setPixmap(self.scaled_pixmap)
+        scaled_size = self.scaled_pixmap.size()
+        self.selection_grid.setPos(0, 0)
+        self.selection_grid.setRect(scaled_size.width()*x,
+                                    scaled_size.height()*y,
+                                    scaled_size.width()*width,
+                                    scaled_size.height()*height)
+        self.selection_grid.update_handle_positions()
+        display_rect = QRect(0, 0, display_size.width(), display_size.height())
+
+        self.sliced_image = QImage(display_size,
+                                   QImage.Format.Format_ARGB32_Premultiplied)
+        self.art_shuffler.target = self.sliced_image
+        self.art_shuffler.rect = display_rect
+        self.sliced_pixmap_item.setPos(display_size.width(), 0)
+
+        self.symbols_source_pixmap_item.setPixmap(self.scaled_pixmap)
+        self.symbols_image = QImage(display_size,
+                                    QImage.Format.Format_ARGB32_Premultiplied)
+        self.symbols_shuffler.target = self.symbols_image
+        self.symbols_shuffler.rect = QRect(display_rect)
+        self.symbols_pixmap_item.setPos(display_size.width(), 0)
 
     def on_symbols_clicked(self, event: QGraphicsSceneMouseEvent):
         self.symbols_scene.clearSelection()
@@ -327,45 +713,85 @@ class MainWindow(QMainWindow):
         height = selection_rect.height() / size.height()
         return x, y, width, height
 
+    @timed('MainWindow.on_selection_moved')
     def on_selection_moved(self):
+        if self.selection_grid is None:
+            return
+        if self.selection_grid.is_dragging:
+            # Cheap preview from the screen-sized pixmap, symbols wait.
+            draft_pixmap = self.get_selected_pixmap(is_draft=True)
+            self.art_shuffler.draw(draft_pixmap, is_draft=True)
+            with span('QPixmap.fromImage'):
+                self.sliced_pixmap_item.setPixmap(
+                    QPixmap.fromImage(self.sliced_image))
+            return
         selected_pixmap = self.get_selected_pixmap()
         self.art_shuffler.draw(selected_pixmap)
-        self.sliced_pixmap_item.setPixmap(QPixmap.fromImage(self.sliced_image))
+        with span('QPixmap.fromImage'):
+            self.sliced_pixmap_item.setPixmap(
+                QPixmap.fromImage(self.sliced_image))
 
-        selected_pixmap = self.get_selected_pixmap()
-        cell_width = (selected_pixmap.width() /
-                      self.selection_grid.column_count)
-        cell_height = (selected_pixmap.height() /
-                       self.selection_grid.row_count)
-        self.row_clues.clear()
-        self.column_clues.clear()
-        for i in range(self.selection_grid.row_count):
-            clue_image = selected_pixmap.copy(0, i*cell_height,
-                                              cell_width, cell_height)
-            self.row_clues.append(clue_image)
-        for j in range(self.selection_grid.column_count):
-            clue_image = selected_pixmap.copy(j*cell_width, 0,
-                                              cell_width, cell_height)
-            self.column_clues.append(clue_image)
+        symbol_clues_key = (self.art_source.cache_key,
+                            self.get_selected_fraction(),
+                            selected_pixmap.size().toTuple(),
+                            self.selection_grid.row_count,
+                            self.selection_grid.column_count)
+        if symbol_clues_key != self.symbol_clues_key or not self.row_clues:
+            # Same pixmaps as last time, unless the selection changed.
+            row_clues, column_clues = make_symbol_clues(
+                selected_pixmap,
+                self.selection_grid.row_count,
+                self.selection_grid.column_count)
+            self.row_clues[:] = row_clues
+            self.column_clues[:] = column_clues
+            self.symbol_clues_key = symbol_clues_key
         self.symbols_shuffler.row_clues = self.row_clues
         self.symbols_shuffler.column_clues = self.column_clues
 
         self.symbols_shuffler.draw_grid(selected_pixmap)
-        self.symbols_pixmap_item.setPixmap(QPixmap.fromImage(self.symbols_image))
+        with span('QPixmap.fromImage'):
+            self.symbols_pixmap_item.setPixmap(
+                QPixmap.fromImage(self.symbols_image))
         self.timer.start()
 
-    def get_selected_pixmap(self) -> QPixmap:
+    @timed('MainWindow.get_selected_pixmap')
+    def get_selected_pixmap(self, is_draft: bool = False) -> QPixmap:
+        """ Copy the selected section of the art.
+
+        :param is_draft: True if the copy can come from the screen-sized
+            pixmap instead of the original.
+        """
+        if not is_draft:
+            selected_art = self.get_selected_art()
+            if isinstance(selected_art, VectorArt):
+                # Render at the size it's shown, and no bigger.
+                return selected_art.scaled(
+                    self.art_shuffler.get_print_size(selected_art.size()))
+            return selected_art
         x, y, width, height = self.get_selected_fraction()
-        original_size = self.pixmap.size()
-        selected_pixmap = self.pixmap.copy(x * original_size.width(),
-                                           y * original_size.height(),
-                                           width * original_size.width(),
-                                           height * original_size.height())
-        return selected_pixmap
+        original_size = self.scaled_pixmap.size()
+        return self.scaled_pixmap.copy(x * original_size.width(),
+                                       y * original_size.height(),
+                                       width * original_size.width(),
+                                       height * original_size.height())
+
+    def get_selected_art(self) -> Art:
+        """ Select a section of the original art, as vectors if it has them.
+        """
+        return self.art_source.crop(*self.get_selected_fraction())
+
+    def closeEvent(self, event: QCloseEvent):
+        if self.art_source is not None and self.sliced_image is not None:
+            # Shown at the next startup, while the art loads.
+            self.settings.setValue(
+                'preview',
+                encode_png(PuzzleProject.make_preview(self.sliced_image)))
+        self.settings.flush()
+        super().closeEvent(event)
 
     def resizeEvent(self, event: QResizeEvent):
         super().resizeEvent(event)
-        self.scale_image()
+        self.resize_timer.start()
 
     def save_pdf(self):
         pdf_folder = self.settings.value('pdf_folder')
@@ -377,11 +803,191 @@ class MainWindow(QMainWindow):
         if not file_name:
             return
         self.settings.setValue('pdf_folder', os.path.dirname(file_name))
+        writer = self.create_pdf_writer(file_name)
+        self.paint_puzzle(writer,
+                          share_tiles=True,
+                          is_lossless=self.ui.lossless_images.isChecked())
+
+    def open_project(self):
+        project_folder = self.settings.value('project_folder')
+        file_name, _ = QFileDialog.getOpenFileName(
+            self,
+            "Open a puzzle file.",
+            dir=project_folder,
+            filter=PuzzleProject.FILE_FILTER)
+        if not file_name:
+            return
+        self.settings.setValue('project_folder', os.path.dirname(file_name))
+        try:
+            project = PuzzleProject.load(file_name)
+        except (OSError, ValueError, KeyError, BadZipFile) as ex:
+            self.statusBar().showMessage(f'Could not open {file_name}: {ex}')
+            return
+        self.show_preview(project.preview)
+
+        # Let the preview paint before loading the art and words.
+        QTimer.singleShot(0, partial(self.load_project, project))
+
+    def show_preview(self, preview: typing.Optional[QImage]):
+        """ Replace the art with a puzzle's preview, until it's loaded. """
+        self.timer.stop()
+        self.resize_timer.stop()
+        self.art_scene.clear()
+        self.art_source = self.art_key = None
+        self.art_pixmap_item = self.sliced_pixmap_item = None
+        self.selection_grid = None
+        self.layout_key = None
+        if preview is None:
+            self.art_scene.addText('Loading...')
+        else:
+            self.art_scene.addPixmap(QPixmap.fromImage(preview))
+
+    @timed('MainWindow.load_project')
+    def load_project(self, project: PuzzleProject):
+        """ Load the art and words for a puzzle, and restore its state.
+
+        The word list is only read if it's a different file from the one
+        that's already loaded. It's read in the background, and the words
+        and clues are restored once it's ready.
+        """
+        self.pending_project = None
+        if project.words_path != self.words_path:
+            self.words_path = project.words_path
+            self.settings.setValue('words_path', project.words_path)
+            if project.words_path is None:
+                self.loader.cancel('words')
+                self.set_words_enabled(True)
+                self.word_index = WordIndex()
+            else:
+                self.start_loading_words()
+            self.clue_engine_name = None  # New engine for the new words.
+        self.image_path = project.image_path
+        self.settings.setValue('image_path', project.image_path)
+        for key, value in zip(('x', 'y', 'width', 'height'),
+                              project.selection):
+            self.settings.setValue(key, value)
+        self.ui.rows.setValue(project.rows)
+        self.ui.columns.setValue(project.cols)
+        if project.clue_type == ClueType.symbols.name:
+            self.ui.symbol_clues_radio.setChecked(True)
+        else:
+            self.ui.word_clues_radio.setChecked(True)
+        engine_index = self.ui.clue_engine.findData(project.clue_engine)
+        if engine_index >= 0:
+            self.ui.clue_engine.setCurrentIndex(engine_index)
+        if self.ui.line_art.isEnabled():
+            self.ui.line_art.setChecked(project.is_line_art)
+        self.clues = None
+        self.apply_options(is_forced=True)
+
+        if self.loader.is_loading('words'):
+            # A word list loading now would replace the restored clues.
+            self.pending_project = project
+        else:
+            self.restore_words(project)
+
+    def restore_pending_project(self):
+        if self.pending_project is not None:
+            project, self.pending_project = self.pending_project, None
+            self.restore_words(project)
+
+    def restore_words(self, project: PuzzleProject):
+        """ Restore a puzzle's words, clues, and piece order. """
+        for letter in self.word_model.letters:
+            word = project.words.get(letter, '')
+            self.word_model.set_word(letter, word)
+            self.word_shuffler[letter] = word
+            self.dirty_letters.add(letter)
+        if project.clues is not None:
+            self.word_shuffler.restore_clues(project.clues)
+        self.check_clues()
+        if self.art_shuffler is not None:
+            if self.clues is not None:
+                self.art_shuffler.clues = dict(self.clues)
+            if project.cells is not None and len(project.cells) == len(
+                    self.art_shuffler.cells):
+                self.art_shuffler.cells = list(project.cells)
+                self.art_shuffler.is_shuffled = project.is_shuffled
+            self.on_selection_moved()
+        self.timer.start()
+
+    def save_project(self):
+        if self.art_shuffler is None or self.selection_grid is None:
+            self.statusBar().showMessage('Open an image before saving.')
+            return
+        project_folder = self.settings.value('project_folder')
+        file_name, _ = QFileDialog.getSaveFileName(
+            self,
+            "Save a puzzle file.",
+            dir=project_folder,
+            filter=PuzzleProject.FILE_FILTER)
+        if not file_name:
+            return
+        self.settings.setValue('project_folder', os.path.dirname(file_name))
+        self.create_project().save(file_name)
+
+    def create_project(self) -> PuzzleProject:
+        """ Collect the current puzzle's state, with a preview. """
+        self.check_clues()
+        return PuzzleProject(
+            image_path=self.image_path,
+            words_path=self.words_path,
+            selection=self.get_selected_fraction(),
+            rows=self.row_count,
+            cols=self.column_count,
+            clue_type=self.clue_type.name,
+            clue_engine=self.clue_engine_name,
+            is_line_art=self.is_line_art,
+            words=self.word_model.words,
+            cells=self.art_shuffler.cells,
+            is_shuffled=self.art_shuffler.is_shuffled,
+            clues=self.clues,
+            preview=PuzzleProject.make_preview(self.sliced_image))
+
+    def save_booklet(self):
+        if self.image_path is None:
+            image_folder = None
+        else:
+            image_folder = str(Path(self.image_path).parent)
+        image_names, _ = QFileDialog.getOpenFileNames(
+            self,
+            "Choose images for the booklet. They all use the current words.",
+            dir=image_folder,
+            filter=get_image_filter())
+        if not image_names:
+            return
+        pdf_folder = self.settings.value('pdf_folder')
+        file_name, _ = QFileDialog.getSaveFileName(
+            self,
+            "Save a PDF booklet.",
+            dir=pdf_folder,
+            filter='Documents (*.pdf)')
+        if not file_name:
+            return
+        self.settings.setValue('pdf_folder', os.path.dirname(file_name))
+        writer = self.create_pdf_writer(file_name)
+        writer.setTitle('Sliced Art Puzzles')
+        puzzle_painter = PuzzlePainter(
+            writer,
+            share_tiles=True,
+            is_lossless=self.ui.lossless_images.isChecked(),
+            is_optimized=self.ui.scatter_pieces.isChecked())
+        page_count = puzzle_painter.write_booklet(
+            self.generate_puzzles(image_names))
+        self.statusBar().showMessage(
+            f'Saved {page_count} puzzles, all using the current words.')
+
+    def create_pdf_writer(self, file_name: str) -> QPdfWriter:
+        dpi = self.ui.export_dpi.value()
+        self.settings.setValue('export_dpi', dpi)
+        self.settings.setValue('lossless_images',
+                               self.ui.lossless_images.isChecked())
         writer = QPdfWriter(file_name)
+        writer.setResolution(dpi)
         writer.setPageSize(QPageSize(QPageSize.Letter))
         writer.setTitle('Sliced Art Puzzle')
         writer.setCreator('Don Kirkby')
-        self.paint_puzzle(writer)
+        return writer
 
     def save_png(self):
         pdf_folder = self.settings.value('pdf_folder')
@@ -392,33 +998,76 @@ class MainWindow(QMainWindow):
             filter='Images (*.png)')
         if not file_name:
             return
-        writer = QPixmap(1000, 2000)
-        self.paint_puzzle(writer)
-        writer.save(file_name)
         self.settings.setValue('pdf_folder', os.path.dirname(file_name))
+        size = QSize(self.ui.png_width.value(), self.ui.png_height.value())
+        self.settings.setValue('png_width', size.width())
+        self.settings.setValue('png_height', size.height())
+        write_png(file_name, self.create_puzzle(), size)
+
+    def paint_puzzle(self,
+                     writer: QPaintDevice,
+                     share_tiles: bool = False,
+                     is_lossless: bool = False):
+        """ Paint the shuffled pieces above the grid to fill the writer.
+
+        :param writer: the device to paint on
+        :param share_tiles: True if each piece of art should be painted from a
+            shared tile, so vector formats like PDF only embed it once.
+        :param is_lossless: True if PDF images should use lossless compression
+            instead of JPEG.
+        """
+        puzzle_painter = PuzzlePainter(writer, share_tiles, is_lossless)
+        puzzle_painter.write(self.create_puzzle())
 
-    def paint_puzzle(self, writer: QPaintDevice):
+    def create_puzzle(self) -> Puzzle:
+        """ Create a puzzle from the current selection, clues, and order. """
         self.check_clues()
-        painter = QPainter(writer)
-        try:
-            print_shuffler = ArtShuffler(self.art_shuffler.rows,
-                                         self.art_shuffler.cols,
-                                         writer,
-                                         QRect(0, 0,
-                                               writer.width(),
-                                               round(writer.height()/2)),
-                                         clues=self.clues,
-                                         row_clues=self.row_clues,
-                                         column_clues=self.column_clues)
-            print_shuffler.cells = self.art_shuffler.cells[:]
-            print_shuffler.is_shuffled = self.art_shuffler.is_shuffled
-            selected_pixmap = self.get_selected_pixmap()
-            print_shuffler.draw(selected_pixmap, painter)
-
-            print_shuffler.rect.moveTop(writer.height()/2)
-            print_shuffler.draw_grid(selected_pixmap, painter)
-        finally:
-            painter.end()
+        art = self.get_selected_art()
+        row_clues = self.row_clues
+        column_clues = self.column_clues
+        if row_clues and isinstance(art, VectorArt):
+            # Cut the clues from the drawing too, so they print as vectors.
+            row_clues, column_clues = make_symbol_clues(art,
+                                                        self.art_shuffler.rows,
+                                                        self.art_shuffler.cols)
+        return Puzzle(art,
+                      self.art_shuffler.rows,
+                      self.art_shuffler.cols,
+                      cells=self.art_shuffler.cells,
+                      is_shuffled=self.art_shuffler.is_shuffled,
+                      clues=self.clues,
+                      row_clues=row_clues,
+                      column_clues=column_clues)
+
+    def generate_puzzles(
+            self,
+            image_paths: typing.Iterable[str]) -> typing.Iterator[Puzzle]:
+        """ Generate a shuffled puzzle for each image, with current options.
+
+        Every puzzle uses the window's word list, with the clues shuffled
+        fresh for each one, so the booklet shares one set of words. Each
+        image is only loaded when its puzzle is requested.
+        """
+        rows = self.ui.rows.value()
+        columns = self.ui.columns.value()
+        for image_path in image_paths:
+            art_source = self.read_art(image_path)
+            if art_source is None:
+                continue
+            art = art_source.crop(0, 0, 1, 1)
+            if self.clue_type == ClueType.words:
+                clues = self.word_shuffler.make_clues(is_fresh=True)
+                row_clues = column_clues = None
+            else:
+                clues = None
+                row_clues, column_clues = make_symbol_clues(art, rows, columns)
+            yield Puzzle(art,
+                         rows,
+                         columns,
+                         is_shuffled=True,
+                         clues=clues,
+                         row_clues=row_clues,
+                         column_clues=column_clues)
 
     def check_clues(self):
         if self.clue_type == ClueType.words:
@@ -430,6 +1079,20 @@ class MainWindow(QMainWindow):
             self.clues = None
 
 
+@timed('MainWindow.load_words')
+def read_word_index(words_path: str) -> WordIndex:
+    """ Load a word list with its tables built, on a worker thread. """
+    word_index = WordIndex.load(words_path)
+    word_index.build_tables()
+    return word_index
+
+
+def get_image_filter() -> str:
+    formats = QImageReader.supportedImageFormats()
+    patterns = (f'*.{fmt.data().decode()}' for fmt in formats)
+    return f'Images ({" ".join(patterns)})'
+
+
 def main():
     app = QApplication(sys.argv)
     window = MainWindow()
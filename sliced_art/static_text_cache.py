@@ -0,0 +1,81 @@
+import typing
+from threading import Lock
+
+from PySide6.QtCore import QPointF, Qt
+from PySide6.QtGui import QFont, QFontMetricsF, QPainter, QStaticText, \
+    QTextOption, QTransform
+
+
+class StaticTextCache:
+    """ Clue and label text, laid out once and reused for every paint.
+
+    Shaping text into glyphs is most of the cost of drawing it, and the same
+    clues get painted over and over while the preview updates. Each entry is
+    keyed by text, font and width, so the preview and the PDF export can share
+    one cache: different sizes just add entries.
+    """
+    def __init__(self, max_count: int = 2000):
+        """ Initialize the object.
+
+        :param max_count: the number of laid out texts to keep
+        """
+        self.max_count = max_count
+
+        # {(text, font_key, width): static_text}, oldest first
+        self.texts: typing.Dict[tuple, QStaticText] = {}
+        self.lock = Lock()
+
+    def get(self, text: str, font: QFont, width: float) -> QStaticText:
+        """ Lay out text centred across a width, or reuse the last layout.
+
+        Lines never wrap, just like QPainter.drawText without word wrap.
+        """
+        key = (text, font.key(), width)
+        with self.lock:
+            static_text = self.texts.pop(key, None)
+        if static_text is None:
+            # A line separator breaks lines in plain static text.
+            static_text = QStaticText(text.replace('\n', '\u2028'))
+            static_text.setTextFormat(Qt.TextFormat.PlainText)
+            option = QTextOption(Qt.AlignmentFlag.AlignHCenter)
+            option.setWrapMode(QTextOption.WrapMode.NoWrap)
+            static_text.setTextOption(option)
+            static_text.setTextWidth(width)
+            static_text.prepare(QTransform(), font)
+        with self.lock:
+            self.texts[key] = static_text  # Move to the end as the newest.
+            while len(self.texts) > self.max_count:
+                del self.texts[next(iter(self.texts))]
+        return static_text
+
+    def draw(self,
+             painter: QPainter,
+             x: int,
+             y: int,
+             width: int,
+             text: str,
+             height: typing.Optional[int] = None):
+        """ Draw text with the painter's font, centred across a width.
+
+        Matches QPainter.drawText with AlignHCenter, or with AlignCenter when
+        height is given for a single line of text.
+
+        :param painter: the painter to draw with
+        :param x: the left edge
+        :param y: the top edge
+        :param width: the width to centre the text across
+        :param text: the text to draw, with a line break between lines
+        :param height: the height to centre a single line in, or None to
+            draw from the top edge
+        """
+        font = painter.font()
+        static_text = self.get(text, font, width)
+        if height is None:
+            top = y
+        else:
+            top = y + (height - QFontMetricsF(font).height()) / 2
+        painter.drawStaticText(QPointF(x, top), static_text)
+
+
+# Every shuffler uses this by default, so the preview and export share it.
+shared_text_cache = StaticTextCache()
@@ -0,0 +1,386 @@
+import ctypes
+import typing
+from math import sqrt
+
+import shiboken6
+from PySide6.QtCore import QPointF, QRectF, Qt
+from PySide6.QtGui import QBrush, QImage, QPainter, QPainterPath, \
+    QPaintDevice, QPaintEngine, QPaintEngineState, QPen, QPixmap, \
+    QPolygonF, QTransform
+from PySide6.QtSvg import QSvgRenderer
+
+DirtyFlag = QPaintEngine.DirtyFlag
+PolygonDrawMode = QPaintEngine.PolygonDrawMode
+
+
+class PaintState:
+    """ The painter settings that a recorded shape was drawn with. """
+    def __init__(self,
+                 transform: QTransform = None,
+                 pen: QPen = None,
+                 brush: QBrush = None,
+                 brush_origin: QPointF = None,
+                 opacity: float = 1.0,
+                 hints: QPainter.RenderHint = QPainter.RenderHint(0),
+                 composition_mode: QPainter.CompositionMode =
+                 QPainter.CompositionMode.CompositionMode_SourceOver,
+                 clip: typing.Optional[QPainterPath] = None):
+        """ Initialize the object.
+
+        :param transform: maps the shape into the drawing's coordinates
+        :param pen: outlines the shape
+        :param brush: fills the shape
+        :param brush_origin: where brush patterns start
+        :param opacity: from 0 for invisible to 1 for opaque
+        :param hints: render hints, like antialiasing
+        :param composition_mode: how the shape combines with what's under it
+        :param clip: the clip path in the drawing's coordinates, or None
+        """
+        self.transform = QTransform() if transform is None else transform
+        self.pen = QPen(Qt.PenStyle.NoPen) if pen is None else pen
+        self.brush = QBrush() if brush is None else brush
+        self.brush_origin = QPointF() if brush_origin is None else brush_origin
+        self.opacity = opacity
+        self.hints = hints
+        self.composition_mode = composition_mode
+        self.clip = clip
+
+    def copy(self) -> 'PaintState':
+        return PaintState(self.transform,
+                          self.pen,
+                          self.brush,
+                          self.brush_origin,
+                          self.opacity,
+                          self.hints,
+                          self.composition_mode,
+                          self.clip)
+
+    def apply(self, painter: QPainter, base_transform: QTransform):
+        """ Set up a painter to draw a shape with this state.
+
+        :param painter: the painter to set up
+        :param base_transform: maps the drawing's coordinates onto the
+            painter's device
+        """
+        if self.clip is not None:
+            painter.setWorldTransform(base_transform)
+            painter.setClipPath(self.clip, Qt.ClipOperation.IntersectClip)
+        painter.setWorldTransform(self.transform * base_transform)
+        painter.setPen(self.pen)
+        painter.setBrush(self.brush)
+        painter.setBrushOrigin(self.brush_origin)
+        painter.setOpacity(painter.opacity() * self.opacity)
+        painter.setRenderHints(self.hints)
+        painter.setCompositionMode(self.composition_mode)
+
+
+class Shape:
+    """ One drawing call, with the state it was drawn in. """
+    def __init__(self,
+                 state: PaintState,
+                 bounds: QRectF,
+                 draw: typing.Callable[[QPainter], None]):
+        """ Initialize the object.
+
+        :param state: the painter settings for the call
+        :param bounds: the area the call can touch, in the drawing's
+            coordinates
+        :param draw: makes the call on a painter that's been set up
+        """
+        self.state = state
+        self.bounds = bounds
+        self.draw = draw
+
+
+class ShapeRecorder(QPaintEngine):
+    """ A paint engine that records drawing calls instead of painting. """
+    def __init__(self):
+        super().__init__(QPaintEngine.PaintEngineFeature.AllFeatures)
+        self.shapes: typing.List[Shape] = []
+        self.paint_state = PaintState()
+
+        # Widest cosmetic pen, in device pixels when it's replayed.
+        self.cosmetic_width = 0.0
+
+    def begin(self, device: QPaintDevice) -> bool:
+        return True
+
+    def end(self) -> bool:
+        return True
+
+    def type(self) -> QPaintEngine.Type:
+        return QPaintEngine.Type.User
+
+    def updateState(self, engine_state: QPaintEngineState):
+        flags = engine_state.state()
+        state = self.paint_state.copy()
+        if flags & DirtyFlag.DirtyTransform:
+            state.transform = engine_state.transform()
+        if flags & DirtyFlag.DirtyPen:
+            state.pen = engine_state.pen()
+        if flags & DirtyFlag.DirtyBrush:
+            state.brush = engine_state.brush()
+        if flags & DirtyFlag.DirtyBrushOrigin:
+            state.brush_origin = engine_state.brushOrigin()
+        if flags & DirtyFlag.DirtyOpacity:
+            state.opacity = engine_state.opacity()
+        if flags & DirtyFlag.DirtyHints:
+            state.hints = engine_state.renderHints()
+        if flags & DirtyFlag.DirtyCompositionMode:
+            state.composition_mode = engine_state.compositionMode()
+        if flags & (DirtyFlag.DirtyClipPath | DirtyFlag.DirtyClipRegion):
+            if flags & DirtyFlag.DirtyClipPath:
+                clip = engine_state.clipPath()
+            else:
+                clip = QPainterPath()
+                clip.addRegion(engine_state.clipRegion())
+            # Clips arrive in the coordinates of the current transform.
+            clip = state.transform.map(clip)
+            operation = engine_state.clipOperation()
+            if operation == Qt.ClipOperation.NoClip:
+                state.clip = None
+            elif (operation == Qt.ClipOperation.IntersectClip and
+                  state.clip is not None):
+                state.clip = state.clip.intersected(clip)
+            else:
+                state.clip = clip
+        if (flags & DirtyFlag.DirtyClipEnabled and
+                not engine_state.isClipEnabled()):
+            state.clip = None
+        self.paint_state = state
+
+    def add_shape(self,
+                  local_bounds: QRectF,
+                  draw: typing.Callable[[QPainter], None],
+                  is_stroked: bool = True):
+        state = self.paint_state
+        bounds = state.transform.mapRect(local_bounds)
+        pen = state.pen
+        if is_stroked and pen.style() != Qt.PenStyle.NoPen:
+            if pen.isCosmetic():
+                self.cosmetic_width = max(self.cosmetic_width,
+                                          pen.widthF() or 1.0)
+            else:
+                # Miter joins can stick out past half the pen width.
+                reach = pen.widthF() * max(pen.miterLimit(), 1.5) / 2
+                reach *= sqrt(abs(state.transform.determinant()))
+                bounds.adjust(-reach, -reach, reach, reach)
+        if state.clip is not None:
+            bounds = bounds.intersected(state.clip.boundingRect())
+        self.shapes.append(Shape(state, bounds, draw))
+
+    def drawPath(self, path: QPainterPath):
+        path = QPainterPath(path)
+        self.add_shape(path.controlPointRect(),
+                       lambda painter: painter.drawPath(path))
+
+    def drawPolygon(self,
+                    points: QPointF,
+                    point_count: int,
+                    mode: QPaintEngine.PolygonDrawMode):
+        # The binding only wraps the first point, so read the whole array
+        # from its address. QPointF is two doubles.
+        address = shiboken6.getCppPointer(points)[0]
+        values = (ctypes.c_double * (2 * point_count)).from_address(address)
+        polygon = QPolygonF([QPointF(values[i], values[i+1])
+                             for i in range(0, 2 * point_count, 2)])
+        if mode == PolygonDrawMode.PolylineMode:
+            self.add_shape(polygon.boundingRect(),
+                           lambda painter: painter.drawPolyline(polygon))
+            return
+        if mode == PolygonDrawMode.WindingMode:
+            fill_rule = Qt.FillRule.WindingFill
+        else:
+            fill_rule = Qt.FillRule.OddEvenFill
+        self.add_shape(polygon.boundingRect(),
+                       lambda painter: painter.drawPolygon(polygon, fill_rule))
+
+    def drawPixmap(self, target: QRectF, pixmap: QPixmap, source: QRectF):
+        target = QRectF(target)
+        source = QRectF(source)
+        self.add_shape(target,
+                       lambda painter: painter.drawPixmap(target,
+                                                          pixmap,
+                                                          source),
+                       is_stroked=False)
+
+    def drawImage(self,
+                  target: QRectF,
+                  image: QImage,
+                  source: QRectF,
+                  flags: Qt.ImageConversionFlag =
+                  Qt.ImageConversionFlag.AutoColor):
+        target = QRectF(target)
+        source = QRectF(source)
+        self.add_shape(target,
+                       lambda painter: painter.drawImage(target,
+                                                         image,
+                                                         source,
+                                                         flags),
+                       is_stroked=False)
+
+    def drawTiledPixmap(self,
+                        target: QRectF,
+                        pixmap: QPixmap,
+                        offset: QPointF):
+        target = QRectF(target)
+        offset = QPointF(offset)
+        self.add_shape(target,
+                       lambda painter: painter.drawTiledPixmap(target,
+                                                               pixmap,
+                                                               offset),
+                       is_stroked=False)
+
+
+class RecordingDevice(QPaintDevice):
+    """ Something to point a QPainter at, so a ShapeRecorder gets the calls.
+    """
+    def __init__(self, size: QRectF):
+        super().__init__()
+        self.engine = ShapeRecorder()
+        self.size = size.size().toSize()
+
+        # Match the resolution that art gets rendered at on the screen.
+        self.reference = QImage(1, 1, QImage.Format.Format_ARGB32)
+
+    def paintEngine(self) -> QPaintEngine:
+        return self.engine
+
+    def metric(self, metric: QPaintDevice.PaintDeviceMetric) -> int:
+        if metric == QPaintDevice.PaintDeviceMetric.PdmWidth:
+            return max(self.size.width(), 1)
+        if metric == QPaintDevice.PaintDeviceMetric.PdmHeight:
+            return max(self.size.height(), 1)
+        return self.reference.metric(metric)
+
+
+class VectorRecording:
+    """ A vector drawing, recorded as separate shapes.
+
+    Painting a section of the drawing only replays the shapes that touch
+    it, instead of rendering the whole drawing under a clip. Vector devices
+    like QPdfWriter store every shape that's painted, even the clipped ones,
+    so this keeps the size of a PDF tied to the drawing, not the number of
+    pieces it's cut into. The shapes are recorded the first time they're
+    needed.
+    """
+    # Divide the drawing into this many columns and rows to find shapes.
+    BUCKET_COUNT = 16
+
+    def __init__(self, renderer: QSvgRenderer):
+        self.renderer = renderer
+        self.shapes: typing.Optional[typing.List[Shape]] = None
+        self.cosmetic_width = 0.0
+
+        # {(column, row): [shape_index]} for shapes that touch each bucket
+        self.buckets: typing.Dict[typing.Tuple[int, int],
+                                  typing.List[int]] = {}
+
+    def record(self):
+        if self.shapes is not None:
+            return
+        view_box = self.renderer.viewBoxF()
+        device = RecordingDevice(view_box)
+        painter = QPainter(device)
+        try:
+            # Render the view box onto itself, so the shapes use the
+            # drawing's own coordinates.
+            self.renderer.render(painter, view_box)
+        finally:
+            painter.end()
+        self.shapes = device.engine.shapes
+        self.cosmetic_width = device.engine.cosmetic_width
+        for index, shape in enumerate(self.shapes):
+            for key in self.find_buckets(shape.bounds):
+                self.buckets.setdefault(key, []).append(index)
+
+    def find_buckets(
+            self,
+            bounds: QRectF) -> typing.Iterator[typing.Tuple[int, int]]:
+        view_box = self.renderer.viewBoxF()
+        count = self.BUCKET_COUNT
+        bucket_width = view_box.width() / count
+        bucket_height = view_box.height() / count
+
+        def find_range(start: float, end: float, origin: float, size: float):
+            first = int((start - origin) // size)
+            last = int((end - origin) // size)
+            return range(max(first, 0), min(last, count - 1) + 1)
+
+        for column in find_range(bounds.left(),
+                                 bounds.right(),
+                                 view_box.x(),
+                                 bucket_width):
+            for row in find_range(bounds.top(),
+                                  bounds.bottom(),
+                                  view_box.y(),
+                                  bucket_height):
+                yield column, row
+
+    def find_shapes(self, area: QRectF) -> typing.List[Shape]:
+        """ Find the shapes that touch an area, in drawing order. """
+        self.record()
+        indexes = set()
+        for key in self.find_buckets(area):
+            indexes.update(self.buckets.get(key, ()))
+        return [self.shapes[index]
+                for index in sorted(indexes)
+                if touches(self.shapes[index].bounds, area)]
+
+    def draw(self, painter: QPainter, source: QRectF, target: QRectF):
+        """ Draw a section of the drawing to fill the target.
+
+        :param painter: the painter to draw with, which is already clipped
+            to the target
+        :param source: the section to draw, in the drawing's coordinates
+        :param target: where to draw it, in the painter's coordinates
+        """
+        self.record()
+        scale_x = target.width() / source.width()
+        scale_y = target.height() / source.height()
+        base_transform = QTransform(scale_x,
+                                    0,
+                                    0,
+                                    scale_y,
+                                    target.x() - source.x() * scale_x,
+                                    target.y() - source.y() * scale_y)
+        base_transform *= painter.worldTransform()
+
+        # Cosmetic pens keep their width in device pixels.
+        device_scale = sqrt(abs(base_transform.determinant())) or 1.0
+        reach = self.cosmetic_width / device_scale
+        area = source.adjusted(-reach, -reach, reach, reach)
+
+        # Skip what's off the device, like the rest of the page when a PNG
+        # is painted in bands.
+        device = painter.device()
+        inverse, is_invertible = base_transform.inverted()
+        if device is not None and is_invertible:
+            visible = inverse.mapRect(QRectF(0,
+                                             0,
+                                             device.width(),
+                                             device.height()))
+            if not touches(visible, area):
+                return
+            area = area.intersected(visible.adjusted(-reach,
+                                                     -reach,
+                                                     reach,
+                                                     reach))
+        for shape in self.find_shapes(area):
+            painter.save()
+            try:
+                shape.state.apply(painter, base_transform)
+                shape.draw(painter)
+            finally:
+                painter.restore()
+
+
+def touches(bounds1: QRectF, bounds2: QRectF) -> bool:
+    """ Check if two rectangles overlap or touch.
+
+    Unlike QRectF.intersects(), this counts a straight line with no width.
+    """
+    return (bounds1.left() <= bounds2.right() and
+            bounds2.left() <= bounds1.right() and
+            bounds1.top() <= bounds2.bottom() and
+            bounds2.top() <= bounds1.bottom())
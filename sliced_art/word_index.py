@@ -0,0 +1,339 @@
+import gzip
+import os
+import re
+import typing
+from array import array
+from bisect import bisect_left
+from collections import defaultdict
+from itertools import islice
+
+
+def anagram_root(word: str):
+    return ''.join(sorted(word))
+
+
+def clean_word(word: str, force_lower: bool = True):
+    stripped = re.sub(r'\s', '', word)
+    if force_lower:
+        stripped = stripped.lower()
+    return stripped
+
+
+class WordIndex:
+    """ A dictionary of words, loaded once and shared by the clue engines.
+
+    Each lookup table is built the first time an engine asks for it, so
+    switching engines reuses the words without reading the file again.
+    """
+    def __init__(self,
+                 all_words: typing.Optional[typing.Iterable[str]] = None,
+                 words_path: typing.Optional[str] = None):
+        """ Initialize the object.
+
+        :param all_words: the words to index, like the lines of a file
+        :param words_path: the file the words came from, so the word stats
+            can be saved next to it
+        """
+        self.words_path = words_path
+        self.words: typing.List[str] = []
+        if all_words is not None:
+            for word in all_words:
+                word = word.strip()
+                if word:
+                    self.words.append(word)
+        self.anagrams_table: typing.Optional[
+            typing.Dict[str, typing.List[str]]] = None
+        self.words_by_size_table: typing.Optional[
+            typing.Dict[int, typing.List[str]]] = None
+        self.suggestions_table: typing.Optional[WordSuggestions] = None
+        self.stats_table: typing.Optional[WordStats] = None
+
+    @classmethod
+    def load(cls, words_path: str) -> 'WordIndex':
+        with open(words_path) as f:
+            return cls(f, words_path)
+
+    def build_tables(self):
+        """ Build the tables that the words tab uses, instead of waiting for
+        the first time they're needed.
+
+        Nothing here touches Qt, so it's safe to call from a worker thread.
+        """
+        _ = self.anagrams, self.stats, self.suggestions
+
+    @property
+    def anagrams(self) -> typing.Dict[str, typing.List[str]]:
+        """ {anagram_root: [cleaned_word]} """
+        if self.anagrams_table is None:
+            self.anagrams_table = defaultdict(list)
+            for word in self.words:
+                cleaned_word = clean_word(word)
+                root = anagram_root(cleaned_word)
+                self.anagrams_table[root].append(cleaned_word)
+        return self.anagrams_table
+
+    @property
+    def words_by_size(self) -> typing.Dict[int, typing.List[str]]:
+        """ {length: [word]} """
+        if self.words_by_size_table is None:
+            self.words_by_size_table = defaultdict(list)
+            for word in self.words:
+                self.words_by_size_table[len(word)].append(word)
+        return self.words_by_size_table
+
+    @property
+    def suggestions(self) -> 'WordSuggestions':
+        if self.suggestions_table is None:
+            self.suggestions_table = WordSuggestions(self.anagrams, self.stats)
+        return self.suggestions_table
+
+    @property
+    def stats(self) -> 'WordStats':
+        """ Clue quality for every word.
+
+        Read from the sidecar file next to the word list, if it's up to
+        date. Otherwise, calculate the stats and try to save the sidecar.
+        """
+        if self.stats_table is None:
+            if self.words_path is None:
+                self.stats_table = WordStats.build(self.anagrams)
+            else:
+                self.stats_table = WordStats.load_or_build(self.words_path,
+                                                           self)
+        return self.stats_table
+
+    def suggest(self,
+                label: str,
+                prefix: str = '',
+                limit: int = 10) -> typing.List[str]:
+        """ Suggest words to use for a cell's clue.
+
+        :param label: the cell's label that the word has to contain, like A,
+            or AB past Z
+        :param prefix: the start of the word, as typed so far
+        :param limit: the most words to return
+        :return: cleaned words, unique anagrams first, then shortest first
+        """
+        return self.suggestions.suggest(label, prefix, limit)
+
+
+class WordSuggestions:
+    """ Words that contain each letter, ready to suggest while typing.
+
+    All the words are sorted alphabetically, so the words that start with a
+    prefix are a range of positions. For each letter, the positions of the
+    words that contain it are stored twice: in alphabetical order to find a
+    prefix's range with a binary search, and in ranked order to take the best
+    words without sorting. Positions are stored in arrays to keep the index
+    small for long word lists.
+    """
+    # Scan the ranked words when a prefix matches at least this many, because
+    # matches will turn up quickly. Otherwise, rank the matches.
+    MIN_SCAN_MATCHES = 1000
+
+    def __init__(self,
+                 anagrams: typing.Dict[str, typing.List[str]],
+                 stats: 'WordStats'):
+        """ Initialize the object.
+
+        :param anagrams: {anagram_root: [cleaned_word]} from WordIndex
+        :param stats: the stats for the same words, to find unique anagrams
+        """
+        all_words = set()
+        for anagram_words in anagrams.values():
+            all_words.update(anagram_words)
+        self.words = sorted(all_words)
+
+        # rank of each word position, lower is better
+        ranked_positions = sorted(
+            range(len(self.words)),
+            key=lambda i: (not stats.is_unique(self.words[i]),
+                           len(self.words[i]),
+                           self.words[i]))
+        self.ranks = array('L', [0]) * len(self.words)
+        for rank, position in enumerate(ranked_positions):
+            self.ranks[position] = rank
+
+        # {letter: array of positions}
+        self.sorted_positions: typing.Dict[str, array] = {}
+        self.ranked_positions: typing.Dict[str, array] = {}
+        letter_positions = defaultdict(list)
+        for position, word in enumerate(self.words):
+            for letter in set(word):
+                letter_positions[letter].append(position)
+        for letter, positions in letter_positions.items():
+            self.sorted_positions[letter] = array('L', positions)
+            positions.sort(key=self.ranks.__getitem__)
+            self.ranked_positions[letter] = array('L', positions)
+
+    def suggest(self,
+                label: str,
+                prefix: str = '',
+                limit: int = 10) -> typing.List[str]:
+        label = clean_word(label)
+        if not label:
+            return []
+        # Labels past Z have more than one letter, and the clue engines look
+        # for the whole label in the word. Search the words with the label's
+        # rarest letter, then check them for the whole label.
+        letter = min(label,
+                     key=lambda c: len(self.sorted_positions.get(c, ())))
+        sorted_positions = self.sorted_positions.get(letter)
+        if sorted_positions is None:
+            return []
+        ranked_positions = self.ranked_positions[letter]
+        prefix = clean_word(prefix)
+        if not prefix:
+            positions = ranked_positions
+        else:
+            start = bisect_left(self.words, prefix)
+            end = bisect_left(self.words, prefix + '\uffff', start)
+            start_index = bisect_left(sorted_positions, start)
+            end_index = bisect_left(sorted_positions, end, start_index)
+            if end_index - start_index >= self.MIN_SCAN_MATCHES:
+                positions = (position
+                             for position in ranked_positions
+                             if start <= position < end)
+            else:
+                matches = sorted_positions[start_index:end_index]
+                positions = sorted(matches, key=self.ranks.__getitem__)
+        words = (self.words[position] for position in positions)
+        return list(islice((word for word in words if label in word), limit))
+
+
+class WordStat(typing.NamedTuple):
+    """ How good a word is as a clue. """
+    anagram_count: int  # Distinct words with the same letters, including it.
+    added_count: int  # Words that have the same letters, plus one more.
+    removed_count: int  # Words that have the same letters, minus one.
+    difficulty: int  # See rate_difficulty().
+
+
+class WordStats:
+    """ Clue quality for all the words in a list, calculated in one pass.
+
+    Words with the same letters have the same stats, so they're stored by
+    anagram root. The sidecar file is a gzipped text file with a header line
+    that records the size and modification time of the word list, so it's
+    ignored once the word list changes.
+    """
+    FORMAT_NAME = 'sliced-art-word-stats'
+    FORMAT_VERSION = 1
+    FILE_SUFFIX = '.stats.gz'
+
+    def __init__(self, table: typing.Optional[
+            typing.Dict[str, WordStat]] = None):
+        """ Initialize the object.
+
+        :param table: {anagram_root: stat}
+        """
+        self.table = {} if table is None else table
+
+    def __getitem__(self, word: str) -> WordStat:
+        """ Look up a word, or return zeroes if it's unknown. """
+        cleaned_word = clean_word(word)
+        stat = self.table.get(anagram_root(cleaned_word))
+        if stat is None:
+            return WordStat(0, 0, 0, rate_difficulty(cleaned_word, 0))
+        return stat
+
+    def is_unique(self, word: str) -> bool:
+        """ Check that a word is known, and no other word has its letters. """
+        return self[word].anagram_count == 1
+
+    @classmethod
+    def build(cls,
+              anagrams: typing.Dict[str, typing.List[str]]) -> 'WordStats':
+        """ Calculate the stats from the anagrams table of a WordIndex. """
+        anagram_counts = {root: len(set(root_words))
+                          for root, root_words in anagrams.items()}
+        added_counts = defaultdict(int)
+        removed_counts = defaultdict(int)
+        # Each root's neighbours with one letter removed are also the ones
+        # that have that root when one letter is added, so both counts come
+        # from the same pass.
+        for root, anagram_count in anagram_counts.items():
+            for i, letter in enumerate(root):
+                if i > 0 and root[i-1] == letter:
+                    continue  # Same neighbour as the last letter.
+                shorter_root = root[:i] + root[i+1:]
+                shorter_count = anagram_counts.get(shorter_root)
+                if shorter_count is not None:
+                    removed_counts[root] += shorter_count
+                    added_counts[shorter_root] += anagram_count
+        table = {}
+        for root, anagram_count in anagram_counts.items():
+            table[root] = WordStat(anagram_count,
+                                   added_counts[root],
+                                   removed_counts[root],
+                                   rate_difficulty(root, anagram_count))
+        return cls(table)
+
+    @classmethod
+    def get_sidecar_path(cls, words_path: str) -> str:
+        return words_path + cls.FILE_SUFFIX
+
+    @classmethod
+    def make_header(cls, words_path: str) -> str:
+        words_stat = os.stat(words_path)
+        return (f'{cls.FORMAT_NAME} {cls.FORMAT_VERSION} '
+                f'{words_stat.st_size} {words_stat.st_mtime_ns}')
+
+    def save(self, words_path: str):
+        """ Write the sidecar file for a word list. """
+        sidecar_path = self.get_sidecar_path(words_path)
+        with gzip.open(sidecar_path, 'wt', compresslevel=6) as f:
+            f.write(self.make_header(words_path) + '\n')
+            f.writelines(f'{root}\t{stat.anagram_count}\t{stat.added_count}\t'
+                         f'{stat.removed_count}\t{stat.difficulty}\n'
+                         for root, stat in self.table.items())
+
+    @classmethod
+    def load(cls, words_path: str) -> typing.Optional['WordStats']:
+        """ Read the sidecar file for a word list.
+
+        :return: the stats, or None if the file is missing or out of date
+        """
+        try:
+            with gzip.open(cls.get_sidecar_path(words_path), 'rt') as f:
+                if f.readline().rstrip('\n') != cls.make_header(words_path):
+                    return None
+                table = {}
+                for line in f:
+                    root, *counts = line.rstrip('\n').split('\t')
+                    table[root] = WordStat(*map(int, counts))
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+        return cls(table)
+
+    @classmethod
+    def load_or_build(cls,
+                      words_path: str,
+                      word_index: WordIndex) -> 'WordStats':
+        stats = cls.load(words_path)
+        if stats is None:
+            stats = cls.build(word_index.anagrams)
+            try:
+                stats.save(words_path)
+            except OSError:
+                pass  # Maybe the folder is read only, just build it again.
+        return stats
+
+
+def rate_difficulty(root: str, anagram_count: int) -> int:
+    """ Score how hard a word is to solve from its shuffled letters.
+
+    Every letter makes it harder to unscramble, and every other word with the
+    same letters counts double, because the solver might find the wrong one.
+    """
+    return len(root) + 2 * max(anagram_count - 1, 0)
+
+
+def get_word_index(
+        all_words: typing.Union[WordIndex,
+                                typing.Iterable[str],
+                                None]) -> WordIndex:
+    """ Use an existing index, or build a new one from a list of words. """
+    if isinstance(all_words, WordIndex):
+        return all_words
+    return WordIndex(all_words)
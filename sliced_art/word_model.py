@@ -0,0 +1,159 @@
+import typing
+
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, Qt, \
+    QPersistentModelIndex, QStringListModel
+from PySide6.QtWidgets import QStyledItemDelegate, QLineEdit, QWidget, \
+    QStyleOptionViewItem, QCompleter
+
+AnyIndex = typing.Union[QModelIndex, QPersistentModelIndex]
+
+
+class WordModel(QAbstractTableModel):
+    """ The word typed for each letter, and how it checks out as a clue.
+
+    Changing the letters only inserts or removes the rows that changed, so
+    views keep their existing rows and editors.
+    """
+    WORD_COLUMN = 0
+    DISPLAY_COLUMN = 1
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.letters: typing.List[str] = []
+        self.words: typing.Dict[str, str] = {}  # {letter: word as typed}
+        self.displays: typing.Dict[str, str] = {}  # {letter: display}
+
+        # Callback method for when the user edits a word.
+        self.on_word_edited = lambda letter, word: None
+
+    def rowCount(self, parent: AnyIndex = QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(self.letters)
+
+    def columnCount(self, parent: AnyIndex = QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return 2
+
+    def headerData(self,
+                   section: int,
+                   orientation: Qt.Orientation,
+                   role: int = Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return 'Word' if section == self.WORD_COLUMN else 'Check'
+        return self.letters[section] or '-'
+
+    def flags(self, index: AnyIndex) -> Qt.ItemFlag:
+        flags = super().flags(index)
+        if index.column() == self.WORD_COLUMN:
+            flags |= Qt.ItemFlag.ItemIsEditable
+        return flags
+
+    def data(self, index: AnyIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        if role not in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            return None
+        letter = self.letters[index.row()]
+        if index.column() == self.WORD_COLUMN:
+            return self.words.get(letter, '')
+        return self.displays.get(letter, '')
+
+    def setData(self,
+                index: AnyIndex,
+                value,
+                role: int = Qt.ItemDataRole.EditRole) -> bool:
+        if (role != Qt.ItemDataRole.EditRole or
+                index.column() != self.WORD_COLUMN):
+            return False
+        letter = self.letters[index.row()]
+        word = str(value)
+        if self.words.get(letter) == word:
+            return True
+        self.words[letter] = word
+        self.dataChanged.emit(index, index)
+        self.on_word_edited(letter, word)
+        return True
+
+    def set_letters(self, letters: typing.Sequence[str]) -> typing.List[str]:
+        """ Change the list of letters, keeping rows that didn't change.
+
+        :return: the letters that were added
+        """
+        common_count = 0
+        for old_letter, new_letter in zip(self.letters, letters):
+            if old_letter != new_letter:
+                break
+            common_count += 1
+        old_count = len(self.letters)
+        if common_count < old_count:
+            self.beginRemoveRows(QModelIndex(), common_count, old_count - 1)
+            for letter in self.letters[common_count:]:
+                self.words.pop(letter, None)
+                self.displays.pop(letter, None)
+            del self.letters[common_count:]
+            self.endRemoveRows()
+        added_letters = list(letters[common_count:])
+        if added_letters:
+            self.beginInsertRows(QModelIndex(),
+                                 common_count,
+                                 len(letters) - 1)
+            self.letters.extend(added_letters)
+            self.endInsertRows()
+        return added_letters
+
+    def set_word(self, letter: str, word: str):
+        """ Set a word without triggering on_word_edited. """
+        self.words[letter] = word
+        self.emit_changed(letter, self.WORD_COLUMN)
+
+    def set_display(self, letter: str, display: str):
+        self.displays[letter] = display
+        self.emit_changed(letter, self.DISPLAY_COLUMN)
+
+    def emit_changed(self, letter: str, column: int):
+        index = self.index(self.letters.index(letter), column)
+        self.dataChanged.emit(index, index)
+
+
+class WordDelegate(QStyledItemDelegate):
+    """ Edit words with a line edit that commits on every key stroke.
+
+    While typing, a drop down suggests words that contain the row's letter.
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+
+        # Callback method to find words for a letter that start with a prefix.
+        self.get_suggestions: typing.Callable[
+            [str, str], typing.List[str]] = lambda letter, prefix: []
+
+    def createEditor(self,
+                     parent: QWidget,
+                     option: QStyleOptionViewItem,
+                     index: AnyIndex) -> QWidget:
+        editor = QLineEdit(parent)
+        editor.setFrame(False)
+        letter = index.model().letters[index.row()]
+        suggestion_model = QStringListModel(editor)
+        completer = QCompleter(suggestion_model, editor)
+        completer.setCompletionMode(
+            QCompleter.CompletionMode.UnfilteredPopupCompletion)
+        editor.setCompleter(completer)
+        # noinspection PyUnresolvedReferences
+        editor.textEdited.connect(lambda: self.commitData.emit(editor))
+        # noinspection PyUnresolvedReferences
+        editor.textEdited.connect(
+            lambda text: self.suggest(completer, letter, text))
+        # noinspection PyUnresolvedReferences
+        completer.activated.connect(lambda: self.commitData.emit(editor))
+        return editor
+
+    def suggest(self, completer: QCompleter, letter: str, prefix: str):
+        suggestions = self.get_suggestions(letter, prefix) if prefix else []
+        completer.model().setStringList(suggestions)
+        if suggestions:
+            completer.complete()
+        else:
+            completer.popup().hide()
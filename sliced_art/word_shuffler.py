@@ -1,40 +1,43 @@
-import re
 import typing
-from collections import defaultdict
 from random import shuffle
 
+from sliced_art.clue_engine import ClueEngine, register_clue_engine
+from sliced_art.word_index import WordIndex, anagram_root, clean_word, \
+    get_word_index
 
-def highlight_position(word: str, position: int):
-    return word[:position] + word[position].upper() + word[position+1:]
 
+def highlight_position(word: str, position: int, length: int = 1):
+    end = position + length
+    return word[:position] + word[position:end].upper() + word[end:]
 
-def anagram_root(word: str):
-    return ''.join(sorted(word))
 
+@register_clue_engine
+class WordShuffler(ClueEngine):
+    """ Clues are the words with their letters shuffled.
 
-def clean_word(word: str, force_lower: bool = True):
-    stripped = re.sub(r'\s', '', word)
-    if force_lower:
-        stripped = stripped.lower()
-    return stripped
+    A letter can be a label with more than one letter, like AB in grids with
+    more than 26 cells. The word then has to contain those letters together.
+    """
+    name = 'anagrams'
+    title = 'Shuffled letters'
 
-
-class WordShuffler:
     def __init__(self,
-                 all_words: typing.Optional[typing.Iterable[str]] = None,
+                 all_words: typing.Union[WordIndex,
+                                         typing.Iterable[str],
+                                         None] = None,
                  min_words: int = 0):
-        self.needs_blank = False
         self.min_words = min_words
-        self.anagrams = defaultdict(list)
-        if all_words is not None:
-            for word in all_words:
-                cleaned_word = clean_word(word)
-                root = anagram_root(cleaned_word)
-                root_anagrams = self.anagrams[root]
-                root_anagrams.append(cleaned_word)
+        self.word_index = get_word_index(all_words)
         self.words = {}
         self.targets = {}
 
+        # {letter: clue} shuffled since that letter's word last changed
+        self.clue_cache: typing.Dict[str, str] = {}
+
+    @property
+    def anagrams(self) -> typing.Dict[str, typing.List[str]]:
+        return self.word_index.anagrams
+
     def __setitem__(self, letter: str, word: str):
         letter = letter.lower()
         word = clean_word(word, False)
@@ -42,8 +45,13 @@ class WordShuffler:
         target_pos = word.find(upper_target_letter)
         if target_pos < 0:
             target_pos = word.find(letter)
-        self.words[letter] = word.lower()
+        word = word.lower()
+        if (self.words.get(letter) == word and
+                self.targets.get(letter) == target_pos):
+            return
+        self.words[letter] = word
         self.targets[letter] = target_pos
+        self.clue_cache.pop(letter, None)
 
     def __getitem__(self, letter: str):
         return self.words.get(letter.lower(), '')
@@ -56,7 +64,10 @@ class WordShuffler:
         if not target_word or target_pos < 0:
             return f'{upper_target_letter} word needed.'
 
-        display_parts = [highlight_position(target_word, target_pos)]
+        target_length = len(target_letter)
+        display_parts = [highlight_position(target_word,
+                                            target_pos,
+                                            target_length)]
         word_anagrams = self.anagrams[anagram_root(target_word)]
         matches = []
         is_known = False
@@ -64,7 +75,9 @@ class WordShuffler:
             if word_anagram == target_word:
                 is_known = True
                 continue
-            matches.append(highlight_position(word_anagram, target_pos))
+            matches.append(highlight_position(word_anagram,
+                                              target_pos,
+                                              target_length))
         if not is_known:
             display_parts[0] += ' (unknown word)'
         other_words = matches
@@ -72,13 +85,19 @@ class WordShuffler:
             display_parts.append(', '.join(other_words))
         return ' - '.join(display_parts)
 
+    def is_ready(self) -> bool:
+        """ Check that there are enough words, and each has its target. """
+        if len(self.words) < self.min_words:
+            return False
+        return all(pos >= 0 for pos in self.targets.values())
+
     def make_clue(self, target_letter: str):
         target_letter = target_letter.lower()
-        default_clue = target_letter.upper()
-        if len(self.words) < self.min_words:
-            return default_clue
-        if any(pos < 0 for pos in self.targets.values()):
-            return default_clue
+        if not self.is_ready():
+            return target_letter.upper()
+        return self.shuffle_clue(target_letter)
+
+    def shuffle_clue(self, target_letter: str) -> str:
         target_word = self[target_letter].upper()
         clue_letters = list(target_word)
         letter_text = None
@@ -88,11 +107,40 @@ class WordShuffler:
             if letter_text != target_word:
                 break
         target_pos = self.targets[target_letter]
+        target_end = target_pos + len(target_letter)
         blanks = [' ', '_'] * len(target_word) + [' ']
         blanks[target_pos*2:target_pos*2+1] = '('
-        blanks[target_pos*2+2:target_pos*2+3] = ')'
+        blanks[target_end*2:target_end*2+1] = ')'
         blank_text = ''.join(blanks).strip()
         return blank_text + '\n' + letter_text
 
-    def make_clues(self):
-        return {letter: self.make_clue(letter) for letter in self.words}
+    def make_clues(self, is_fresh: bool = False) -> typing.Dict[str, str]:
+        """ Make a clue for each letter.
+
+        Clues are cached, so only the letters whose words changed since the
+        last call get shuffled again.
+
+        :param is_fresh: True if every clue should be shuffled again, without
+            reading or changing the cache.
+        """
+        if not self.is_ready():
+            return {letter: letter.upper() for letter in self.words}
+        if is_fresh:
+            return {letter: self.shuffle_clue(letter) for letter in self.words}
+        clues = {}
+        for letter in self.words:
+            clue = self.clue_cache.get(letter)
+            if clue is None:
+                clue = self.clue_cache[letter] = self.shuffle_clue(letter)
+            clues[letter] = clue
+        return clues
+
+    def clear_clues(self):
+        """ Forget the cached clues, so they all get shuffled again. """
+        self.clue_cache.clear()
+
+    def restore_clues(self, clues: typing.Dict[str, str]):
+        for letter, clue in clues.items():
+            letter = letter.lower()
+            if letter in self.words and clue != letter.upper():
+                self.clue_cache[letter] = clue
@@ -1,34 +1,54 @@
 import typing
 from collections import defaultdict, Counter
 
+from sliced_art.cell_labels import make_labels
+from sliced_art.clue_engine import ClueEngine, register_clue_engine
+from sliced_art.word_index import WordIndex, get_word_index
 
-class WordStripper:
-    def __init__(self, all_words=None, min_words=0):
-        self.needs_blank = True
-        self.all_words = list(all_words)
-        self.all_words_by_size = defaultdict(list)
-        for word in self.all_words:
-            word = word.strip()
-            size_list = self.all_words_by_size[len(word)]
-            size_list.append(word)
-        start = ord('a')
-        self.words = {chr(i): ''
-                      for i in range(start, start+min_words)}  # {letter: word}
+
+@register_clue_engine
+class WordStripper(ClueEngine):
+    """ Clues are the words, and solving means removing one letter.
+
+    A letter can be a label with more than one letter, like AB in grids with
+    more than 26 cells. Solving then means removing all of those letters.
+    """
+    name = 'stripped'
+    title = 'Stripped letters'
+    needs_blank = True
+
+    def __init__(self,
+                 all_words: typing.Union[WordIndex,
+                                         typing.Iterable[str],
+                                         None] = None,
+                 min_words: int = 0):
+        self.word_index = get_word_index(all_words)
+        self.words = {label.lower(): ''
+                      for label in make_labels(min_words)}  # {letter: word}
         self.words[''] = ''
         self.goal_words = defaultdict(list)  # {letter: [(word, letter)]}
         self.other_words = defaultdict(list)  # {letter: [(word, letter)]}
 
+    @property
+    def all_words_by_size(self) -> typing.Dict[int, typing.List[str]]:
+        return self.word_index.words_by_size
+
     def __setitem__(self, letter: str, word: str):
         letter = letter.lower()
+        if self.words.get(letter) == word and letter in self.goal_words:
+            return
         self.words[letter] = word
         word = word.lower()
         self.goal_words[letter] = goal_word_list = []
         self.other_words[letter] = other_word_list = []
         if letter:
-            source_words = self.all_words_by_size[len(word) - 1]
+            extra_count = len(letter)
+            source_words = self.all_words_by_size[len(word) - extra_count]
         else:
+            extra_count = 1
             source_words = self.all_words_by_size[len(word) + 1]
         target_counts = Counter(word)
+        letter_counts = Counter(letter)
         for source_word in source_words:
             source_counts = Counter(source_word)
 
@@ -37,12 +57,12 @@ class WordStripper:
                 diffs = target_counts - source_counts
             else:
                 diffs = source_counts - target_counts
-            if sum(diffs.values()) == 1:
-                extra_letter, = diffs
-                if extra_letter == letter:
-                    goal_word_list.append((source_word, extra_letter))
+            if sum(diffs.values()) == extra_count:
+                if letter and diffs == letter_counts:
+                    goal_word_list.append((source_word, letter))
                 else:
-                    other_word_list.append((source_word, extra_letter))
+                    extra_letters = ''.join(sorted(diffs.elements()))
+                    other_word_list.append((source_word, extra_letters))
 
     def __getitem__(self, letter: str) -> str:
         return self.words[letter.lower()]
@@ -52,12 +72,11 @@ class WordStripper:
         word = self.words[letter].lower()
         if not letter:
             return self.make_subtraction_display(letter)
-        if letter not in word:
+        if not contains_letters(word, letter):
             return f'{letter.upper()} word needed'
         display = display_word_list(self.goal_words[letter])
         if not display:
-            i = word.index(letter)
-            display = f'{word[:i]}{word[i+1:]}?{letter.upper()}'
+            display = f'{remove_letters(word, letter)}?{letter.upper()}'
         other_words_display = display_word_list(self.other_words[letter])
         if other_words_display:
             display = f'{display} -- {other_words_display}'
@@ -67,8 +86,13 @@ class WordStripper:
         return ', '.join(f'{word}-{extra_letter.upper()}'
                          for word, extra_letter in self.other_words[letter])
 
-    def make_clues(self) -> typing.Dict[str, str]:
-        if any(letter not in word.lower()
+    def make_clues(self, is_fresh: bool = False) -> typing.Dict[str, str]:
+        """ Make a clue for each letter.
+
+        :param is_fresh: ignored, because the clues are just the words, so
+            they're the same every time.
+        """
+        if any(not contains_letters(word.lower(), letter)
                for letter, word in self.words.items()):
             return {letter: letter.upper() for letter in self.words if letter}
         return {letter: word.upper()
@@ -78,3 +102,17 @@ class WordStripper:
 
 def display_word_list(word_list: typing.List[typing.Tuple[str, str]]) -> str:
     return ', '.join(f'{word}+{letter.upper()}' for word, letter in word_list)
+
+
+def contains_letters(word: str, letters: str) -> bool:
+    """ Check that a word has all the letters, in any order. """
+    return not Counter(letters) - Counter(word)
+
+
+def remove_letters(word: str, letters: str) -> str:
+    """ Remove the first copy of each letter from a word. """
+    for letter in letters:
+        i = word.find(letter)
+        if i >= 0:
+            word = word[:i] + word[i+1:]
+    return word
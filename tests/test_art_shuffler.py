@@ -1,9 +1,12 @@
+from random import Random
+
 import pytest
-from PySide6.QtCore import QPoint
-from PySide6.QtGui import Qt, QPixmap, QPainter, QColor, QPen, QBrush
+from PySide6.QtCore import QPoint, QSize
+from PySide6.QtGui import Qt, QPixmap, QPainter, QColor, QPen, QBrush, QImage, \
+    QPdfWriter
 from PySide6.QtWidgets import QApplication
 
-from sliced_art.art_shuffler import ArtShuffler
+from sliced_art.art_shuffler import ArtShuffler, GridLayout
 from tests.pixmap_differ import PixmapDiffer
 
 
@@ -480,6 +483,43 @@ def test_draw_grid_with_selected_row(pixmap_differ, symbol_clues):
     pixmap_differ.assert_equal()
 
 
+def test_symbol_clues_cached(qt_application, symbol_clues):
+    row_clues, column_clues = symbol_clues
+    shuffler = ArtShuffler(2,
+                           2,
+                           QPixmap(200, 200),
+                           row_clues=row_clues,
+                           column_clues=column_clues)
+
+    symbol_clues1 = shuffler.get_symbol_clues(90, 90)
+    symbol_clues2 = shuffler.get_symbol_clues(90, 90)
+    symbol_clues3 = shuffler.get_symbol_clues(45, 45)
+    shuffler.row_clues = list(reversed(row_clues))
+    symbol_clues4 = shuffler.get_symbol_clues(90, 90)
+
+    assert symbol_clues2 is symbol_clues1
+    assert symbol_clues3 is not symbol_clues1
+    assert symbol_clues4 is not symbol_clues1
+    assert symbol_clues1.row_clues[0].size() == QSize(90, 90)
+    assert symbol_clues3.column_clues[1].size() == QSize(45, 45)
+    assert symbol_clues1.get_overlay(1, 0) is symbol_clues1.get_overlay(1, 0)
+    assert symbol_clues1.get_overlay(1, 0).size() == QSize(90, 90)
+
+
+def test_symbol_clues_shared_tiles(qt_application, symbol_clues):
+    row_clues, column_clues = symbol_clues
+    shuffler = ArtShuffler(2,
+                           2,
+                           QPixmap(200, 200),
+                           row_clues=row_clues,
+                           column_clues=column_clues)
+    shuffler.share_tiles = True
+
+    symbol_clues = shuffler.get_symbol_clues(90, 90)
+
+    assert symbol_clues.row_clues[0].cacheKey() == row_clues[0].cacheKey()
+
+
 def test_select_clue(qt_application):
     display_image = QPixmap(180, 180)
     clue_image = QPixmap(100, 100)
@@ -501,3 +541,273 @@ def test_select_clue(qt_application):
 
     assert shuffler.selected_row is None
     assert shuffler.selected_column == 1
+
+
+def test_select_clue_outside(qt_application):
+    display_image = QPixmap(180, 180)
+    clue_image = QPixmap(100, 100)
+    art_image = QPixmap(1000, 1000)
+    clues = [clue_image] * 2
+    shuffler = ArtShuffler(2,
+                           2,
+                           display_image,
+                           row_clues=clues,
+                           column_clues=clues)
+    shuffler.selected_row = 1
+
+    shuffler.draw_grid(art_image)
+    shuffler.select_clue(QPoint(150, 150))
+    shuffler.select_clue(QPoint(5, 5))
+
+    assert shuffler.selected_row == 1
+    assert shuffler.selected_column is None
+
+
+def test_select_clue_before_draw(qt_application):
+    shuffler = ArtShuffler(2, 2, QPixmap(180, 180))
+
+    shuffler.select_clue(QPoint(30, 150))
+
+    assert shuffler.selected_row is None
+    assert shuffler.selected_column is None
+
+
+def test_grid_layout_cell_at():
+    layout = GridLayout(rows=3,
+                        cols=4,
+                        left_border=10,
+                        top_border=20,
+                        cell_width=12.5,
+                        cell_height=10)
+
+    assert layout.cell_at(QPoint(10, 20)) == (0, 0)
+    assert layout.cell_at(QPoint(24, 31)) == (1, 1)
+    assert layout.cell_at(QPoint(59, 49)) == (2, 3)
+    assert layout.cell_at(QPoint(60, 30)) is None
+    assert layout.cell_at(QPoint(9, 30)) is None
+    assert layout.cell_at(QPoint(30, 50)) is None
+    assert layout.row_clue_at(QPoint(30, 30)) is None
+    assert layout.column_clue_at(QPoint(30, 30)) is None
+
+
+def test_grid_layout_clues():
+    layout = GridLayout(rows=3,
+                        cols=4,
+                        left_border=30,
+                        top_border=30,
+                        cell_width=10,
+                        cell_height=10,
+                        left_clue_border=5,
+                        top_clue_border=5)
+
+    assert layout.row_clue_at(QPoint(5, 45)) == 1
+    assert layout.row_clue_at(QPoint(15, 45)) is None
+    assert layout.row_clue_at(QPoint(5, 25)) is None
+    assert layout.column_clue_at(QPoint(65, 14)) == 3
+    assert layout.column_clue_at(QPoint(65, 15)) is None
+
+
+# noinspection DuplicatedCode
+def test_shared_tiles(pixmap_differ):
+    art = QPixmap(1000, 1000)
+    painter = QPainter(art)
+    green = QColor('green')
+    blue = QColor('blue')
+    painter.fillRect(0, 0, 500, 1000, green)
+    painter.fillRect(500, 0, 500, 1000, blue)
+    painter.end()
+
+    actual, expected = pixmap_differ.start(200, 200, 'shared_tiles')
+    outline_rect(expected, 5, 0, 90, 90, green, pen_width=3)
+    outline_rect(expected, 5, 100, 90, 90, green, pen_width=3)
+    outline_rect(expected, 105, 0, 90, 90, blue, pen_width=3)
+    outline_rect(expected, 105, 100, 90, 90, blue, pen_width=3)
+
+    actual.end()
+    shuffler = ArtShuffler(2, 2, actual.device())
+    shuffler.share_tiles = True
+    shuffler.draw(art)
+
+    pixmap_differ.assert_equal()
+
+
+def test_shared_tiles_cached(qt_application):
+    art = QPixmap(100, 90)
+    shuffler = ArtShuffler(3, 4, QPixmap(200, 200))
+
+    tiles1 = shuffler.get_tiles(art)
+    tiles2 = shuffler.get_tiles(art)
+
+    assert tiles1 is tiles2
+    assert [[tile.size() for tile in row] for row in tiles1] == [
+        [QSize(25, 30)] * 4,
+        [QSize(25, 30)] * 4,
+        [QSize(25, 30)] * 4]
+
+
+def test_pixel_aligned_scale_art(qt_application):
+    art = QPixmap(100, 70)
+    shuffler = ArtShuffler(2, 3, QPixmap(200, 200))
+    shuffler.is_pixel_aligned = True
+
+    scaled_art, scaled_size = shuffler.scale_art(art, 95, 95)
+
+    assert scaled_size == QSize(93, 66)
+    assert scaled_art.size() == QSize(93, 66)
+
+
+def test_pixel_aligned_draw(qt_application):
+    random = Random(0)
+    art = QImage(180, 180, QImage.Format.Format_RGB32)
+    for y in range(art.height()):
+        for x in range(art.width()):
+            art.setPixel(x, y, random.randrange(0x1000000))
+    target = QImage(200, 200, QImage.Format.Format_RGB32)
+    shuffler = ArtShuffler(3, 3, target)
+    shuffler.is_pixel_aligned = True
+
+    shuffler.draw(art)
+
+    # Padding of 6.67 pixels snaps to 6, so pieces are copied exactly.
+    for i in range(3):
+        for j in range(3):
+            piece = target.copy(j*66 + 3, i*66, 60, 60)
+            assert piece == art.copy(j*60, i*60, 60, 60), (i, j)
+
+
+def test_pixel_aligned_shared_tiles(qt_application):
+    random = Random(0)
+    art = QImage(200, 200, QImage.Format.Format_RGB32)
+    for y in range(art.height()):
+        for x in range(art.width()):
+            art.setPixel(x, y, random.randrange(0x1000000))
+    pixmap = QPixmap.fromImage(art)
+    scaled_art = pixmap.scaled(180,
+                               180,
+                               Qt.AspectRatioMode.IgnoreAspectRatio,
+                               Qt.TransformationMode.SmoothTransformation)
+    scaled_art = scaled_art.toImage()
+    target = QImage(200, 200, QImage.Format.Format_RGB32)
+    shuffler = ArtShuffler(3, 3, target)
+    shuffler.share_tiles = True
+    shuffler.is_pixel_aligned = True
+
+    shuffler.draw(pixmap)
+
+    # Tiles are cut from the art scaled to the cells, then copied exactly.
+    for i in range(3):
+        for j in range(3):
+            piece = target.copy(j*66 + 3, i*66, 60, 60)
+            assert piece == scaled_art.copy(j*60, i*60, 60, 60), (i, j)
+
+
+def test_scaled_tiles_cached(qt_application):
+    art = QPixmap(100, 90)
+    shuffler = ArtShuffler(3, 4, QPixmap(200, 200))
+
+    tiles1 = shuffler.get_tiles(art, QSize(40, 30))
+    tiles2 = shuffler.get_tiles(art, QSize(40, 30))
+    tiles3 = shuffler.get_tiles(art)
+
+    assert tiles1 is tiles2
+    assert tiles3 is not tiles1
+    assert tiles1[0][0].size() == QSize(10, 10)
+    assert tiles3[0][0].size() == QSize(25, 30)
+
+
+def test_pixel_aligned_grid(qt_application):
+    art = QPixmap(100, 90)
+    shuffler = ArtShuffler(3, 4, QPixmap(200, 200))
+    shuffler.is_pixel_aligned = True
+
+    shuffler.draw_grid(art)
+
+    layout = shuffler.grid_layout
+    assert (layout.cell_width, layout.cell_height) == (42, 50)
+    assert layout.left_border == int(layout.left_border)
+    assert layout.top_border == int(layout.top_border)
+
+
+def write_noise_pdf(pdf_path, rows: int, cols: int, is_grid_drawn: bool):
+    random = Random(0)
+    image = QImage(120, 120, QImage.Format.Format_RGB32)
+    for y in range(image.height()):
+        for x in range(image.width()):
+            image.setPixel(x, y, random.randrange(0x1000000))
+    art = QPixmap.fromImage(image)
+    writer = QPdfWriter(str(pdf_path))
+    painter = QPainter(writer)
+    shuffler = ArtShuffler(rows,
+                           cols,
+                           writer,
+                           row_clues=[art.copy(0, 0, 10, 10)] * rows,
+                           column_clues=[art.copy(10, 0, 10, 10)] * cols)
+    shuffler.share_tiles = True
+    shuffler.selected_row = 0
+    shuffler.shuffle()
+    shuffler.draw(art, painter)
+    if is_grid_drawn:
+        shuffler.draw_grid(art, painter)
+    painter.end()
+    return pdf_path.stat().st_size
+
+
+def test_shared_tiles_pdf_size(qt_application, tmp_path):
+    pieces_size = write_noise_pdf(tmp_path / 'pieces.pdf', 6, 5, False)
+    puzzle_size = write_noise_pdf(tmp_path / 'puzzle.pdf', 6, 5, True)
+
+    # Filled grid reuses the tiles and clues, instead of embedding them again.
+    assert puzzle_size < pieces_size * 1.1
+
+
+def test_print_size(qt_application):
+    shuffler = ArtShuffler(2, 3, QPixmap(200, 100))
+
+    print_size = shuffler.get_print_size(QSize(1000, 1000))
+
+    assert print_size == QSize(90, 90)
+
+
+def test_print_size_with_symbols(qt_application):
+    clues = [QPixmap(10, 10)] * 3
+    shuffler = ArtShuffler(3,
+                           3,
+                           QPixmap(200, 200),
+                           row_clues=clues,
+                           column_clues=clues)
+
+    print_size = shuffler.get_print_size(QSize(1000, 500))
+
+    assert print_size == QSize(180, 90)
+
+
+def test_shuffle_optimized(qt_application):
+    shuffler = ArtShuffler(6, 4, QPixmap(100, 100))
+    shuffler.is_optimized = True
+    home_cells = list(shuffler.cells)
+
+    shuffler.shuffle()
+
+    assert shuffler.is_shuffled
+    assert sorted(shuffler.cells) == home_cells
+    assert all(cell != home_cell
+               for cell, home_cell in zip(shuffler.cells, home_cells))
+
+
+def test_shuffle_not_optimized(qt_application):
+    shuffler = ArtShuffler(6, 4, QPixmap(100, 100))
+    home_cells = list(shuffler.cells)
+    assert not shuffler.is_optimized
+
+    shuffler.shuffle()
+
+    assert shuffler.is_shuffled
+    assert sorted(shuffler.cells) == home_cells
+
+
+def test_labels_past_z(qt_application):
+    shuffler = ArtShuffler(6, 5, QPixmap(100, 100))
+
+    labels = [label for i, j, label in shuffler.cells]
+
+    assert labels[24:28] == ['Y', 'Z', 'AA', 'AB']
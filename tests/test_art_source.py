@@ -0,0 +1,220 @@
+from random import Random
+
+import pytest
+from PySide6.QtCore import QRectF, QSize, Qt
+from PySide6.QtGui import QColor, QImage, QPainter, QPdfWriter, QPixmap
+from PySide6.QtWidgets import QApplication
+
+from sliced_art.art_source import RasterArtSource, SvgArtSource, VectorArt, \
+    is_vector_path
+from sliced_art.puzzle_painter import Puzzle, PuzzlePainter
+
+# Red on the left half, blue on the right half.
+SVG_SOURCE = '''\
+<svg xmlns="http://www.w3.org/2000/svg" width="200" height="100"
+     viewBox="0 0 200 100">
+  <rect x="0" y="0" width="100" height="100" fill="red"/>
+  <rect x="100" y="0" width="100" height="100" fill="blue"/>
+</svg>
+'''
+
+
+@pytest.fixture(scope='session')
+def qt_application():
+    return QApplication.instance() or QApplication()
+
+
+@pytest.fixture
+def svg_path(tmp_path):
+    path = tmp_path / 'art.svg'
+    path.write_text(SVG_SOURCE)
+    return str(path)
+
+
+def get_colour(image: QImage, x: int, y: int) -> str:
+    return QColor(image.pixel(x, y)).name()
+
+
+def test_is_vector_path():
+    assert is_vector_path('drawing.svg')
+    assert is_vector_path('drawing.SVGZ')
+    assert not is_vector_path('photo.png')
+
+
+def test_load_svg(qt_application, svg_path):
+    source = SvgArtSource.load(svg_path)
+
+    assert source.size() == QSize(2048, 1024)
+
+
+def test_load_bad_svg(qt_application, tmp_path):
+    path = tmp_path / 'bad.svg'
+    path.write_text('not an SVG')
+
+    source = SvgArtSource.load(str(path))
+
+    assert source is None
+
+
+def test_svg_scaled(qt_application, svg_path):
+    source = SvgArtSource.load(svg_path)
+
+    pixmap = source.scaled(QSize(100, 100))
+
+    image = pixmap.toImage()
+    assert pixmap.size() == QSize(100, 50)
+    assert get_colour(image, 10, 25) == '#ff0000'
+    assert get_colour(image, 90, 25) == '#0000ff'
+
+
+def test_svg_level_for(qt_application, svg_path):
+    source = SvgArtSource.load(svg_path)
+
+    pixmap = source.level_for(QSize(100, 100))
+
+    assert pixmap.size() == QSize(200, 100)
+
+
+def test_svg_crop(qt_application, svg_path):
+    source = SvgArtSource.load(svg_path)
+
+    art = source.crop(0.25, 0.0, 0.5, 1.0)
+
+    assert isinstance(art, VectorArt)
+    assert art.size() == QSize(1024, 1024)
+    assert art.source == QRectF(50, 0, 100, 100)
+
+
+def test_vector_copy(qt_application, svg_path):
+    art = SvgArtSource.load(svg_path).crop(0.5, 0.0, 0.5, 1.0)
+
+    tile = art.copy(512, 256, 512, 768)
+
+    assert tile.size() == QSize(512, 768)
+    assert tile.source == QRectF(150, 25, 50, 75)
+
+
+def test_vector_scaled_renders_section(qt_application, svg_path):
+    art = SvgArtSource.load(svg_path).crop(0.25, 0.0, 0.5, 1.0)
+
+    image = art.scaled(QSize(80, 60)).toImage()
+
+    assert image.size() == QSize(60, 60)
+    assert get_colour(image, 2, 30) == '#ff0000'
+    assert get_colour(image, 57, 30) == '#0000ff'
+
+
+def test_vector_scaled_ignore_aspect(qt_application, svg_path):
+    art = SvgArtSource.load(svg_path).crop(0.0, 0.0, 1.0, 1.0)
+
+    pixmap = art.scaled(30, 40, Qt.AspectRatioMode.IgnoreAspectRatio)
+
+    assert pixmap.size() == QSize(30, 40)
+
+
+def test_vector_draw_clips(qt_application, svg_path):
+    art = SvgArtSource.load(svg_path).crop(0.5, 0.0, 0.5, 1.0)
+    image = QImage(100, 100, QImage.Format.Format_RGB32)
+    image.fill(QColor('white'))
+
+    painter = QPainter(image)
+    art.draw(painter, QRectF(25, 25, 50, 50))
+    painter.end()
+
+    assert get_colour(image, 20, 50) == '#ffffff'
+    assert get_colour(image, 30, 50) == '#0000ff'
+    assert get_colour(image, 80, 50) == '#ffffff'
+    assert get_colour(image, 50, 80) == '#ffffff'
+
+
+def test_vector_cache_key(qt_application, svg_path):
+    source = SvgArtSource.load(svg_path)
+
+    key1 = source.crop(0, 0, 0.5, 1).cacheKey()
+    key2 = source.crop(0, 0, 0.5, 1).cacheKey()
+    key3 = source.crop(0.5, 0, 0.5, 1).cacheKey()
+
+    assert key1 == key2
+    assert key1 != key3
+
+
+def test_raster_crop(qt_application):
+    pixmap = QPixmap(200, 100)
+    pixmap.fill(QColor('green'))
+    source = RasterArtSource(pixmap)
+
+    full_art = source.crop(0, 0, 1, 1)
+    art = source.crop(0.5, 0.25, 0.5, 0.5)
+
+    assert full_art is pixmap
+    assert art.size() == QSize(100, 50)
+    assert source.size() == QSize(200, 100)
+    assert source.cache_key == pixmap.cacheKey()
+
+
+def test_pdf_stays_vector(qt_application, svg_path, tmp_path):
+    pdf_path = tmp_path / 'puzzle.pdf'
+    art = SvgArtSource.load(svg_path).crop(0, 0, 1, 1)
+    writer = QPdfWriter(str(pdf_path))
+    puzzle_painter = PuzzlePainter(writer, share_tiles=True)
+
+    puzzle_painter.write(Puzzle(art, 2, 3, is_shuffled=True))
+
+    assert b'/Subtype /Image' not in pdf_path.read_bytes()
+
+
+def write_shapes_pdf(pdf_path, svg_path, size: int) -> int:
+    random = Random(0)
+    shapes = ''.join(
+        f'<path d="M{random.uniform(0, 1000):.1f},'
+        f'{random.uniform(0, 1000):.1f} l30,10 l-10,30 z" '
+        f'fill="#{random.randrange(0x1000000):06x}" stroke="black"/>'
+        for _ in range(300))
+    svg_path.write_text(f'''\
+<svg xmlns="http://www.w3.org/2000/svg" width="1000" height="1000">
+  {shapes}
+</svg>
+''')
+    art = SvgArtSource.load(str(svg_path)).crop(0, 0, 1, 1)
+    writer = QPdfWriter(str(pdf_path))
+    puzzle_painter = PuzzlePainter(writer, share_tiles=True)
+
+    puzzle_painter.write(Puzzle(art, size, size, is_shuffled=True))
+    return pdf_path.stat().st_size
+
+
+def test_pdf_size_with_grid(qt_application, tmp_path):
+    small_size = write_shapes_pdf(tmp_path / 'small.pdf',
+                                  tmp_path / 'art.svg',
+                                  2)
+    large_size = write_shapes_pdf(tmp_path / 'large.pdf',
+                                  tmp_path / 'art.svg',
+                                  8)
+
+    # Each tile only draws its own shapes, not the whole drawing clipped.
+    assert large_size < small_size * 2
+
+
+def test_vector_draw_ignores_painter_font(qt_application, tmp_path):
+    path = tmp_path / 'text.svg'
+    path.write_text('''\
+<svg xmlns="http://www.w3.org/2000/svg" width="100" height="100">
+  <text x="0" y="90" font-size="90">W</text>
+</svg>
+''')
+    art = SvgArtSource.load(str(path)).crop(0, 0, 1, 1)
+    image = QImage(100, 100, QImage.Format.Format_RGB32)
+    image.fill(QColor('white'))
+
+    painter = QPainter(image)
+    font = painter.font()
+    font.setPixelSize(5)
+    painter.setFont(font)
+    art.draw(painter, QRectF(image.rect()))
+    assert painter.font().pixelSize() == 5
+    painter.end()
+
+    black_count = sum(QColor(image.pixel(x, y)).lightness() < 128
+                      for x in range(100)
+                      for y in range(100))
+    assert black_count > 500
@@ -0,0 +1,116 @@
+import pytest
+from PySide6.QtCore import QRect
+from PySide6.QtGui import QImage, QColor, QPainter
+
+from sliced_art.auto_frame import find_content_bounds, suggest_frame
+
+
+def make_image(width: int,
+               height: int,
+               content: QRect = None,
+               is_transparent: bool = False) -> QImage:
+    image = QImage(width, height, QImage.Format.Format_ARGB32)
+    image.fill(QColor('transparent' if is_transparent else 'white'))
+    if content is not None:
+        painter = QPainter(image)
+        painter.fillRect(content, QColor('darkblue'))
+        painter.end()
+    return image
+
+
+def test_find_content_bounds():
+    image = make_image(100, 80, QRect(10, 20, 30, 40))
+
+    bounds = find_content_bounds(image)
+
+    assert bounds == (10, 20, 40, 60)
+
+
+def test_find_content_bounds_blank():
+    image = make_image(100, 80)
+
+    bounds = find_content_bounds(image)
+
+    assert bounds is None
+
+
+def test_find_content_bounds_dark_background():
+    image = make_image(100, 80)
+    image.fill(QColor('black'))
+    painter = QPainter(image)
+    painter.fillRect(QRect(50, 5, 10, 10), QColor('white'))
+    painter.end()
+
+    bounds = find_content_bounds(image)
+
+    assert bounds == (50, 5, 60, 15)
+
+
+def test_find_content_bounds_transparent():
+    image = make_image(100, 80, QRect(0, 70, 5, 10), is_transparent=True)
+
+    bounds = find_content_bounds(image)
+
+    assert bounds == (0, 70, 5, 80)
+
+
+def test_find_content_bounds_tolerance():
+    image = make_image(100, 80)
+    painter = QPainter(image)
+    painter.fillRect(QRect(10, 10, 10, 10), QColor(240, 240, 240))
+    painter.fillRect(QRect(60, 50, 10, 10), QColor(128, 128, 128))
+    painter.end()
+
+    bounds = find_content_bounds(image)
+
+    assert bounds == (60, 50, 70, 60)
+
+
+def test_suggest_frame_square():
+    image = make_image(100, 100, QRect(20, 40, 40, 20))
+
+    frame = suggest_frame(image, rows=4, cols=4, margin=0)
+
+    assert frame == pytest.approx((0.2, 0.3, 0.4, 0.4))
+
+
+def test_suggest_frame_tall_grid():
+    image = make_image(200, 100, QRect(80, 40, 40, 20))
+
+    frame = suggest_frame(image, rows=6, cols=3, margin=0)
+
+    # 40 pixels wide needs 80 high for square cells.
+    assert frame == pytest.approx((0.4, 0.1, 0.2, 0.8))
+
+
+def test_suggest_frame_margin():
+    image = make_image(100, 100, QRect(40, 40, 20, 20))
+
+    frame = suggest_frame(image, rows=2, cols=2, margin=0.1)
+
+    assert frame == pytest.approx((0.3, 0.3, 0.4, 0.4))
+
+
+def test_suggest_frame_shifted_inside():
+    image = make_image(100, 100, QRect(0, 0, 20, 10))
+
+    frame = suggest_frame(image, rows=2, cols=2, margin=0)
+
+    assert frame == pytest.approx((0.0, 0.0, 0.2, 0.2))
+
+
+def test_suggest_frame_clamped():
+    image = make_image(100, 50, QRect(10, 10, 80, 30))
+
+    frame = suggest_frame(image, rows=4, cols=1, margin=0)
+
+    # Square cells need 320 pixels high, so take the whole height.
+    assert frame == pytest.approx((0.1, 0.0, 0.8, 1.0))
+
+
+def test_suggest_frame_blank():
+    image = make_image(100, 100)
+
+    frame = suggest_frame(image, rows=2, cols=2)
+
+    assert frame == pytest.approx((0.0, 0.0, 1.0, 1.0))
@@ -0,0 +1,97 @@
+import pytest
+from threading import Event
+
+from PySide6.QtCore import QCoreApplication
+from PySide6.QtWidgets import QApplication
+
+from sliced_art.background_loader import BackgroundLoader
+
+
+@pytest.fixture(scope='session')
+def qt_application():
+    return QApplication.instance() or QApplication()
+
+
+def finish(loader: BackgroundLoader):
+    loader.wait()
+    QCoreApplication.processEvents()
+
+
+def test_loaded(qt_application):
+    loader = BackgroundLoader()
+    results = []
+    loader.loaded.connect(lambda name, result: results.append((name, result)))
+
+    loader.start('answer', lambda: 42)
+    is_loading = loader.is_loading('answer')
+    finish(loader)
+
+    assert is_loading
+    assert not loader.is_loading('answer')
+    assert results == [('answer', 42)]
+
+
+def test_failed(qt_application):
+    loader = BackgroundLoader()
+    results = []
+    failures = []
+    loader.loaded.connect(lambda name, result: results.append((name, result)))
+    loader.failed.connect(lambda name, message: failures.append((name,
+                                                                 message)))
+
+    def load():
+        raise OSError('No such file.')
+
+    loader.start('words', load)
+    finish(loader)
+
+    assert not loader.is_loading('words')
+    assert results == []
+    assert failures == [('words', 'No such file.')]
+
+
+def test_several(qt_application):
+    loader = BackgroundLoader()
+    results = {}
+    loader.loaded.connect(results.__setitem__)
+
+    loader.start('art', lambda: 'picture')
+    loader.start('words', lambda: ['liar', 'rail'])
+    finish(loader)
+
+    assert results == dict(art='picture', words=['liar', 'rail'])
+
+
+def test_replaced(qt_application):
+    loader = BackgroundLoader()
+    results = []
+    loader.loaded.connect(lambda name, result: results.append((name, result)))
+    is_released = Event()
+
+    def load_old():
+        is_released.wait(5)
+        return 'old'
+
+    loader.start('words', load_old)
+    loader.start('words', lambda: 'new')
+    is_loading = loader.is_loading('words')
+    is_released.set()
+    finish(loader)
+
+    assert is_loading
+    assert not loader.is_loading('words')
+    assert results == [('words', 'new')]
+
+
+def test_cancel(qt_application):
+    loader = BackgroundLoader()
+    results = []
+    loader.loaded.connect(lambda name, result: results.append((name, result)))
+
+    loader.start('words', lambda: 'stale')
+    loader.cancel('words')
+    is_loading = loader.is_loading('words')
+    finish(loader)
+
+    assert not is_loading
+    assert results == []
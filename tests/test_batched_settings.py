@@ -0,0 +1,107 @@
+import pytest
+from PySide6.QtCore import QSettings
+from PySide6.QtWidgets import QApplication
+
+from sliced_art.batched_settings import BatchedSettings
+
+
+@pytest.fixture(scope='session')
+def qt_application():
+    return QApplication.instance() or QApplication()
+
+
+@pytest.fixture
+def ini_settings(tmp_path):
+    return QSettings(str(tmp_path / 'settings.ini'), QSettings.Format.IniFormat)
+
+
+class CountingSettings:
+    def __init__(self):
+        self.values = {}
+        self.write_count = 0
+        self.sync_count = 0
+
+    def value(self, key, default=None, value_type=None):
+        value = self.values.get(key, default)
+        if value_type is not None and value is not None:
+            value = value_type(value)
+        return value
+
+    def setValue(self, key, value):
+        self.values[key] = value
+        self.write_count += 1
+
+    def sync(self):
+        self.sync_count += 1
+
+
+def test_write_delayed(qt_application, ini_settings):
+    settings = BatchedSettings(ini_settings)
+
+    settings.setValue('x', 0.25)
+
+    assert settings.value('x') == 0.25
+    assert not ini_settings.contains('x')
+
+
+def test_flush(qt_application, ini_settings):
+    settings = BatchedSettings(ini_settings)
+    settings.setValue('x', 0.25)
+    settings.setValue('word_A', 'alpha')
+
+    settings.flush()
+
+    assert ini_settings.value('x', type=float) == 0.25
+    assert ini_settings.value('word_A') == 'alpha'
+    assert settings.value('x', 0.0, float) == 0.25
+
+
+def test_read_default(qt_application, ini_settings):
+    settings = BatchedSettings(ini_settings)
+
+    assert settings.value('row_count', 6, int) == 6
+
+
+def test_read_type(qt_application, ini_settings):
+    settings = BatchedSettings(ini_settings)
+    settings.setValue('row_count', '7')
+
+    assert settings.value('row_count', 6, int) == 7
+
+
+def test_coalesce(qt_application):
+    counting_settings = CountingSettings()
+    settings = BatchedSettings(counting_settings)
+
+    for i in range(10):
+        settings.setValue('x', i / 10)
+        settings.setValue('y', 0.5)
+    settings.flush()
+
+    assert counting_settings.values == dict(x=0.9, y=0.5)
+    assert counting_settings.write_count == 2
+    assert counting_settings.sync_count == 1
+
+
+def test_skip_unchanged(qt_application):
+    counting_settings = CountingSettings()
+    settings = BatchedSettings(counting_settings)
+    settings.setValue('x', 0.5)
+    settings.flush()
+
+    settings.setValue('x', 0.5)
+    settings.flush()
+
+    assert counting_settings.write_count == 1
+    assert counting_settings.sync_count == 1
+
+
+def test_values_includes_pending(qt_application):
+    counting_settings = CountingSettings()
+    counting_settings.values['word_A'] = 'apple'
+    settings = BatchedSettings(counting_settings)
+    settings.setValue('word_B', 'banana')
+
+    values = settings.values(['word_A', 'word_B', 'word_C'], '')
+
+    assert values == dict(word_A='apple', word_B='banana', word_C='')
@@ -0,0 +1,25 @@
+from sliced_art.cell_labels import make_label, make_labels
+
+
+def test_single_letters():
+    assert make_label(0) == 'A'
+    assert make_label(25) == 'Z'
+
+
+def test_two_letters():
+    assert make_label(26) == 'AA'
+    assert make_label(27) == 'AB'
+    assert make_label(51) == 'AZ'
+    assert make_label(52) == 'BA'
+    assert make_label(701) == 'ZZ'
+
+
+def test_three_letters():
+    assert make_label(702) == 'AAA'
+
+
+def test_make_labels_unique():
+    labels = make_labels(400)
+
+    assert labels[:3] == ['A', 'B', 'C']
+    assert len(set(labels)) == 400
@@ -0,0 +1,33 @@
+import pytest
+
+from sliced_art.clue_engine import ClueEngine, clue_engines
+from sliced_art.word_index import WordIndex
+from sliced_art.word_shuffler import WordShuffler
+from sliced_art.word_stripper import WordStripper
+
+
+def test_registered():
+    assert clue_engines[WordShuffler.name] is WordShuffler
+    assert clue_engines[WordStripper.name] is WordStripper
+
+
+def test_shared_word_index():
+    word_index = WordIndex('lots of words rail the liar sail lairs'.split())
+    word_shuffler = WordShuffler(word_index)
+    word_stripper = WordStripper(word_index)
+
+    word_shuffler['a'] = 'liar'
+    word_stripper['s'] = 'lairs'
+
+    assert word_shuffler.word_index is word_stripper.word_index
+    assert word_shuffler.make_display('a') == 'liAr - raIl'
+    assert word_stripper.make_display('s') == 'rail+S, liar+S -- sail+R'
+
+
+def test_missing_override():
+    class PartialEngine(ClueEngine):
+        def __setitem__(self, letter: str, word: str):
+            pass
+
+    with pytest.raises(TypeError):
+        PartialEngine()
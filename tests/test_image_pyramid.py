@@ -0,0 +1,66 @@
+import pytest
+from PySide6.QtCore import QSize, Qt
+from PySide6.QtGui import QPixmap, QColor
+from PySide6.QtWidgets import QApplication
+
+from sliced_art.image_pyramid import ImagePyramid
+
+
+@pytest.fixture(scope='session')
+def qt_application():
+    return QApplication.instance() or QApplication()
+
+
+def make_pixmap(width: int, height: int) -> QPixmap:
+    pixmap = QPixmap(width, height)
+    pixmap.fill(QColor('green'))
+    return pixmap
+
+
+def test_level_for_original(qt_application):
+    pixmap = make_pixmap(1000, 800)
+    pyramid = ImagePyramid(pixmap)
+
+    level = pyramid.level_for(QSize(600, 400))
+
+    assert level is pixmap
+    assert len(pyramid.levels) == 1
+
+
+def test_level_for_smaller(qt_application):
+    pyramid = ImagePyramid(make_pixmap(1000, 800))
+
+    level = pyramid.level_for(QSize(200, 150))
+
+    assert level.size() == QSize(250, 200)
+    assert [level.size() for level in pyramid.levels] == [QSize(1000, 800),
+                                                          QSize(500, 400),
+                                                          QSize(250, 200)]
+
+
+def test_levels_reused(qt_application):
+    pyramid = ImagePyramid(make_pixmap(1000, 800))
+    level1 = pyramid.level_for(QSize(200, 150))
+
+    level2 = pyramid.level_for(QSize(220, 180))
+
+    assert level2 is level1
+    assert len(pyramid.levels) == 3
+
+
+def test_scaled(qt_application):
+    pixmap = make_pixmap(1000, 800)
+    pyramid = ImagePyramid(pixmap)
+
+    scaled = pyramid.scaled(QSize(300, 300))
+
+    assert scaled.size() == pixmap.scaled(300, 300, Qt.AspectRatioMode.KeepAspectRatio).size()
+    assert scaled.toImage().pixelColor(100, 100) == QColor('green')
+
+
+def test_scaled_exact_level(qt_application):
+    pyramid = ImagePyramid(make_pixmap(1000, 800))
+
+    scaled = pyramid.scaled(QSize(500, 500))
+
+    assert scaled is pyramid.levels[1]
@@ -0,0 +1,149 @@
+import os
+
+import pytest
+from PySide6.QtCore import QSize
+from PySide6.QtGui import QImage, QColor, QPainter
+
+from sliced_art.line_art import LineArtCache, to_line_art
+
+np = pytest.importorskip('numpy')
+
+
+def make_image(width: int, height: int, colour: str = 'white') -> QImage:
+    image = QImage(width, height, QImage.Format.Format_ARGB32)
+    image.fill(QColor(colour))
+    return image
+
+
+def test_threshold():
+    image = make_image(4, 2)
+    image.setPixelColor(1, 0, QColor('black'))
+    image.setPixelColor(2, 0, QColor(100, 100, 100))
+    image.setPixelColor(1, 1, QColor(200, 200, 200))
+
+    line_art = to_line_art(image, is_despeckled=False, is_trimmed=False)
+
+    assert line_art.format() == QImage.Format.Format_Mono
+    assert line_art.size() == QSize(4, 2)
+    assert line_art.pixelColor(0, 0) == QColor('white')
+    assert line_art.pixelColor(1, 0) == QColor('black')
+    assert line_art.pixelColor(2, 0) == QColor('black')
+    assert line_art.pixelColor(1, 1) == QColor('white')
+
+
+def test_transparent_is_white():
+    image = make_image(2, 1)
+    image.fill(QColor(0, 0, 0, 0))
+    image.setPixelColor(1, 0, QColor('black'))
+
+    line_art = to_line_art(image, is_despeckled=False, is_trimmed=False)
+
+    assert line_art.pixelColor(0, 0) == QColor('white')
+    assert line_art.pixelColor(1, 0) == QColor('black')
+
+
+def test_despeckle():
+    image = make_image(9, 9)
+    image.setPixelColor(1, 1, QColor('black'))  # lone speck
+    painter = QPainter(image)
+    painter.fillRect(4, 4, 4, 4, QColor('black'))
+    painter.end()
+    image.setPixelColor(5, 5, QColor('white'))  # pin hole
+
+    line_art = to_line_art(image, is_trimmed=False)
+
+    assert line_art.pixelColor(1, 1) == QColor('white')
+    assert line_art.pixelColor(5, 5) == QColor('black')
+    assert line_art.pixelColor(4, 4) == QColor('black')
+
+
+def test_trim():
+    image = make_image(20, 10)
+    painter = QPainter(image)
+    painter.fillRect(3, 2, 5, 4, QColor('black'))
+    painter.end()
+
+    line_art = to_line_art(image, is_trimmed=True)
+
+    assert line_art.size() == QSize(5, 4)
+
+
+def test_trim_blank():
+    image = make_image(20, 10)
+
+    line_art = to_line_art(image, is_trimmed=True)
+
+    assert line_art.size() == QSize(20, 10)
+
+
+def test_cache_keeps_size(tmp_path):
+    """ Selections are saved as fractions, so the size must match. """
+    image_path = str(tmp_path / 'art.png')
+    image = make_image(20, 10)
+    painter = QPainter(image)
+    painter.fillRect(3, 2, 5, 4, QColor('black'))
+    painter.end()
+    image.save(image_path)
+    cache = LineArtCache()
+
+    line_art = cache.get(image_path)
+
+    assert line_art.size() == QSize(20, 10)
+    assert line_art.pixelColor(3, 2) == QColor('black')
+
+
+def test_wide_image_rows_line_up():
+    image = make_image(37, 3)
+    for y in range(3):
+        image.setPixelColor(36 - y, y, QColor('black'))
+
+    line_art = to_line_art(image, is_despeckled=False, is_trimmed=False)
+
+    assert [line_art.pixelColor(36 - y, y) for y in range(3)] == [
+        QColor('black')] * 3
+    assert line_art.pixelColor(35, 0) == QColor('white')
+
+
+def test_cache_reuses_image(tmp_path):
+    image_path = str(tmp_path / 'art.png')
+    make_image(10, 10, 'black').save(image_path)
+    cache = LineArtCache()
+
+    line_art1 = cache.get(image_path)
+    line_art2 = cache.get(image_path)
+
+    assert line_art1.cacheKey() == line_art2.cacheKey()
+
+
+def test_cache_reloads_changed_file(tmp_path):
+    image_path = str(tmp_path / 'art.png')
+    make_image(10, 10, 'black').save(image_path)
+    cache = LineArtCache()
+    line_art1 = cache.get(image_path)
+    make_image(12, 10, 'black').save(image_path)
+    os.utime(image_path, ns=(0, 0))
+
+    line_art2 = cache.get(image_path)
+
+    assert line_art1.size() == QSize(10, 10)
+    assert line_art2.size() == QSize(12, 10)
+
+
+def test_cache_limit(tmp_path):
+    image_paths = []
+    for i in range(3):
+        image_path = str(tmp_path / f'art{i}.png')
+        make_image(10, 10, 'black').save(image_path)
+        image_paths.append(image_path)
+    cache = LineArtCache(max_count=2)
+
+    for image_path in image_paths:
+        cache.get(image_path)
+
+    assert [key[0] for key in cache.images] == image_paths[1:]
+
+
+def test_cache_missing_file(tmp_path):
+    cache = LineArtCache()
+
+    assert cache.get(str(tmp_path / 'missing.png')) is None
@@ -0,0 +1,44 @@
+import pytest
+from PySide6.QtGui import QImage, QColor
+from PySide6.QtWidgets import QApplication
+
+from sliced_art.png_writer import PngWriter
+
+
+@pytest.fixture(scope='session')
+def qt_application():
+    return QApplication.instance() or QApplication()
+
+
+def test_write_bands(qt_application, tmp_path):
+    png_path = tmp_path / 'bands.png'
+    band = QImage(5, 4, QImage.Format.Format_RGB32)
+    with png_path.open('wb') as f:
+        png_writer = PngWriter(f, 5, 10)
+        band.fill(QColor('red'))
+        png_writer.write_band(band)
+        band.fill(QColor('blue'))
+        png_writer.write_band(band)
+        band.fill(QColor('green'))
+        png_writer.write_band(band, 2)
+        png_writer.close()
+
+    image = QImage(str(png_path))
+
+    assert image.width() == 5
+    assert image.height() == 10
+    assert image.pixelColor(0, 0) == QColor('red')
+    assert image.pixelColor(4, 3) == QColor('red')
+    assert image.pixelColor(2, 4) == QColor('blue')
+    assert image.pixelColor(2, 8) == QColor('green')
+    assert image.pixelColor(4, 9) == QColor('green')
+
+
+def test_too_many_rows(qt_application, tmp_path):
+    band = QImage(5, 4, QImage.Format.Format_RGB32)
+    with (tmp_path / 'bands.png').open('wb') as f:
+        png_writer = PngWriter(f, 5, 6)
+        png_writer.write_band(band)
+
+        with pytest.raises(AssertionError):
+            png_writer.write_band(band)
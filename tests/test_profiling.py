@@ -0,0 +1,93 @@
+from threading import Thread
+
+import sliced_art.profiling
+from sliced_art.profiling import Profiler, timed, span, create_profiler, \
+    PROFILE_VARIABLE
+
+
+def test_percentiles():
+    profiler = Profiler()
+    for duration in range(1, 101):
+        profiler.add('draw', duration / 1000)
+
+    assert profiler.get_percentile('draw', 50) == 0.051
+    assert profiler.get_percentile('draw', 95) == 0.095
+    assert profiler.counts['draw'] == 100
+
+
+def test_max_samples():
+    profiler = Profiler(max_samples=3)
+    for duration in (10, 1, 2, 3):
+        profiler.add('draw', duration)
+
+    assert list(profiler.durations['draw']) == [1, 2, 3]
+    assert profiler.counts['draw'] == 4
+
+
+def test_report():
+    profiler = Profiler()
+    profiler.add('fast', 0.001)
+    profiler.add('slow', 0.25)
+    profiler.add('slow', 0.5)
+    expected_report = '''\
+slow: p50 250.0 ms, p95 500.0 ms, 2 calls
+fast: p50 1.0 ms, p95 1.0 ms, 1 calls'''
+
+    report = profiler.report()
+
+    assert report == expected_report
+
+
+def test_report_while_adding():
+    profiler = Profiler(max_samples=10)
+
+    def add_spans(thread_index: int):
+        for i in range(2000):
+            profiler.add(f'span{thread_index}.{i % 50}', i / 1000)
+
+    threads = [Thread(target=add_spans, args=(i,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    while any(thread.is_alive() for thread in threads):
+        profiler.report()
+    for thread in threads:
+        thread.join()
+
+    assert len(profiler.report().splitlines()) == 200
+    assert sum(profiler.counts.values()) == 8000
+
+
+def test_create_profiler(monkeypatch):
+    monkeypatch.delenv(PROFILE_VARIABLE, raising=False)
+    assert create_profiler() is None
+
+    monkeypatch.setenv(PROFILE_VARIABLE, '0')
+    assert create_profiler() is None
+
+    monkeypatch.setenv(PROFILE_VARIABLE, '1')
+    assert isinstance(create_profiler(), Profiler)
+
+
+def test_timed_disabled(monkeypatch):
+    monkeypatch.setattr(sliced_art.profiling, 'profiler', None)
+
+    def draw():
+        return 42
+
+    assert timed('draw')(draw) is draw
+
+
+def test_timed_enabled(monkeypatch):
+    profiler = Profiler()
+    monkeypatch.setattr(sliced_art.profiling, 'profiler', profiler)
+
+    @timed('draw')
+    def draw(x):
+        return x + 1
+
+    result = draw(41)
+    with span('block'):
+        pass
+
+    assert result == 42
+    assert profiler.counts == dict(draw=1, block=1)
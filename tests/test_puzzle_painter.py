@@ -0,0 +1,145 @@
+import pytest
+from PySide6.QtCore import QSize
+from PySide6.QtGui import QPixmap, QPdfWriter, QColor, QPainter, QImage
+from PySide6.QtWidgets import QApplication
+
+from sliced_art.puzzle_painter import Puzzle, PuzzlePainter, downsample, \
+    make_symbol_clues, write_png
+
+
+@pytest.fixture(scope='session')
+def qt_application():
+    return QApplication.instance() or QApplication()
+
+
+def make_art(width: int = 100, height: int = 100) -> QPixmap:
+    art = QPixmap(width, height)
+    art.fill(QColor('white'))
+    painter = QPainter(art)
+    painter.fillRect(0, 0, width // 2, height, QColor('green'))
+    painter.end()
+    return art
+
+
+def count_pages(pdf_path) -> int:
+    return pdf_path.read_bytes().count(b'/Type /Page\n')
+
+
+def test_write_booklet(qt_application, tmp_path):
+    pdf_path = tmp_path / 'booklet.pdf'
+    loaded = []
+
+    def generate_puzzles():
+        for i in range(3):
+            loaded.append(i)
+            yield Puzzle(make_art(), 2, 3, is_shuffled=True)
+
+    writer = QPdfWriter(str(pdf_path))
+    puzzle_painter = PuzzlePainter(writer, share_tiles=True)
+
+    page_count = puzzle_painter.write_booklet(generate_puzzles())
+    del writer
+
+    assert page_count == 3
+    assert loaded == [0, 1, 2]
+    assert count_pages(pdf_path) == 3
+    assert list(puzzle_painter.shufflers) == [(2, 3)]
+
+
+def test_write_booklet_sizes(qt_application, tmp_path):
+    pdf_path = tmp_path / 'booklet.pdf'
+    art = make_art()
+    row_clues, column_clues = make_symbol_clues(art, 2, 2)
+    puzzles = [Puzzle(art, 2, 3),
+               Puzzle(art, 2, 2, row_clues=row_clues, column_clues=column_clues),
+               Puzzle(art, 2, 3, clues={'a': 'ALPHA'}, is_shuffled=True)]
+
+    writer = QPdfWriter(str(pdf_path))
+    puzzle_painter = PuzzlePainter(writer)
+
+    page_count = puzzle_painter.write_booklet(puzzles)
+    del writer
+
+    assert page_count == 3
+    assert count_pages(pdf_path) == 3
+    assert sorted(puzzle_painter.shufflers) == [(2, 2), (2, 3)]
+
+
+def test_write_keeps_cells(qt_application, tmp_path):
+    cells = [(0, 1, 'B'), (0, 0, 'A')]
+    writer = QPdfWriter(str(tmp_path / 'puzzle.pdf'))
+    puzzle_painter = PuzzlePainter(writer)
+
+    puzzle_painter.write(Puzzle(make_art(), 1, 2, cells, is_shuffled=True))
+
+    shuffler = puzzle_painter.shufflers[(1, 2)]
+    assert shuffler.cells == cells
+    assert shuffler.is_shuffled
+
+
+def test_make_symbol_clues(qt_application):
+    art = make_art(90, 60)
+
+    row_clues, column_clues = make_symbol_clues(art, 2, 3)
+
+    assert [clue.size() for clue in row_clues] == [QSize(30, 30)] * 2
+    assert [clue.size() for clue in column_clues] == [QSize(30, 30)] * 3
+
+
+def test_downsample(qt_application):
+    art = make_art(200, 100)
+
+    assert downsample(art, QSize(300, 300)) is art
+    assert downsample(art, QSize(50, 50)).size() == QSize(50, 25)
+
+
+def test_write_png(qt_application, tmp_path):
+    png_path = tmp_path / 'puzzle.png'
+    art = make_art()
+    expected = QImage(200, 400, QImage.Format.Format_RGB32)
+    expected.fill(QColor('white'))
+    painter = QPainter(expected)
+    PuzzlePainter(expected,
+                  share_tiles=True,
+                  is_pixel_aligned=True).paint(Puzzle(art, 2, 3), painter)
+    painter.end()
+
+    write_png(str(png_path), Puzzle(art, 2, 3), QSize(200, 400), band_height=30)
+    actual = QImage(str(png_path))
+
+    assert actual.size() == QSize(200, 400)
+    assert actual.convertToFormat(QImage.Format.Format_RGB32) == expected
+
+
+def test_large_png_keeps_art_size(qt_application):
+    art = make_art(40, 40)
+    row_clues, column_clues = make_symbol_clues(art, 2, 2)
+    band = QImage(2000, 50, QImage.Format.Format_RGB32)
+    puzzle_painter = PuzzlePainter(band,
+                                   share_tiles=True,
+                                   page_size=QSize(2000, 4000),
+                                   is_pixel_aligned=True)
+    puzzle = Puzzle(art,
+                    2,
+                    2,
+                    is_shuffled=True,
+                    row_clues=row_clues,
+                    column_clues=column_clues)
+    shuffler, prepared_art = puzzle_painter.prepare(puzzle)
+    shuffler.selected_row = 0
+
+    painter = QPainter(band)
+    puzzle_painter.paint_prepared(shuffler, prepared_art, painter)
+    painter.end()
+
+    # Poster-sized pieces would hold far more pixels than the art has.
+    tiles = [tile
+             for size_tiles in shuffler.tiles.values()
+             for row_tiles in size_tiles
+             for tile in row_tiles]
+    clues = [clue
+             for symbol_clues in shuffler.symbol_clues.values()
+             for clue in symbol_clues.row_clues + symbol_clues.column_clues]
+    assert tiles
+    assert clues
+    assert max(tile.width() for tile in tiles + clues) <= 20
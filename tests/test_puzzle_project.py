@@ -0,0 +1,109 @@
+import json
+from zipfile import ZipFile
+
+import pytest
+from PySide6.QtGui import QImage, QColor
+from PySide6.QtWidgets import QApplication
+
+from sliced_art.puzzle_project import PuzzleProject
+
+
+@pytest.fixture(scope='session')
+def qt_application():
+    return QApplication.instance() or QApplication()
+
+
+def test_round_trip(qt_application, tmp_path):
+    file_name = str(tmp_path / 'puzzle.sliced')
+    preview = QImage(40, 30, QImage.Format.Format_RGB32)
+    preview.fill(QColor('green'))
+    project = PuzzleProject(image_path='art.png',
+                            words_path='words.txt',
+                            selection=(0.1, 0.2, 0.5, 0.6),
+                            rows=1,
+                            cols=2,
+                            clue_type='symbols',
+                            clue_engine='stripped',
+                            is_line_art=True,
+                            words=dict(A='apple', B='Bat'),
+                            cells=[(0, 1, 'B'), (0, 0, 'A')],
+                            is_shuffled=True,
+                            clues=dict(a='(_)_ _ _ _\nPLEPA'),
+                            preview=preview)
+
+    project.save(file_name)
+    loaded = PuzzleProject.load(file_name)
+
+    assert loaded.image_path == 'art.png'
+    assert loaded.words_path == 'words.txt'
+    assert loaded.selection == (0.1, 0.2, 0.5, 0.6)
+    assert (loaded.rows, loaded.cols) == (1, 2)
+    assert loaded.clue_type == 'symbols'
+    assert loaded.clue_engine == 'stripped'
+    assert loaded.is_line_art
+    assert loaded.words == dict(A='apple', B='Bat')
+    assert loaded.cells == [(0, 1, 'B'), (0, 0, 'A')]
+    assert loaded.is_shuffled
+    assert loaded.clues == dict(a='(_)_ _ _ _\nPLEPA')
+    assert loaded.preview.size() == preview.size()
+    assert loaded.preview.pixelColor(5, 5) == QColor('green')
+
+
+def test_no_preview(tmp_path):
+    file_name = str(tmp_path / 'puzzle.sliced')
+    PuzzleProject(image_path='art.png').save(file_name)
+
+    loaded = PuzzleProject.load(file_name)
+
+    assert loaded.image_path == 'art.png'
+    assert loaded.cells is None
+    assert loaded.clues is None
+    assert loaded.preview is None
+
+
+def test_unknown_version(tmp_path):
+    file_name = str(tmp_path / 'puzzle.sliced')
+    with ZipFile(file_name, 'w') as project_zip:
+        project_zip.writestr(PuzzleProject.SETTINGS_NAME,
+                             json.dumps(dict(version=99)))
+
+    with pytest.raises(ValueError, match='Unknown puzzle file version: 99.'):
+        PuzzleProject.load(file_name)
+
+
+def test_unknown_and_missing_keys(tmp_path):
+    file_name = str(tmp_path / 'puzzle.sliced')
+    with ZipFile(file_name, 'w') as project_zip:
+        project_zip.writestr(PuzzleProject.SETTINGS_NAME,
+                             json.dumps(dict(version=1,
+                                             image_path='art.png',
+                                             rows=3,
+                                             from_the_future=True)))
+
+    loaded = PuzzleProject.load(file_name)
+
+    assert loaded.image_path == 'art.png'
+    assert loaded.rows == 3
+    assert loaded.cols == 4
+    assert not loaded.is_line_art
+    assert not hasattr(loaded, 'from_the_future')
+
+
+def test_settings_not_object(tmp_path):
+    file_name = str(tmp_path / 'puzzle.sliced')
+    with ZipFile(file_name, 'w') as project_zip:
+        project_zip.writestr(PuzzleProject.SETTINGS_NAME, json.dumps([1]))
+
+    with pytest.raises(ValueError, match='not a JSON object'):
+        PuzzleProject.load(file_name)
+
+
+def test_make_preview(qt_application):
+    image = QImage(2000, 1000, QImage.Format.Format_RGB32)
+    small_image = QImage(100, 50, QImage.Format.Format_RGB32)
+
+    preview = PuzzleProject.make_preview(image)
+
+    assert preview.width() == PuzzleProject.PREVIEW_SIZE
+    assert preview.height() == PuzzleProject.PREVIEW_SIZE // 2
+    assert PuzzleProject.make_preview(small_image) is small_image
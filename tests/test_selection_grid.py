@@ -0,0 +1,141 @@
+import typing
+
+import pytest
+from PySide6.QtCore import QEvent, QPointF
+from PySide6.QtTest import QTest
+from PySide6.QtWidgets import QApplication, QGraphicsScene, \
+    QGraphicsSceneMouseEvent
+
+from sliced_art.selection_grid import SelectionGrid
+
+
+@pytest.fixture(scope='session')
+def qt_application():
+    return QApplication.instance() or QApplication()
+
+
+def make_mouse_event(event_type: QEvent.Type,
+                     x: float,
+                     y: float) -> QGraphicsSceneMouseEvent:
+    event = QGraphicsSceneMouseEvent(event_type)
+    event.setPos(QPointF(x, y))
+    return event
+
+
+def start_drag(scene: QGraphicsScene) -> typing.Tuple[SelectionGrid, list]:
+    grid = SelectionGrid(0, 0, 100, 60)
+    scene.addItem(grid)
+    moves = []
+    grid.on_moved = lambda: moves.append(grid.rect().x())
+    grid.mousePressEvent(
+        make_mouse_event(QEvent.Type.GraphicsSceneMousePress, 50, 30))
+    for x in (51, 52, 53):
+        grid.mouseMoveEvent(
+            make_mouse_event(QEvent.Type.GraphicsSceneMouseMove, x, 30))
+    return grid, moves
+
+
+def scan_handles(grid: SelectionGrid, point: QPointF):
+    """ Find a handle the way handle_at() used to, by checking each one. """
+    for handle, rect in grid.handles.items():
+        if rect.contains(point):
+            return handle
+    return None
+
+
+@pytest.mark.parametrize('x, y, expected_handle', [
+    (-4, -4, SelectionGrid.HANDLE_TOP_LEFT),
+    (50, -2, SelectionGrid.HANDLE_TOP),
+    (104, -4, SelectionGrid.HANDLE_TOP_RIGHT),
+    (-2, 30, SelectionGrid.HANDLE_LEFT),
+    (102, 30, SelectionGrid.HANDLE_RIGHT),
+    (-4, 64, SelectionGrid.HANDLE_BOTTOM_LEFT),
+    (50, 62, SelectionGrid.HANDLE_BOTTOM),
+    (104, 64, SelectionGrid.HANDLE_BOTTOM_RIGHT),
+    (50, 30, None),
+    (20, 0, None),
+    (200, 30, None),
+    (50, -20, None)])
+def test_handle_at(qt_application, x, y, expected_handle):
+    grid = SelectionGrid(0, 0, 100, 60)
+    point = QPointF(x, y)
+
+    handle = grid.handle_at(point)
+
+    assert handle == expected_handle
+    assert handle == scan_handles(grid, point)
+
+
+@pytest.mark.parametrize('width, height', [(100, 60), (10, 6)])
+def test_handle_at_matches_scan(qt_application, width, height):
+    """ Check every point around the grid, including overlapping handles. """
+    grid = SelectionGrid(20, 10, width, height)
+    b = grid.boundingRect()
+
+    mismatches = []
+    for i in range(-4, round(b.width()) + 5):
+        for j in range(-4, round(b.height()) + 5):
+            point = QPointF(b.left() + i, b.top() + j)
+            if grid.handle_at(point) != scan_handles(grid, point):
+                mismatches.append(point.toTuple())
+
+    assert mismatches == []
+
+
+def test_grid_lines(qt_application):
+    grid = SelectionGrid(10, 20, 90, 60, row_count=2, column_count=3)
+
+    lines = grid.get_grid_lines()
+
+    assert [line.toTuple() for line in lines] == [
+        (10, 20, 100, 20),
+        (10, 50, 100, 50),
+        (10, 80, 100, 80),
+        (10, 20, 10, 80),
+        (40, 20, 40, 80),
+        (70, 20, 70, 80),
+        (100, 20, 100, 80)]
+
+
+def test_grid_lines_cached(qt_application):
+    grid = SelectionGrid(0, 0, 90, 60, row_count=2, column_count=3)
+
+    lines1 = grid.get_grid_lines()
+    lines2 = grid.get_grid_lines()
+    grid.setRect(0, 0, 120, 60)
+    lines3 = grid.get_grid_lines()
+    grid.row_count = 3
+    lines4 = grid.get_grid_lines()
+
+    assert lines2 is lines1
+    assert lines3 is not lines2
+    assert lines3[-1].x1() == 120
+    assert lines4 is not lines3
+    assert len(lines4) == 8
+    assert lines4[1].y1() == 20
+
+
+def test_moves_redrawn_once_per_frame(qt_application):
+    scene = QGraphicsScene(0, 0, 400, 300)
+    grid, moves = start_drag(scene)
+    moves_before_frame = moves[:]
+
+    QTest.qWait(grid.redraw_timer.interval() * 3)
+
+    assert moves_before_frame == []
+    assert moves == [3]
+    assert grid.is_dragging
+
+
+def test_release_flushes_redraw(qt_application):
+    scene = QGraphicsScene(0, 0, 400, 300)
+    grid, moves = start_drag(scene)
+
+    grid.mouseReleaseEvent(
+        make_mouse_event(QEvent.Type.GraphicsSceneMouseRelease, 53, 30))
+    moves_after_release = moves[:]
+    QTest.qWait(grid.redraw_timer.interval() * 3)
+
+    assert moves_after_release == [3]
+    assert moves == [3]
+    assert not grid.is_dragging
@@ -0,0 +1,86 @@
+import pytest
+from PySide6.QtCore import QSize
+from PySide6.QtGui import QImage, QColor
+from PySide6.QtWidgets import QApplication
+
+from sliced_art.shuffle_gallery import make_candidates, render_thumbnail, \
+    ShuffleGallery
+
+
+@pytest.fixture(scope='session')
+def qt_application():
+    return QApplication.instance() or QApplication()
+
+
+def make_home_cells(rows, cols):
+    return [(i, j, chr(65 + i*cols + j))
+            for i in range(rows)
+            for j in range(cols)]
+
+
+def test_make_candidates():
+    home_cells = make_home_cells(3, 4)
+
+    candidates = make_candidates(reversed(home_cells), 3, 4, 5)
+
+    assert len(candidates) == 5
+    for cells in candidates:
+        assert sorted(cells) == home_cells
+        assert cells != home_cells
+
+
+def test_make_candidates_not_optimized():
+    home_cells = make_home_cells(3, 4)
+
+    candidates = make_candidates(home_cells, 3, 4, 5, is_optimized=False)
+
+    assert len(candidates) == 5
+    for cells in candidates:
+        assert sorted(cells) == home_cells
+    assert candidates[0] is not candidates[1]
+
+
+def test_render_thumbnail(qt_application):
+    art = QImage(200, 100, QImage.Format.Format_ARGB32_Premultiplied)
+    art.fill(QColor('blue'))
+    cells = [(0, 1, 'B'), (0, 0, 'A')]
+
+    thumbnail = render_thumbnail(art, 1, 2, cells, QSize(120, 60))
+
+    assert thumbnail.size() == QSize(120, 60)
+    assert thumbnail.pixelColor(1, 1) == QColor('white')
+
+
+def test_render_thumbnail_order(qt_application):
+    art = QImage(200, 100, QImage.Format.Format_ARGB32_Premultiplied)
+    art.fill(QColor('red'))
+    for x in range(100, 200):
+        for y in range(100):
+            art.setPixelColor(x, y, QColor('blue'))
+    cells = [(0, 1, 'B'), (0, 0, 'A')]
+
+    thumbnail = render_thumbnail(art, 1, 2, cells, QSize(200, 100))
+
+    # Pieces take 60% of the space when shuffled, centred in each cell.
+    assert thumbnail.pixelColor(50, 50) == QColor('blue')
+    assert thumbnail.pixelColor(150, 50) == QColor('red')
+
+
+def test_gallery_picks_candidate(qt_application):
+    art = QImage(200, 200, QImage.Format.Format_ARGB32_Premultiplied)
+    art.fill(QColor('green'))
+    gallery = ShuffleGallery(art,
+                             make_home_cells(2, 3),
+                             2,
+                             3,
+                             QSize(60, 60),
+                             count=4)
+    gallery.thread_pool.waitForDone()
+    QApplication.processEvents()
+
+    gallery.thumbnail_list.setCurrentRow(2)
+    gallery.accept()
+
+    assert gallery.selected_cells == gallery.candidates[2]
+    assert all(not gallery.thumbnail_list.item(i).icon().isNull()
+               for i in range(4))
@@ -0,0 +1,90 @@
+from random import Random
+
+from sliced_art.shuffle_optimizer import ShuffleOptimizer
+
+
+def test_neighbours():
+    optimizer = ShuffleOptimizer(2, 3)
+
+    assert optimizer.neighbours == [[3, 1],
+                                    [4, 0, 2],
+                                    [5, 1],
+                                    [0, 4],
+                                    [1, 3, 5],
+                                    [2, 4]]
+
+
+def test_penalty_sorted():
+    optimizer = ShuffleOptimizer(2, 2)
+
+    # Every piece at home, and all 4 pairs of neighbours kept.
+    assert optimizer.get_penalty() == 4*10 + 4*4
+
+
+def test_penalty_reversed():
+    optimizer = ShuffleOptimizer(1, 3)
+    optimizer.order = [2, 1, 0]
+
+    # 1 at home, and both pairs of neighbours kept.
+    assert optimizer.get_penalty() == 10 + 2*4
+
+
+def test_penalty_scattered():
+    optimizer = ShuffleOptimizer(1, 4)
+    optimizer.order = [2, 0, 3, 1]
+
+    # 0 and 3 are beside their homes, and 2 and 0 were two steps apart, like
+    # 3 and 1. No neighbours are kept.
+    assert optimizer.get_penalty() == 2*1 + 2*1
+
+
+def test_penalty_spread():
+    optimizer = ShuffleOptimizer(1, 5)
+    optimizer.order = [0, 2, 4, 1, 3]
+
+    # 0 is at home, and 2 and 3 are beside their homes. 0 and 2 were two
+    # steps apart, like 2 and 4, and 1 and 3.
+    assert optimizer.get_penalty() == 10 + 2*1 + 3*1
+
+
+def test_optimize_is_permutation():
+    optimizer = ShuffleOptimizer(6, 4, Random(0))
+
+    order = optimizer.optimize()
+
+    assert sorted(order) == list(range(24))
+
+
+def test_optimize_large_grid():
+    optimizer = ShuffleOptimizer(12, 12, Random(0))
+
+    order = optimizer.optimize()
+
+    assert optimizer.get_penalty() == 0
+    assert all(piece != position for position, piece in enumerate(order))
+
+
+def test_optimize_small_grids():
+    for rows, cols in ((1, 1), (1, 2), (2, 2), (3, 3)):
+        optimizer = ShuffleOptimizer(rows, cols, Random(0))
+
+        order = optimizer.optimize()
+
+        assert sorted(order) == list(range(rows * cols))
+
+
+def test_local_penalty_matches_full_score():
+    random_source = Random(0)
+    optimizer = ShuffleOptimizer(5, 5, random_source)
+    order = optimizer.order
+    random_source.shuffle(order)
+    penalty = optimizer.get_penalty()
+
+    for _ in range(200):
+        position1, position2 = random_source.sample(range(25), 2)
+        old_penalty = optimizer.get_local_penalty(position1, position2)
+        order[position1], order[position2] = order[position2], order[position1]
+        new_penalty = optimizer.get_local_penalty(position1, position2)
+        penalty += new_penalty - old_penalty
+
+        assert penalty == optimizer.get_penalty()
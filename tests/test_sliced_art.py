@@ -0,0 +1,94 @@
+from pathlib import Path
+
+import pytest
+from PySide6.QtCore import QSettings
+from PySide6.QtWidgets import QApplication
+
+from sliced_art.sliced_art import MainWindow
+
+EXAMPLE_PATH = str(Path(__file__).parent.parent / 'example.png')
+
+
+@pytest.fixture(scope='session')
+def qt_application():
+    return QApplication.instance() or QApplication()
+
+
+@pytest.fixture
+def main_window(qt_application, tmp_path):
+    # Keep the user's real settings out of it.
+    QSettings.setDefaultFormat(QSettings.Format.IniFormat)
+    QSettings.setPath(QSettings.Format.IniFormat,
+                      QSettings.Scope.UserScope,
+                      str(tmp_path))
+    window = MainWindow()
+    yield window
+    window.close()
+    window.deleteLater()
+
+
+def show_symbols(window: MainWindow):
+    window.ui.symbol_clues_radio.setChecked(True)
+    window.ui.rows.setValue(5)
+    window.ui.columns.setValue(4)
+    window.load_image(EXAMPLE_PATH)
+    window.apply_options()
+    window.on_selection_moved()
+
+
+def test_redraw_reuses_symbol_clues(main_window):
+    show_symbols(main_window)
+    row_clues = list(main_window.row_clues)
+    column_clues = list(main_window.column_clues)
+    symbol_clues = list(main_window.symbols_shuffler.symbol_clues.values())
+
+    main_window.on_selection_moved()
+
+    assert len(row_clues) == 5
+    assert len(column_clues) == 4
+    assert all(clue1 is clue2
+               for clue1, clue2 in zip(row_clues, main_window.row_clues))
+    assert all(clue1 is clue2
+               for clue1, clue2 in zip(column_clues,
+                                       main_window.column_clues))
+    assert list(main_window.symbols_shuffler.symbol_clues.values()) == \
+        symbol_clues
+
+
+def test_moved_selection_makes_new_symbol_clues(main_window):
+    show_symbols(main_window)
+    row_clues = list(main_window.row_clues)
+    grid = main_window.selection_grid
+
+    grid.setRect(grid.rect().adjusted(5, 5, -5, -5))
+    main_window.on_selection_moved()
+
+    assert len(main_window.row_clues) == 5
+    assert not any(clue1 is clue2
+                   for clue1, clue2 in zip(row_clues, main_window.row_clues))
+
+
+def test_scatter_pieces_option(main_window):
+    show_symbols(main_window)
+    is_scattered_by_default = main_window.art_shuffler.is_optimized
+
+    main_window.ui.scatter_pieces.setChecked(False)
+
+    assert is_scattered_by_default
+    assert not main_window.art_shuffler.is_optimized
+    assert not main_window.settings.value('scatter_pieces', True, bool)
+
+
+def test_project_restores_line_art(main_window):
+    show_symbols(main_window)
+    main_window.ui.line_art.setChecked(True)
+    main_window.apply_options()
+    project = main_window.create_project()
+    main_window.ui.line_art.setChecked(False)
+    main_window.apply_options()
+
+    main_window.load_project(project)
+
+    assert project.is_line_art
+    assert main_window.ui.line_art.isChecked()
+    assert main_window.is_line_art
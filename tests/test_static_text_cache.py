@@ -0,0 +1,95 @@
+import pytest
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QColor, QFont, QImage, QPainter
+from PySide6.QtWidgets import QApplication
+
+from sliced_art.art_shuffler import ArtShuffler
+from sliced_art.static_text_cache import StaticTextCache, shared_text_cache
+
+
+@pytest.fixture(scope='session')
+def qt_application():
+    return QApplication.instance() or QApplication()
+
+
+def make_font(pixel_size: int) -> QFont:
+    font = QFont()
+    font.setPixelSize(pixel_size)
+    return font
+
+
+def draw_text(text: str,
+              height: int = None,
+              is_cached: bool = True) -> QImage:
+    image = QImage(120, 80, QImage.Format.Format_RGB32)
+    image.fill(QColor('white'))
+    painter = QPainter(image)
+    painter.setFont(make_font(14))
+    if is_cached:
+        StaticTextCache().draw(painter, 10, 5, 100, text, height)
+    elif height is None:
+        painter.drawText(10, 5, 100, 70, Qt.AlignmentFlag.AlignHCenter, text)
+    else:
+        painter.drawText(10, 5, 100, height, Qt.AlignmentFlag.AlignCenter, text)
+    painter.end()
+    return image
+
+
+def test_reuses_layout(qt_application):
+    cache = StaticTextCache()
+    font = make_font(12)
+
+    static_text1 = cache.get('cat\ndog', font, 50)
+    static_text2 = cache.get('cat\ndog', font, 50)
+
+    assert static_text1 is static_text2
+
+
+def test_keys(qt_application):
+    cache = StaticTextCache()
+    font = make_font(12)
+
+    static_text1 = cache.get('cat', font, 50)
+    static_text2 = cache.get('cat', font, 60)
+    static_text3 = cache.get('cat', make_font(13), 50)
+    static_text4 = cache.get('dog', font, 50)
+
+    assert len({id(static_text1),
+                id(static_text2),
+                id(static_text3),
+                id(static_text4)}) == 4
+
+
+def test_limit(qt_application):
+    cache = StaticTextCache(max_count=2)
+    font = make_font(12)
+
+    for text in ('a', 'b', 'a', 'c'):
+        cache.get(text, font, 50)
+
+    assert [key[0] for key in cache.texts] == ['a', 'c']
+
+
+def test_draw_lines(qt_application):
+    expected = draw_text('cat\nelephant', is_cached=False)
+
+    actual = draw_text('cat\nelephant')
+
+    assert actual == expected
+
+
+def test_draw_centred(qt_application):
+    expected = draw_text('Q', height=40, is_cached=False)
+
+    actual = draw_text('Q', height=40)
+
+    assert actual == expected
+
+
+def test_shared_by_shufflers(qt_application):
+    image = QImage(100, 100, QImage.Format.Format_RGB32)
+    shuffler1 = ArtShuffler(2, 2, image)
+    shuffler2 = ArtShuffler(3, 3, image)
+
+    assert shuffler1.text_cache is shared_text_cache
+    assert shuffler2.text_cache is shared_text_cache
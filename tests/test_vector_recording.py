@@ -0,0 +1,103 @@
+import pytest
+from PySide6.QtCore import QByteArray, QRectF
+from PySide6.QtGui import QColor, QImage, QPainter
+from PySide6.QtSvg import QSvgRenderer
+from PySide6.QtWidgets import QApplication
+
+from sliced_art.vector_recording import VectorRecording, touches
+
+
+@pytest.fixture(scope='session')
+def qt_application():
+    return QApplication.instance() or QApplication()
+
+
+def record(svg_body: str) -> VectorRecording:
+    source = f'''\
+<svg xmlns="http://www.w3.org/2000/svg" width="100" height="100">
+  {svg_body}
+</svg>
+'''
+    renderer = QSvgRenderer(QByteArray(source.encode()))
+    assert renderer.isValid()
+    return VectorRecording(renderer)
+
+
+def draw(recording: VectorRecording, source: QRectF) -> QImage:
+    image = QImage(100, 100, QImage.Format.Format_RGB32)
+    image.fill(QColor('white'))
+    painter = QPainter(image)
+    recording.draw(painter, source, QRectF(image.rect()))
+    painter.end()
+    return image
+
+
+def get_colour(image: QImage, x: int, y: int) -> str:
+    return QColor(image.pixel(x, y)).name()
+
+
+def test_find_shapes(qt_application):
+    recording = record('''\
+<rect x="0" y="0" width="40" height="40" fill="red"/>
+<rect x="60" y="60" width="40" height="40" fill="blue"/>
+<rect x="30" y="30" width="40" height="40" fill="green"/>''')
+
+    shapes = recording.find_shapes(QRectF(0, 0, 20, 20))
+    all_shapes = recording.find_shapes(QRectF(0, 0, 100, 100))
+
+    assert len(shapes) == 1
+    assert len(all_shapes) == 3
+    assert [shape.bounds.x() for shape in all_shapes] == [0, 60, 30]
+
+
+def test_find_shapes_includes_stroke(qt_application):
+    recording = record('''\
+<rect x="10" y="10" width="30" height="30" fill="red"
+      stroke="black" stroke-width="20"/>''')
+
+    shapes = recording.find_shapes(QRectF(45, 10, 10, 10))
+
+    assert len(shapes) == 1
+
+
+def test_draw_section(qt_application):
+    recording = record('''\
+<rect x="0" y="0" width="50" height="100" fill="red"/>
+<rect x="50" y="0" width="50" height="100" fill="blue"/>''')
+
+    image = draw(recording, QRectF(25, 0, 50, 50))
+
+    assert get_colour(image, 10, 50) == '#ff0000'
+    assert get_colour(image, 90, 50) == '#0000ff'
+
+
+def test_draw_polyline(qt_application):
+    recording = record('''\
+<polyline points="0,50 50,50 50,100" fill="none"
+          stroke="green" stroke-width="10"/>''')
+
+    image = draw(recording, QRectF(0, 0, 100, 100))
+
+    assert get_colour(image, 25, 50) == '#008000'
+    assert get_colour(image, 50, 75) == '#008000'
+    assert get_colour(image, 75, 75) == '#ffffff'
+
+
+def test_draw_transformed(qt_application):
+    recording = record('''\
+<g transform="translate(50, 0)" opacity="0.5">
+  <rect x="0" y="0" width="50" height="50" fill="black"/>
+</g>''')
+
+    image = draw(recording, QRectF(0, 0, 100, 100))
+
+    assert get_colour(image, 25, 25) == '#ffffff'
+    assert get_colour(image, 75, 25) in ('#7f7f7f', '#808080')
+    assert get_colour(image, 75, 75) == '#ffffff'
+
+
+def test_touches():
+    line = QRectF(0, 50, 100, 0)
+
+    assert touches(line, QRectF(40, 40, 20, 20))
+    assert not touches(line, QRectF(40, 60, 20, 20))
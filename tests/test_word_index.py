@@ -0,0 +1,213 @@
+import gzip
+
+from sliced_art.word_index import WordIndex, get_word_index, WordStat, \
+    WordStats
+
+
+def test_words_stripped():
+    word_index = WordIndex(['liar\n', '  rail ', '\n', 'ice cream\n'])
+
+    assert word_index.words == ['liar', 'rail', 'ice cream']
+
+
+def test_anagrams():
+    word_index = WordIndex('Liar rail the lira'.split())
+
+    anagrams = word_index.anagrams
+
+    assert anagrams['ailr'] == ['liar', 'rail', 'lira']
+    assert anagrams['eht'] == ['the']
+
+
+def test_anagrams_without_spaces():
+    word_index = WordIndex(['ice cream\n'])
+
+    assert word_index.anagrams['acceeimr'] == ['icecream']
+
+
+def test_words_by_size():
+    word_index = WordIndex('rail the liar of'.split())
+
+    words_by_size = word_index.words_by_size
+
+    assert words_by_size[4] == ['rail', 'liar']
+    assert words_by_size[3] == ['the']
+    assert words_by_size[2] == ['of']
+
+
+def test_tables_built_once():
+    word_index = WordIndex('rail liar'.split())
+
+    assert word_index.anagrams_table is None
+    assert word_index.anagrams is word_index.anagrams
+    assert word_index.words_by_size_table is None
+    assert word_index.words_by_size is word_index.words_by_size
+
+
+def test_load(tmp_path):
+    words_path = tmp_path / 'words.txt'
+    words_path.write_text('rail\nliar\n')
+
+    word_index = WordIndex.load(str(words_path))
+
+    assert word_index.words == ['rail', 'liar']
+
+
+def test_get_word_index():
+    word_index = WordIndex(['rail'])
+
+    assert get_word_index(word_index) is word_index
+    assert get_word_index(['liar']).words == ['liar']
+    assert get_word_index(None).words == []
+
+
+def test_build_tables():
+    word_index = WordIndex('Liar rail the lira'.split())
+
+    word_index.build_tables()
+
+    assert word_index.anagrams_table is not None
+    assert word_index.stats_table is not None
+    assert word_index.suggestions_table is not None
+
+
+def test_suggest_contains_letter():
+    word_index = WordIndex('rail liar the Bat ice cream'.split())
+
+    assert word_index.suggest('t') == ['bat', 'the']
+    assert word_index.suggest('T') == ['bat', 'the']
+    assert word_index.suggest('q') == []
+    assert word_index.suggest('') == []
+
+
+def test_suggest_unique_anagrams_first():
+    word_index = WordIndex('rail liar tail tails at'.split())
+
+    suggestions = word_index.suggest('a')
+
+    assert suggestions == ['at', 'tail', 'tails', 'liar', 'rail']
+
+
+def test_suggest_prefix():
+    word_index = WordIndex('rail liar tail trail rat at'.split())
+
+    assert word_index.suggest('a', 'r') == ['rat', 'rail']
+    assert word_index.suggest('a', 'Tr') == ['trail']
+    assert word_index.suggest('a', 'x') == []
+
+
+def test_suggest_limit():
+    word_index = WordIndex('rail liar tail trail rat at'.split())
+
+    assert word_index.suggest('a', limit=2) == ['at', 'rat']
+
+
+def test_suggest_scans_common_prefix():
+    words = [f'a{i:04}' for i in range(2000)]
+    word_index = WordIndex(words)
+    word_index.suggestions.MIN_SCAN_MATCHES = 10
+
+    assert word_index.suggest('a', 'a01', limit=3) == ['a0100',
+                                                       'a0101',
+                                                       'a0102']
+
+
+def test_suggest_label_past_z():
+    word_index = WordIndex('abbey cab bat tab grab lab about'.split())
+
+    # tab is an anagram of bat, so it comes last.
+    assert word_index.suggest('AB') == ['cab',
+                                        'lab',
+                                        'grab',
+                                        'abbey',
+                                        'about',
+                                        'tab']
+    assert word_index.suggest('ab', 'g') == ['grab']
+    assert word_index.suggest('BA') == ['bat']
+    assert word_index.suggest('ZZ') == []
+
+
+def test_suggestions_built_once():
+    word_index = WordIndex('rail liar'.split())
+
+    assert word_index.suggestions_table is None
+    assert word_index.suggestions is word_index.suggestions
+
+
+def test_stats():
+    word_index = WordIndex('rail liar lira rails sail ail trails Liar'.split())
+
+    stats = word_index.stats
+
+    assert stats['rail'] == WordStat(anagram_count=3,
+                                     added_count=1,
+                                     removed_count=1,
+                                     difficulty=8)
+    assert stats['rails'] == WordStat(1, 1, 4, 5)
+    assert stats['ail'] == WordStat(1, 4, 0, 3)
+    assert stats['xyz'] == WordStat(0, 0, 0, 3)
+
+
+def test_stats_repeated_letters():
+    word_index = WordIndex('eel reel'.split())
+
+    stats = word_index.stats
+
+    assert stats['eel'] == WordStat(1, 1, 0, 3)
+    assert stats['reel'] == WordStat(1, 0, 1, 4)
+
+
+def test_stats_is_unique():
+    word_index = WordIndex('rail liar tail'.split())
+
+    assert word_index.stats.is_unique('Tail')
+    assert not word_index.stats.is_unique('rail')
+    assert not word_index.stats.is_unique('xyz')
+
+
+def test_stats_saved_next_to_words(tmp_path):
+    words_path = tmp_path / 'words.txt'
+    words_path.write_text('rail\nliar\nrails\n')
+    sidecar_path = tmp_path / 'words.txt.stats.gz'
+
+    stats = WordIndex.load(str(words_path)).stats
+    loaded_stats = WordStats.load(str(words_path))
+
+    assert sidecar_path.exists()
+    assert loaded_stats.table == stats.table
+
+
+def test_stats_loaded_from_sidecar(tmp_path):
+    words_path = tmp_path / 'words.txt'
+    words_path.write_text('rail\n')
+    WordStats({'ailr': WordStat(9, 9, 9, 9)}).save(str(words_path))
+
+    stats = WordIndex.load(str(words_path)).stats
+
+    assert stats['rail'] == WordStat(9, 9, 9, 9)
+
+
+def test_stats_sidecar_out_of_date(tmp_path):
+    words_path = tmp_path / 'words.txt'
+    words_path.write_text('rail\n')
+    WordStats({'ailr': WordStat(9, 9, 9, 9)}).save(str(words_path))
+    words_path.write_text('rail\nliar\n')
+
+    stats = WordIndex.load(str(words_path)).stats
+
+    assert stats['rail'] == WordStat(2, 0, 0, 6)
+
+
+def test_stats_sidecar_damaged(tmp_path):
+    words_path = tmp_path / 'words.txt'
+    words_path.write_text('rail\n')
+    sidecar_path = tmp_path / 'words.txt.stats.gz'
+    with gzip.open(sidecar_path, 'wt') as f:
+        f.write(WordStats.make_header(str(words_path)) + '\n')
+        f.write('ailr\tx\n')
+
+    loaded_stats = WordStats.load(str(words_path))
+    stats = WordIndex.load(str(words_path)).stats
+
+    assert loaded_stats is None
+    assert stats['rail'] == WordStat(1, 0, 0, 4)
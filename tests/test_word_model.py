@@ -0,0 +1,132 @@
+import pytest
+from PySide6.QtCore import Qt
+from PySide6.QtWidgets import QApplication, QLineEdit, QStyleOptionViewItem, \
+    QWidget
+
+from sliced_art.word_model import WordModel, WordDelegate
+
+
+@pytest.fixture(scope='session')
+def qt_application():
+    return QApplication.instance() or QApplication()
+
+
+def test_set_letters(qt_application):
+    model = WordModel()
+
+    added_letters = model.set_letters(['A', 'B', 'C'])
+
+    assert added_letters == ['A', 'B', 'C']
+    assert model.rowCount() == 3
+    assert model.columnCount() == 2
+
+
+def test_set_letters_keeps_common_rows(qt_application):
+    model = WordModel()
+    model.set_letters(['A', 'B', 'C'])
+    model.set_word('A', 'apple')
+    model.set_word('C', 'cherry')
+    events = []
+    model.rowsRemoved.connect(
+        lambda parent, first, last: events.append(('removed', first, last)))
+    model.rowsInserted.connect(
+        lambda parent, first, last: events.append(('inserted', first, last)))
+
+    added_letters = model.set_letters(['A', 'B', 'C', 'D', 'E'])
+
+    assert added_letters == ['D', 'E']
+    assert events == [('inserted', 3, 4)]
+    assert model.words == dict(A='apple', C='cherry')
+
+
+def test_set_letters_removes_rows(qt_application):
+    model = WordModel()
+    model.set_letters(['A', 'B', 'C', 'D'])
+    model.set_word('A', 'apple')
+    model.set_word('D', 'date')
+    events = []
+    model.rowsRemoved.connect(
+        lambda parent, first, last: events.append(('removed', first, last)))
+    model.rowsInserted.connect(
+        lambda parent, first, last: events.append(('inserted', first, last)))
+
+    added_letters = model.set_letters(['A', 'B'])
+
+    assert added_letters == []
+    assert events == [('removed', 2, 3)]
+    assert model.words == dict(A='apple')
+
+
+def test_set_letters_with_blank(qt_application):
+    model = WordModel()
+    model.set_letters(['A', 'B'])
+
+    added_letters = model.set_letters(['', 'A', 'B'])
+
+    assert added_letters == ['', 'A', 'B']
+    assert model.headerData(0, Qt.Orientation.Vertical) == '-'
+    assert model.headerData(1, Qt.Orientation.Vertical) == 'A'
+
+
+def test_data(qt_application):
+    model = WordModel()
+    model.set_letters(['A', 'B'])
+    model.set_word('B', 'banana')
+    model.set_display('B', 'BANANA (1)')
+
+    word_index = model.index(1, WordModel.WORD_COLUMN)
+    display_index = model.index(1, WordModel.DISPLAY_COLUMN)
+
+    assert model.data(word_index) == 'banana'
+    assert model.data(display_index) == 'BANANA (1)'
+    assert model.data(model.index(0, WordModel.WORD_COLUMN)) == ''
+    assert model.flags(word_index) & Qt.ItemFlag.ItemIsEditable
+    assert not model.flags(display_index) & Qt.ItemFlag.ItemIsEditable
+
+
+def test_set_data_calls_back(qt_application):
+    model = WordModel()
+    model.set_letters(['A', 'B'])
+    edits = []
+    model.on_word_edited = lambda letter, word: edits.append((letter, word))
+    word_index = model.index(1, WordModel.WORD_COLUMN)
+
+    assert model.setData(word_index, 'bean')
+    assert model.setData(word_index, 'bean')  # No change, so no callback.
+    assert not model.setData(model.index(1, WordModel.DISPLAY_COLUMN), 'x')
+
+    assert edits == [('B', 'bean')]
+    assert model.words['B'] == 'bean'
+
+
+def test_set_word_does_not_call_back(qt_application):
+    model = WordModel()
+    model.set_letters(['A'])
+    edits = []
+    model.on_word_edited = lambda letter, word: edits.append((letter, word))
+
+    model.set_word('A', 'apple')
+
+    assert edits == []
+
+
+def test_delegate_suggests_words_for_letter(qt_application):
+    model = WordModel()
+    model.set_letters(['A', 'B'])
+    delegate = WordDelegate()
+    requests = []
+
+    def get_suggestions(letter, prefix):
+        requests.append((letter, prefix))
+        return ['bat', 'bit']
+    delegate.get_suggestions = get_suggestions
+    parent = QWidget()
+    editor: QLineEdit = delegate.createEditor(parent,
+                                              QStyleOptionViewItem(),
+                                              model.index(1, 0))
+
+    editor.textEdited.emit('b')
+
+    completer = editor.completer()
+    assert requests == [('B', 'b')]
+    assert completer.model().stringList() == ['bat', 'bit']
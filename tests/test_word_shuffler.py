@@ -247,3 +247,113 @@ def test_make_clues(monkeypatch):
     clues = word_shuffler.make_clues()
 
     assert clues == expected_clues
+
+
+def test_make_clues_cached():
+    word_shuffler = WordShuffler([])
+    word_shuffler['a'] = 'black'
+    word_shuffler['o'] = 'book'
+    clues1 = word_shuffler.make_clues()
+
+    clues2 = word_shuffler.make_clues()
+
+    assert clues2 == clues1
+
+
+def test_make_clues_only_shuffles_changed_word(monkeypatch):
+    shuffled_words = []
+
+    def tracking_shuffle(items: list):
+        shuffled_words.append(''.join(items))
+        items.reverse()
+
+    monkeypatch.setattr(sliced_art.word_shuffler, 'shuffle', tracking_shuffle)
+    word_shuffler = WordShuffler([])
+    word_shuffler['a'] = 'black'
+    word_shuffler['o'] = 'book'
+    word_shuffler.make_clues()
+    shuffled_words.clear()
+
+    word_shuffler['o'] = 'boot'
+    word_shuffler['a'] = 'black'  # Unchanged
+    clues = word_shuffler.make_clues()
+
+    assert shuffled_words == ['BOOT']
+    assert clues == dict(a='_ _(_)_ _\nKCALB', o='_(_)_ _\nTOOB')
+
+
+def test_make_clues_not_ready_keeps_cache(monkeypatch):
+    monkeypatch.setattr(sliced_art.word_shuffler, 'shuffle', mock_shuffle)
+    word_shuffler = WordShuffler([])
+    word_shuffler['a'] = 'black'
+    clues1 = word_shuffler.make_clues()
+    word_shuffler['o'] = 'rapid'
+
+    clues2 = word_shuffler.make_clues()
+    word_shuffler['o'] = 'book'
+    clues3 = word_shuffler.make_clues()
+
+    assert clues1 == dict(a='_ _(_)_ _\nKCALB')
+    assert clues2 == dict(a='A', o='O')
+    assert clues3 == dict(a='_ _(_)_ _\nKCALB', o='_(_)_ _\nKOOB')
+
+
+def test_clear_clues(monkeypatch):
+    shuffle_count = 0
+
+    def counting_shuffle(items: list):
+        nonlocal shuffle_count
+        shuffle_count += 1
+        items.reverse()
+
+    monkeypatch.setattr(sliced_art.word_shuffler, 'shuffle', counting_shuffle)
+    word_shuffler = WordShuffler([])
+    word_shuffler['a'] = 'black'
+    word_shuffler['o'] = 'book'
+    word_shuffler.make_clues()
+
+    word_shuffler.clear_clues()
+    word_shuffler.make_clues()
+    word_shuffler.make_clues(is_fresh=True)
+    word_shuffler.make_clues()
+
+    assert shuffle_count == 6
+
+
+def test_restore_clues(monkeypatch):
+    monkeypatch.setattr(sliced_art.word_shuffler, 'shuffle', mock_shuffle)
+    word_shuffler = WordShuffler([])
+    word_shuffler['a'] = 'black'
+    word_shuffler['o'] = 'book'
+    saved_clues = dict(a='_ _(_)_ _\nBLACK', o='O', x='_\nX')
+
+    word_shuffler.restore_clues(saved_clues)
+    clues = word_shuffler.make_clues()
+
+    assert clues == dict(a='_ _(_)_ _\nBLACK', o='_(_)_ _\nKOOB')
+
+
+def test_display_two_letter_label():
+    all_words = 'lots of words rail the liar from his lair with lira'.split()
+    word_shuffler = WordShuffler(all_words)
+
+    target_letter = 'ai'
+    word_shuffler[target_letter] = 'rail'
+    expected_display = 'rAIl - lIAr, lAIr, lIRa'
+
+    display = word_shuffler.make_display(target_letter)
+
+    assert display == expected_display
+
+
+def test_make_clue_two_letter_label(monkeypatch):
+    monkeypatch.setattr(sliced_art.word_shuffler, 'shuffle', mock_shuffle)
+    word_shuffler = WordShuffler()
+    target_letter = 'ar'
+    word_shuffler[target_letter] = 'towards'
+
+    expected_clue = '_ _ _(_ _)_ _\nSDRAWOT'
+
+    clue = word_shuffler.make_clue(target_letter)
+
+    assert clue == expected_clue
@@ -161,3 +161,35 @@ def test():
     display = word_stripper.make_display(target_letter)
 
     assert display == expected_display
+
+
+def test_display_two_letter_label():
+    all_words = 'lots of words rail the liar sail lairs of lira rails'.split()
+    word_stripper = WordStripper(all_words)
+
+    target_letter = 'rs'
+    word_stripper[target_letter] = 'rails'
+    expected_display = 'ail?RS'
+
+    display = word_stripper.make_display(target_letter)
+
+    assert display == expected_display
+
+
+def test_display_two_letter_label_found():
+    all_words = 'lots of words ail rail the liar sail lairs of lira rails'.split()
+    word_stripper = WordStripper(all_words)
+
+    target_letter = 'rs'
+    word_stripper[target_letter] = 'rails'
+    expected_display = 'ail+RS'
+
+    display = word_stripper.make_display(target_letter)
+
+    assert display == expected_display
+
+
+def test_min_words_past_z():
+    word_stripper = WordStripper(min_words=28)
+
+    assert list(word_stripper.words)[-3:] == ['aa', 'ab', '']